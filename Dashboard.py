@@ -1,53 +1,36 @@
 
 import streamlit as st
-import base64
-import pandas as pd
-import os
+
+from seating import assets, datastore, timing, ui
+
+PAGE = "Dashboard"
 
 # ----------------------------
-# 0. LOAD STUDENTS & ROOMS FROM CSV
+# 0. LOAD STATS (small sidecar kept up to date on every write, so this
+# does not depend on the roster size - see seating/stats.py)
 # ----------------------------
-DATA_FOLDER = "data"
-PLAN_FILE = os.path.join(DATA_FOLDER, "plan.csv")
-STUDENT_FILE = os.path.join(DATA_FOLDER, "students.csv")
-ROOM_FILE = os.path.join(DATA_FOLDER, "rooms.csv")
-
-# Load students into session_state
-if os.path.exists(STUDENT_FILE) and os.path.getsize(STUDENT_FILE) > 0:
-    st.session_state['students'] = pd.read_csv(STUDENT_FILE).to_dict('records')
-else:
-    st.session_state['students'] = []
-
-# Load rooms into session_state
-if os.path.exists(ROOM_FILE) and os.path.getsize(ROOM_FILE) > 0:
-    st.session_state['rooms'] = pd.read_csv(ROOM_FILE).to_dict('records')
-else:
-    st.session_state['rooms'] = []
+with timing.span(PAGE, "stats"):
+    stats = datastore.dashboard_stats()
 
 # ----------------------------
 # 1. PAGE CONFIG
 # ----------------------------
 st.set_page_config(page_title="Exam Management", layout="wide")
+ui.perf_panel()
 
 # ----------------------------
-# 2. IMAGE HANDLING
+# 2. IMAGE HANDLING (downscaled + encoded once per server process)
 # ----------------------------
-def get_base64(file_path):
-    try:
-        with open(file_path, "rb") as f:
-            return base64.b64encode(f.read()).decode()
-    except:
-        return ""
-
-seat_img = get_base64("seat.png") 
+with timing.span(PAGE, "image"):
+    seat_img = assets.image_data_uri("seat.png")
 
 # ----------------------------
 # 3. DATA LOGIC
 # ----------------------------
-total_students = len(st.session_state.get('students', []))
-total_rooms = len(st.session_state.get('rooms', []))
-total_capacity = sum([r.get('Capacity', 0) for r in st.session_state.get('rooms', [])])
-status = "Generated" if os.path.exists(PLAN_FILE) and os.path.getsize(PLAN_FILE) > 0 else "Not Generated"
+total_students = stats.get("students", {}).get("count", 0)
+total_rooms = stats.get("rooms", {}).get("count", 0)
+total_capacity = stats.get("rooms", {}).get("capacity", 0)
+status = "Generated" if stats.get("plan", {}).get("seats", 0) > 0 else "Not Generated"
 
 
 # ----------------------------
@@ -147,7 +130,7 @@ st.markdown("""
 st.markdown(f"""
 <div class="hero-container">
     <div class="hero-title">Welcome to Exam Seat Allotment System</div>
-    <div class="img-side"><img src="data:image/png;base64,{seat_img}"></div>
+    <div class="img-side"><img src="{seat_img}"></div>
 </div>
 """, unsafe_allow_html=True)
 
@@ -0,0 +1 @@
+# Benchmarks and synthetic test data (not imported by the app).
@@ -0,0 +1,308 @@
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import synthetic
+from seating import allocator, datastore, plan_view, reports
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# -----------------------------
+# BENCHMARK SUITE
+# -----------------------------
+# Times the work behind the pages on synthetic data of each size:
+#   allocate_*      Generate Plan (allocator.allocate)
+#   plan_save       datastore.save_plan
+#   plan_load_*     datastore.load_plan, cold (from disk) and warm (cache)
+#   view_*          View Output: index build, search + room filter queries
+#   hall_pdf_*      Hall Report PDF: one hall in-process, a batch to a ZIP
+#
+# Each stage is run once for time and, unless --no-memory, once more under
+# tracemalloc for peak memory (tracing slows Python code down too much to
+# time both at once). Every run is appended to the results file together
+# with the commit it ran on, so runs from different versions can be
+# compared with --compare.
+#
+#   python -m benchmarks.run --sizes 1k,10k
+#   python -m benchmarks.run --compare
+SIZES = [1_000, 10_000, 100_000, 500_000]
+RESULTS_FILE = os.path.join("benchmarks", "results.json")
+
+SEATING_MODE = 2
+GRAPH_TIME_BUDGET = 2.0
+SEARCH_QUERIES = 200
+MAX_HALLS = 100
+
+
+def measure(results, size, stage, run, items, unit, setup=None, memory=True):
+    if setup is not None:
+        setup()
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+
+    peak_mb = None
+    if memory:
+        if setup is not None:
+            setup()
+        tracemalloc.start()
+        try:
+            run()
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+
+    row = {
+        "size": size,
+        "stage": stage,
+        "seconds": round(seconds, 4),
+        "items": items,
+        "throughput": round(items / seconds, 1) if seconds > 0 else None,
+        "unit": unit,
+        "peak_mb": None if peak_mb is None else round(peak_mb, 1),
+    }
+    results.append(row)
+    print(
+        f"  {stage:<20} {seconds:9.3f} s  {row['throughput'] or 0:>12,.0f} {unit}"
+        + ("" if peak_mb is None else f"  {peak_mb:8.1f} MB peak"),
+        flush=True,
+    )
+    return row
+
+
+def _worker_peak_mb():
+    # largest resident set of any finished child process (Linux: KiB)
+    if resource is None:
+        return None
+    kib = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(kib / 1024, 1)
+
+
+# -----------------------------
+# ONE SIZE
+# -----------------------------
+def bench_size(size, args, results):
+    print(f"\n{size:,} students", flush=True)
+    students, rooms = synthetic.write_dataset(
+        datastore.DATA_FOLDER, size, SEATING_MODE, seed=args.seed, skew=args.skew,
+    )
+    datastore.invalidate()
+    memory = not args.no_memory
+    out = {}
+
+    # Generate Plan
+    def allocate_interleave():
+        out["plan"] = allocator.allocate(students, rooms, SEATING_MODE)
+
+    measure(results, size, "allocate_interleave", allocate_interleave, size, "students/s", memory=memory)
+
+    if size <= args.graph_max:
+        measure(
+            results, size, "allocate_graph",
+            lambda: allocator.allocate(students, rooms, SEATING_MODE, strategy="graph",
+                                       time_budget=GRAPH_TIME_BUDGET),
+            size, "students/s", memory=memory,
+        )
+
+    plan = out["plan"]
+
+    # plan.csv round trip through the shared cache
+    measure(results, size, "plan_save", lambda: datastore.save_plan(plan), size, "seats/s", memory=memory)
+    measure(
+        results, size, "plan_load_cold", datastore.load_plan, size, "seats/s",
+        setup=datastore.invalidate, memory=memory,
+    )
+    measure(results, size, "plan_load_warm", datastore.load_plan, size, "seats/s", memory=memory)
+
+    # View Output
+    seats = datastore.load_plan()
+
+    def build_view():
+        out["view"] = plan_view.PlanView(seats)
+        out["view"].search_index
+
+    measure(results, size, "view_index", build_view, size, "seats/s", memory=memory)
+
+    view = out["view"]
+    rng = np.random.default_rng(args.seed)
+    picks = rng.integers(0, len(seats), size=SEARCH_QUERIES)
+    usns = seats["USN"].astype(str).to_numpy()[picks]
+    names = seats["Name"].astype(str).to_numpy()[picks]
+    queries = [
+        usn[:rng.integers(4, len(usn) + 1)] if i % 2 else name.split()[-1][:4]
+        for i, (usn, name) in enumerate(zip(usns, names))
+    ]
+    room_names = view.room_names
+
+    def search():
+        for i, query in enumerate(queries):
+            room = room_names[i % len(room_names)] if i % 4 == 0 else None
+            rows = view.rows(view.search(query), room=room)
+            page = view.window(rows, 1, 100)
+            # queries are cut from seated students, so without a room filter
+            # every one has to find someone
+            if room is None and len(page) == 0:
+                raise RuntimeError(f"view_search: no rows for {query!r}")
+
+    measure(results, size, "view_search", search, len(queries), "queries/s", memory=memory)
+
+    def room_pages():
+        for room in room_names[:SEARCH_QUERIES]:
+            page = view.window(view.rows(room=room, sort_by="USN"), 1, 100)
+            if len(page) == 0:
+                raise RuntimeError(f"view_room_sorted: no rows for room {room!r}")
+
+    measure(
+        results, size, "view_room_sorted", room_pages, min(len(room_names), SEARCH_QUERIES),
+        "pages/s", memory=memory,
+    )
+
+    # Hall Report PDF
+    jobs = [
+        (room, reports.hall_rows(seats.iloc[view.room_rows(room)]))
+        for room in room_names[:args.max_halls]
+    ]
+    first_room, first_rows = jobs[0]
+    measure(
+        results, size, "hall_pdf_single",
+        lambda: reports.hall_report_bytes(first_room, first_rows),
+        len(first_rows), "seats/s", memory=memory,
+    )
+
+    # process pool: tracemalloc only sees this process, so the workers'
+    # peak comes from rusage instead
+    row = measure(
+        results, size, "hall_pdf_zip",
+        lambda: reports.render_all_halls(jobs, io.BytesIO(), workers=args.workers, use_cache=False),
+        len(jobs), "halls/s", memory=False,
+    )
+    row["worker_peak_mb"] = _worker_peak_mb()
+
+
+# -----------------------------
+# RESULTS FILE
+# -----------------------------
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_runs(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f).get("runs", [])
+
+
+def save_run(path, run):
+    runs = load_runs(path) + [run]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"runs": runs}, f, indent=1)
+    os.replace(tmp, path)
+
+
+def compare(path):
+    # last run against the most recent earlier run of each size/stage
+    runs = load_runs(path)
+    if len(runs) < 2:
+        print("Need at least two runs in", path)
+        return
+
+    latest = runs[-1]
+    old = {}
+    for run in runs[:-1]:
+        for row in run["results"]:
+            old[(row["size"], row["stage"])] = (run, row)
+
+    print(f"latest: {latest.get('commit')} ({latest['started']})")
+    print(f"{'size':>8}  {'stage':<20} {'was':>9} {'now':>9} {'change':>8}  baseline")
+    for row in latest["results"]:
+        hit = old.get((row["size"], row["stage"]))
+        if hit is None or not hit[1]["seconds"]:
+            continue
+        run, prev = hit
+        change = row["seconds"] / prev["seconds"] - 1
+        flag = "  <-- slower" if change > 0.2 else ""
+        print(
+            f"{row['size']:>8}  {row['stage']:<20} {prev['seconds']:9.3f} {row['seconds']:9.3f}"
+            f" {change:+8.0%}  {run.get('commit')}{flag}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in SIZES),
+                        help="comma separated, e.g. 1k,10k,100k,500k")
+    parser.add_argument("--out", default=RESULTS_FILE)
+    parser.add_argument("--skew", type=float, default=1.0, help="branch skew of the synthetic roster")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--graph-max", type=synthetic.parse_size, default=100_000,
+                        help="largest size to run the graph allocator on")
+    parser.add_argument("--max-halls", type=int, default=MAX_HALLS, help="halls rendered per size")
+    parser.add_argument("--workers", type=int, help="PDF worker processes (default: one per core)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--compare", action="store_true", help="compare the last two runs and exit")
+    args = parser.parse_args(argv)
+
+    out = os.path.abspath(args.out)
+    if args.compare:
+        compare(out)
+        return
+
+    sizes = [synthetic.parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    run = {
+        "commit": _git_commit(),
+        "started": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.platform(),
+        "cpus": os.cpu_count(),
+        "settings": {
+            "seating_mode": SEATING_MODE,
+            "graph_time_budget": GRAPH_TIME_BUDGET,
+            "skew": args.skew,
+            "seed": args.seed,
+            "max_halls": args.max_halls,
+            "memory": not args.no_memory,
+        },
+        "results": [],
+    }
+
+    # datastore works on ./data, so run in a scratch folder
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="seating-bench-") as scratch:
+        os.chdir(scratch)
+        try:
+            for size in sizes:
+                bench_size(size, args, run["results"])
+        finally:
+            os.chdir(cwd)
+            datastore.invalidate()
+
+    save_run(out, run)
+    print(f"\nResults appended to {out}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
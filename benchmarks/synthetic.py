@@ -0,0 +1,159 @@
+import argparse
+import os
+import string
+
+import numpy as np
+import pandas as pd
+
+from seating import geometry
+
+# -----------------------------
+# SYNTHETIC ROSTERS + ROOMS
+# -----------------------------
+# Realistic-looking test data at any size: USNs that pass the upload
+# checks (seating/ingest.py), a skewed branch mix, Regular/Arrear students
+# and comma separated subject lists. Everything is driven by one seed, so
+# the same arguments always give the same files.
+#
+#   python -m benchmarks.synthetic 100000 --out /tmp/big
+#   -> /tmp/big/students.csv, /tmp/big/rooms.csv
+BRANCHES = ["CS", "EC", "EE", "ME", "CV"]
+
+FIRST_NAMES = [
+    "Aarav", "Abhishek", "Aditi", "Akash", "Ananya", "Arjun", "Bhavana", "Chetan",
+    "Deepa", "Divya", "Ganesh", "Harsha", "Isha", "Karthik", "Kavya", "Lakshmi",
+    "Manoj", "Meghana", "Naveen", "Nikhil", "Pooja", "Pranav", "Rahul", "Rakesh",
+    "Sahana", "Sanjay", "Shreya", "Sneha", "Suresh", "Swathi", "Varun", "Vidya",
+]
+LAST_NAMES = [
+    "Acharya", "Bhat", "Gowda", "Hegde", "Iyer", "Joshi", "Kamath", "Kulkarni",
+    "Murthy", "Naik", "Patil", "Prasad", "Rao", "Reddy", "Shenoy", "Shetty",
+]
+
+SUBJECTS_PER_SEM = 6
+
+
+def branch_weights(branches, skew=1.0):
+    # Zipf-like share per branch: skew 0 = even, 1 = first branch twice the
+    # second, three times the third, ...
+    weights = 1.0 / np.arange(1, len(branches) + 1) ** skew
+    return weights / weights.sum()
+
+
+def _usns(branches, rng):
+    # <college digit+2 letters><year><branch><serial 000-999>, numbered per
+    # branch so every USN is unique and matches ingest.USN_PATTERN
+    usns = np.empty(len(branches), dtype=object)
+    letters = string.ascii_uppercase
+    for branch in pd.unique(branches):
+        rows = np.flatnonzero(branches == branch)
+        serial = np.arange(len(rows))
+        year = 18 + (serial // 1000) % 8
+        college = serial // 8000 + rng.integers(0, 50)
+        code = [
+            f"{c // 676 % 9 + 1}{letters[c // 26 % 26]}{letters[c % 26]}"
+            for c in college.tolist()
+        ]
+        usns[rows] = [
+            f"{c}{y:02d}{branch}{s % 1000:03d}"
+            for c, y, s in zip(code, year.tolist(), serial.tolist())
+        ]
+    return usns
+
+
+def _subjects(branches, sems, counts, rng):
+    # `counts[i]` distinct subjects from the student's branch/semester pool
+    n = len(branches)
+    widest = int(counts.max()) if n else 0
+    picks = np.argsort(rng.random((n, SUBJECTS_PER_SEM)), axis=1)[:, :widest] + 1
+    picks.sort(axis=1)
+    return [
+        ", ".join(f"{b}{s}{p:02d}" for p in row[:k])
+        for b, s, row, k in zip(branches.tolist(), sems.tolist(), picks.tolist(), counts.tolist())
+    ]
+
+
+def make_students(n, branches=BRANCHES, skew=1.0, arrear_share=0.1, subjects=(1, 3), seed=0):
+    rng = np.random.default_rng(seed)
+    branches = list(branches)
+
+    branch = rng.choice(np.array(branches, dtype=object), size=n, p=branch_weights(branches, skew))
+    sem = rng.integers(1, 9, size=n)
+    arrear = rng.random(n) < arrear_share
+    # arrear students sit a paper from an earlier semester
+    paper_sem = np.where(arrear & (sem > 1), rng.integers(1, np.maximum(sem, 2)), sem)
+
+    lo, hi = subjects
+    hi = min(hi, SUBJECTS_PER_SEM)
+    counts = rng.integers(lo, hi + 1, size=n)
+
+    names = (
+        pd.Series(rng.choice(FIRST_NAMES, size=n), dtype=object) + " "
+        + pd.Series(rng.choice(LAST_NAMES, size=n), dtype=object)
+    )
+
+    return pd.DataFrame({
+        "USN": _usns(branch, rng),
+        "Name": names,
+        "Sem": sem,
+        "Branch": branch,
+        "Type": np.where(arrear, "Arrear", "Regular"),
+        "Subjects": _subjects(branch, paper_sem, counts, rng),
+    })
+
+
+def make_rooms(n_students, seating_mode=2, benches=(20, 40), spare=0.1, seed=0):
+    # Rooms of `benches` (min, max) benches each, enough for every student at
+    # `seating_mode` per bench plus `spare` headroom
+    rng = np.random.default_rng(seed + 1)
+    needed = -(-int(n_students * (1 + spare)) // seating_mode)
+
+    lo, hi = benches
+    sizes = rng.integers(lo, hi + 1, size=max(1, needed // lo + 1))
+    count = int(np.searchsorted(np.cumsum(sizes), needed)) + 1
+    sizes = sizes[:count]
+
+    blocks = ["MECH", "CIVIL", "ECE", "CSE", "MAIN", "LIB"]
+    names = [
+        f"{blocks[i // 100 % len(blocks)]} BLOCK {i // 600 + 1}{i % 100:02d}"
+        for i in range(count)
+    ]
+    return pd.DataFrame({"Room Name": names, "Capacity": sizes})
+
+
+def write_dataset(folder, n, seating_mode=2, seed=0, **options):
+    # students.csv + rooms.csv in `folder` (e.g. a data/ directory)
+    os.makedirs(folder, exist_ok=True)
+    students = make_students(n, seed=seed, **options)
+    rooms = make_rooms(n, seating_mode, seed=seed)
+    students.to_csv(os.path.join(folder, "students.csv"), index=False)
+    rooms.to_csv(os.path.join(folder, "rooms.csv"), index=False)
+    return students, rooms
+
+
+def parse_size(text):
+    # "500k" -> 500000
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.synthetic")
+    parser.add_argument("students", type=parse_size, help="e.g. 10000 or 10k")
+    parser.add_argument("--out", default="synthetic_data")
+    parser.add_argument("--per-bench", type=int, choices=range(1, geometry.MAX_SEATS_PER_BENCH + 1), default=2)
+    parser.add_argument("--skew", type=float, default=1.0)
+    parser.add_argument("--arrear-share", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    students, rooms = write_dataset(
+        args.out, args.students, args.per_bench, args.seed,
+        skew=args.skew, arrear_share=args.arrear_share,
+    )
+    print(f"{len(students)} students, {len(rooms)} rooms -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
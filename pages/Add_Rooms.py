@@ -3,8 +3,8 @@
 
 
 import streamlit as st
-import pandas as pd
-import os
+
+from seating import datastore, geometry, ui
 
 # ----------------------------
 # PAGE CONFIG
@@ -12,37 +12,9 @@ import os
 st.set_page_config(page_title="Add Rooms", layout="wide")
 
 # ----------------------------
-# DATA FILE
-# ----------------------------
-DATA_FOLDER = "data"
-ROOM_FILE = os.path.join(DATA_FOLDER, "rooms.csv")
-
-if not os.path.exists(DATA_FOLDER):
-    os.makedirs(DATA_FOLDER)
-
-# ----------------------------
-# LOAD ROOMS SAFELY
-# ----------------------------
-if "rooms" not in st.session_state:
-    if os.path.exists(ROOM_FILE) and os.path.getsize(ROOM_FILE) > 0:
-        st.session_state["rooms"] = pd.read_csv(ROOM_FILE)
-    else:
-        st.session_state["rooms"] = pd.DataFrame(columns=["Room Name", "Capacity"])
-
-# ----------------------------
-# ✅ FIX OLD LIST ERROR
-# ----------------------------
-if isinstance(st.session_state["rooms"], list):
-    st.session_state["rooms"] = pd.DataFrame(
-        st.session_state["rooms"],
-        columns=["Room Name", "Capacity"]
-    )
-
-# ----------------------------
-# SAVE FUNCTION
+# LOAD ROOMS SAFELY (shared cache, see seating/datastore.py)
 # ----------------------------
-def save_rooms():
-    st.session_state["rooms"].to_csv(ROOM_FILE, index=False)
+rooms_df = datastore.load_rooms()
 
 # ----------------------------
 # CSS STYLING
@@ -111,7 +83,7 @@ st.markdown('<div class="sub-text">Configure examination halls and seating capac
 # ----------------------------
 with st.form("room_form", clear_on_submit=True):
 
-    col1, col2 = st.columns([3, 1])
+    col1, col2, col3 = st.columns([3, 1, 1])
 
     with col1:
         room_name = st.text_input("Room Name or Number",
@@ -122,39 +94,79 @@ with st.form("room_form", clear_on_submit=True):
                                    min_value=1,
                                    value=30)
 
+    with col3:
+        # lab stools 1, drawing tables 3-4; 0 = chosen on Generate Plan
+        seats = st.number_input("Seats per Bench",
+                                min_value=0,
+                                max_value=geometry.MAX_SEATS_PER_BENCH,
+                                value=0,
+                                help="0 = use the number chosen when generating the plan")
+
+    # optional bench grid: lets the allocator keep branches apart across
+    # the row and front / back, not just on a bench (seating/geometry.py)
+    with st.expander("Bench Layout (optional)"):
+        g1, g2 = st.columns(2)
+        with g1:
+            grid_rows = st.number_input("Rows of benches", min_value=0, value=0,
+                                        help="0 = no layout, just the capacity above; with a layout the capacity is the usable benches")
+        with g2:
+            grid_cols = st.number_input("Benches per row", min_value=0, value=0)
+
+        blocked = st.text_input("Blocked positions", placeholder="e.g. R1C1, R4C6 (pillar, broken bench)")
+        aisles = st.text_input("Aisles after column", placeholder="e.g. 3 (aisle between columns 3 and 4)")
+
     submit = st.form_submit_button("Register Room")
 
     if submit:
-        if room_name.strip() != "":
-            new_room = pd.DataFrame(
-                [{"Room Name": room_name, "Capacity": capacity}]
-            )
+        row = {"Room Name": room_name, "Capacity": int(capacity)}
+        if seats:
+            row["Seats per Bench"] = int(seats)
+        room_shape = None
+        if grid_rows and grid_cols:
+            room_shape = geometry.shape(grid_rows, grid_cols, blocked, aisles)
+            row.update({
+                "Capacity": geometry.capacity(room_shape),
+                "Rows": int(grid_rows),
+                "Columns": int(grid_cols),
+                "Blocked": geometry.format_cells(room_shape[2]),
+                "Aisles": ", ".join(str(c) for c in sorted(room_shape[3])),
+            })
+
+        if room_name.strip() == "":
+            st.error("❌ Please provide a valid room name.")
 
-            st.session_state["rooms"] = pd.concat(
-                [st.session_state["rooms"], new_room],
-                ignore_index=True
-            )
+        elif room_shape is not None and row["Capacity"] < 1:
+            st.error("❌ Every bench position is blocked.")
 
-            save_rooms()
+        else:
+            # one journal line, no full rewrite of rooms.csv
+            datastore.add_room(row)
             st.success(f"✅ Room '{room_name}' Added Successfully!")
             st.rerun()
 
-        else:
-            st.error("❌ Please provide a valid room name.")
-
 # ----------------------------
 # DISPLAY TABLE
 # ----------------------------
 st.markdown("<h3 style='color:#1E3A8A;'>Registered Examination Halls</h3>",
             unsafe_allow_html=True)
 
-if not st.session_state["rooms"].empty:
+if not rooms_df.empty:
+
+    ui.oversized_benches_warning(rooms_df)
 
     st.dataframe(
-        st.session_state["rooms"],
+        rooms_df.dropna(axis=1, how="all"),
         hide_index=True,
         use_container_width=True
     )
 
+    # bench grid preview for rooms that have one
+    shapes = dict(zip(rooms_df["Room Name"].astype(str), geometry.room_shapes(rooms_df)))
+    grid_rooms = [name for name, (_, cols, blocked, _) in shapes.items() if cols > 1 or blocked]
+    if grid_rooms:
+        room = st.selectbox("Bench layout of", grid_rooms)
+        st.caption("Bench numbers as they appear on the plan; ✕ blocked, ┃ aisle. Front row at the top.")
+        st.dataframe(geometry.grid_labels(shapes[room]), use_container_width=True)
+
 else:
     st.info("No rooms have been added yet. Use the form above to register your first hall.")
@@ -1,12 +1,16 @@
 
 import streamlit as st
 import pandas as pd
-import os
+
+from seating import datastore, layout, plan_view, timing, ui
+
+PAGE = "Download Report"
 
 # ---------------------------
 # PAGE CONFIG
 # ---------------------------
 st.set_page_config(page_title="Download Report", layout="wide")
+ui.perf_panel()
 
 # ---------------------------
 # STYLING (Only UI Improved)
@@ -114,112 +118,93 @@ def ensure_dataframe(obj, columns):
 
 
 # ---------------------------
-# SESSION STATE INIT
+# LOAD PLAN (shared cache, see seating/datastore.py)
 # ---------------------------
-# if "plan" not in st.session_state:
-#     st.session_state["plan"] = pd.DataFrame()
-# ✅ FIX: Ensure plan is always DataFrame
-if "plan" not in st.session_state or not isinstance(st.session_state["plan"], pd.DataFrame):
-    st.session_state["plan"] = pd.DataFrame()
+with timing.span(PAGE, "load plan"):
+    plan_df = datastore.load_plan()
+from_saved_plan = not plan_df.empty
 
 
 # ---------------------------
 # LOAD STUDENTS CSV
 # ---------------------------
 students_columns = ["USN", "Name", "Sem", "Branch", "Type", "Subjects"]
-students_path = os.path.join("data", "students.csv")
-
-if os.path.exists(students_path):
-    students_df = pd.read_csv(students_path)
-    students_df.columns = students_df.columns.str.strip()
-    students_df = ensure_dataframe(students_df, students_columns)
-    students_df = pd.read_csv(students_path)
-    # Clean column names
-    students_df.columns = students_df.columns.str.strip()
-
-    # Auto-fix common column mistakes
-    students_df.rename(columns={
-      "USN ": "USN",
-      "Name ": "Name",
-      "Branch ": "Branch"
-    }, inplace=True)
-    students_df = ensure_dataframe(students_df, students_columns)
-
-else:
-    students_df = pd.DataFrame(columns=students_columns)
+
+with timing.span(PAGE, "load students"):
+    students_df = datastore.load_students()
+# Auto-fix common column mistakes
+students_df = students_df.rename(columns={
+  "USN ": "USN",
+  "Name ": "Name",
+  "Branch ": "Branch"
+})
+students_df = ensure_dataframe(students_df, students_columns)
 
 # ---------------------------
 # LOAD ROOMS CSV
 # ---------------------------
 rooms_columns = ["Name", "Capacity"]
-rooms_path = os.path.join("data", "rooms.csv")
-
-if os.path.exists(rooms_path):
-    rooms_df = pd.read_csv(rooms_path)
-    rooms_df.columns = rooms_df.columns.str.strip()
-    rooms_df = ensure_dataframe(rooms_df, rooms_columns)
-    rooms_df = pd.read_csv(rooms_path)
-    # Clean column names
-    rooms_df.columns = rooms_df.columns.str.strip()
-    # Auto-fix common room header mistakes
-    rooms_df.rename(columns={
-      "Room": "Name",
-      "Room Name": "Name",
-      "room": "Name",
-      "capacity ": "Capacity"
-    }, inplace=True)
-    rooms_df = ensure_dataframe(rooms_df, rooms_columns)
-
-
-    rooms_df["Capacity"] = pd.to_numeric(
-        rooms_df["Capacity"], errors="coerce"
-    ).fillna(0).astype(int)
-
-else:
-    rooms_df = pd.DataFrame(columns=rooms_columns)
+
+with timing.span(PAGE, "load rooms"):
+    rooms_df = datastore.load_rooms()
+# Auto-fix common room header mistakes
+rooms_df = rooms_df.rename(columns={
+  "Room": "Name",
+  "Room Name": "Name",
+  "room": "Name",
+  "capacity ": "Capacity"
+})
+rooms_df = ensure_dataframe(rooms_df, rooms_columns)
+
+rooms_df["Capacity"] = pd.to_numeric(
+    rooms_df["Capacity"], errors="coerce"
+).fillna(0).astype(int)
 
 # ---------------------------
 # GENERATE SEAT PLAN (Same Logic)
 # ---------------------------
-if st.session_state["plan"].empty and not students_df.empty and not rooms_df.empty:
+if plan_df.empty and not students_df.empty and not rooms_df.empty:
+    with timing.span(PAGE, "fallback plan"):
 
-    plan_list = []
-    student_index = 0
-    serial = 1
+        plan_list = []
+        student_index = 0
+        serial = 1
 
-    for _, room in rooms_df.iterrows():
-        room_name = room["Name"]
-        capacity = room["Capacity"]
+        for _, room in rooms_df.iterrows():
+            room_name = room["Name"]
+            capacity = room["Capacity"]
 
-        for _ in range(capacity):
-            if student_index >= len(students_df):
-                break
+            for bench in range(1, capacity + 1):
+                if student_index >= len(students_df):
+                    break
 
-            student = students_df.iloc[student_index]
+                student = students_df.iloc[student_index]
 
-            plan_list.append({
-                "S.No": serial, 
-                "USN": student["USN"],
-                "Name": student["Name"],
-                "Sem": student["Sem"],
-                "Branch": student["Branch"],
-                "Type": student["Type"],
-                "Subjects": student["Subjects"],
-                "Room": room_name
-            })
+                plan_list.append({
+                    "S.No": serial, 
+                    "Bench": bench,
+                    "Seat": 1,
+                    "USN": student["USN"],
+                    "Name": student["Name"],
+                    "Sem": student["Sem"],
+                    "Branch": student["Branch"],
+                    "Type": student["Type"],
+                    "Subjects": student["Subjects"],
+                    "Room": room_name
+                })
 
-            student_index += 1
+                student_index += 1
 
-    st.session_state["plan"] = pd.DataFrame(plan_list)
+        plan_df = pd.DataFrame(plan_list)
 
 # ---------------------------
 # DISPLAY REPORT
 # ---------------------------
-if st.session_state["plan"].empty:
+if plan_df.empty:
     st.warning("⚠️ No report available. Please upload Students and Rooms first.")
     st.stop()
 
-df = st.session_state["plan"]
+df = plan_df
 
 st.success("✅ Seat Allotment Report Generated Successfully!")
 
@@ -228,16 +213,17 @@ st.success("✅ Seat Allotment Report Generated Successfully!")
 # ---------------------------
 st.subheader("Final Seat Allotment Report")
 
-st.dataframe(
-    df,
-    hide_index=True,
-    use_container_width=True
-)
+# saved plan: shared per-version view; fallback plan: built here
+with timing.span(PAGE, "render"):
+    report_view = datastore.plan_viewer() if from_saved_plan else plan_view.PlanView(df)
+    ui.plan_window(report_view, key="report")
 
 # ---------------------------
 # DOWNLOAD BUTTON BELOW TABLE
 # ---------------------------
-csv_data = df.to_csv(index=False).encode("utf-8")
+# export keeps the bench-wise layout (Student 1 / Student 2 columns)
+with timing.span(PAGE, "export csv", rows=len(df)):
+    csv_data = layout.to_wide(df).to_csv(index=False).encode("utf-8")
 
 st.markdown("<br>", unsafe_allow_html=True)
 
@@ -259,13 +245,15 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.subheader("Room Wise Summary")
-    summary = df.groupby("Room").size().reset_index(name="Student Count")
+    with timing.span(PAGE, "summary"):
+        summary = df.groupby("Room", observed=True).size().reset_index(name="Student Count")
     st.table(summary.reset_index(drop=True))
 
 
 with col2:
     st.subheader("Department Wise Summary")
-    dept_summary = df.groupby("Branch").size().reset_index(name="Count")
+    with timing.span(PAGE, "summary"):
+        dept_summary = df.groupby("Branch", observed=True).size().reset_index(name="Count")
     st.table(dept_summary.reset_index(drop=True))
 
 
@@ -0,0 +1,296 @@
+import streamlit as st
+import pandas as pd
+import io
+import zipfile
+
+from seating import datastore, geometry, layout, plan_view, timetable, timing, ui
+
+PAGE = "Exam Timetable"
+
+# -----------------------------
+# PAGE CONFIG
+# -----------------------------
+st.set_page_config(page_title="Exam Timetable", layout="wide")
+ui.perf_panel()
+
+# -----------------------------
+# LOAD STUDENTS + ROOMS + TIMETABLE (shared cache, see seating/datastore.py)
+# -----------------------------
+with timing.span(PAGE, "load"):
+    students = datastore.load_students()
+    rooms = datastore.load_rooms()
+    saved_timetable = datastore.load_timetable()
+
+# -----------------------------
+# CSS THEME (Same All Pages)
+# -----------------------------
+st.markdown("""
+<style>
+.stApp { background-color: white !important; }
+header { visibility: hidden; }
+
+/* SIDEBAR */
+[data-testid="stSidebar"] {
+    background-color: white !important;
+    border-right: 1px solid #E5E7EB;
+}
+[data-testid="stSidebarNav"] ul li div a span {
+    color: #1E3A8A !important;
+    font-weight: 700 !important;
+}
+
+/* TITLE */
+.main-header {
+    color: #1E3A8A !important;
+    font-size: 36px;
+    font-weight: 800;
+    margin-bottom: 15px;
+}
+
+/* INFO BOX */
+.custom-alert {
+    background-color: #F0F7FF;
+    border-left: 5px solid #1E3A8A;
+    padding: 18px;
+    border-radius: 12px;
+    margin-bottom: 25px;
+}
+
+/* BUTTON */
+div.stButton > button {
+    background-color: #1E3A8A !important;
+    color: white !important;
+    border-radius: 12px;
+    padding: 10px 20px;
+    font-weight: bold;
+    width: 100%;
+}
+div.stButton > button:hover {
+    background-color: #2563EB !important;
+}
+
+/* DATAFRAME */
+[data-testid="stDataFrame"] {
+    border-radius: 12px;
+    border: 1px solid #E5E7EB;
+    padding: 10px;
+}
+</style>
+""", unsafe_allow_html=True)
+
+# -----------------------------
+# PAGE TITLE
+# -----------------------------
+st.markdown("<div class='main-header'>Exam Timetable</div>", unsafe_allow_html=True)
+
+# -----------------------------
+# VALIDATION CHECK
+# -----------------------------
+if len(students) == 0 or len(rooms) == 0:
+    st.markdown(f"""
+    <div class="custom-alert">
+        <h3 style="color:#1E3A8A; margin:0;">⚠️ Data Missing</h3>
+        <p style="color:#1E3A8A; margin:5px 0 0 0;">
+        Please upload Students and Rooms before planning the exam slots.<br>
+        Currently Found: <b>{len(students)}</b> students, <b>{len(rooms)}</b> rooms.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.stop()
+
+# -----------------------------
+# SUBJECTS ON THE ROSTER (inverted index, see seating/timetable.py)
+# -----------------------------
+with timing.span(PAGE, "subject index"):
+    index = datastore.subject_index()
+
+st.markdown(f"""
+<div class="custom-alert">
+    <p style="color:#1E3A8A; margin:0;">
+    One seating plan per exam slot: each slot seats only the students whose
+    <b>Subjects</b> include a subject written in that slot.<br>
+    Subjects on the roster: <b>{len(index.subjects())}</b>
+    </p>
+</div>
+""", unsafe_allow_html=True)
+
+# -----------------------------
+# TIMETABLE (Slot -> Subjects)
+# -----------------------------
+st.markdown("""
+<h3 style="color:#1E3A8A; font-weight:400; margin-top:10px;">
+ Slots:- One row per exam session, subjects comma separated
+</h3>
+""", unsafe_allow_html=True)
+
+uploaded = st.file_uploader("Upload timetable CSV (columns: Slot, Subjects)", type=["csv"])
+if uploaded is not None:
+    draft = pd.read_csv(uploaded)
+    draft.columns = draft.columns.str.strip()
+else:
+    draft = saved_timetable
+
+draft = draft.reindex(columns=timetable.TIMETABLE_COLUMNS).astype(object).fillna("")
+
+edited = st.data_editor(
+    draft,
+    num_rows="dynamic",
+    hide_index=True,
+    use_container_width=True,
+    key="timetable_editor"
+)
+edited = edited[edited["Slot"].astype(str).str.strip() != ""].reset_index(drop=True)
+
+problems = timetable.validate(edited) if len(edited) else ["add at least one slot"]
+for problem in problems:
+    st.warning(f"⚠ Timetable: {problem}")
+
+if st.button(" Save Timetable", disabled=bool(problems)):
+    datastore.save_timetable(edited)
+    st.success("✅ Timetable Saved!")
+
+# subjects nobody is scheduled to write / scheduled subjects nobody takes
+counts = index.counts()
+scheduled = {s for text in edited["Subjects"] for s in timetable.parse_subjects(text)}
+unscheduled = sorted(set(counts) - scheduled)
+unknown = sorted(scheduled - set(counts))
+
+with st.expander(f"Subjects ({len(counts)} on roster, {len(unscheduled)} not in any slot)"):
+    subject_table = pd.DataFrame({
+        "Subject": list(counts),
+        "Students": list(counts.values()),
+    }).sort_values("Subject")
+    subject_table["Scheduled"] = subject_table["Subject"].isin(scheduled)
+    st.dataframe(subject_table, hide_index=True, use_container_width=True)
+
+if unknown:
+    st.caption("Not on any student's subject list: " + ", ".join(unknown))
+
+# -----------------------------
+# SUBJECT CLASHES (recomputed on every edit, see seating/timetable.py)
+# -----------------------------
+if len(edited) and not problems:
+    with timing.span(PAGE, "clashes", slots=len(edited)) as extra:
+        clashes = timetable.find_clashes(students, edited, index)
+        extra["clashes"] = len(clashes)
+
+    if len(clashes):
+        arrear = int((clashes["Type"].astype(str) == "Arrear").sum())
+        st.warning(
+            f"⚠ {len(clashes)} subject clashes: {clashes['USN'].nunique()} students "
+            f"({arrear} arrear) write two subjects in the same slot."
+        )
+        with st.expander("Clashing students"):
+            st.dataframe(clashes, hide_index=True, use_container_width=True)
+            st.download_button(
+                label="⬇ Download Clashes (CSV)",
+                data=clashes.to_csv(index=False),
+                file_name="Subject_Clashes.csv",
+                mime="text/csv"
+            )
+    else:
+        st.success("✅ No subject clashes: nobody writes two subjects in the same slot.")
+
+# -----------------------------
+# SEATING CONFIGURATION
+# -----------------------------
+seating_mode = st.selectbox(
+    "How many students per bench? (rooms without their own seats per bench)",
+    list(range(1, geometry.MAX_SEATS_PER_BENCH + 1)), index=0, key="slot_mode"
+)
+ui.oversized_benches_warning(rooms)
+
+ALLOCATION_METHODS = {
+    "Branch Mixing (Fast)": "interleave",
+    "Minimise Same-Branch Neighbours": "graph",
+}
+allocation_method = st.selectbox("Allocation method", list(ALLOCATION_METHODS), index=0, key="slot_method")
+
+time_budget = 2.0
+if ALLOCATION_METHODS[allocation_method] == "graph":
+    time_budget = st.slider("Time budget per slot (seconds)", 1, 30, 2)
+
+collisions = datastore.student_usn_index().collisions()
+dedupe = False
+if collisions:
+    st.warning(f"⚠ {len(collisions)} USNs are registered more than once.")
+    dedupe = st.checkbox("Dedupe mode: seat each USN once per slot (keep the first record)", key="slot_dedupe")
+
+# -----------------------------
+# GENERATE ALL SLOTS (one process per core)
+# -----------------------------
+if st.button(" Generate Plans for All Slots", disabled=bool(problems)):
+
+    if collisions and not dedupe:
+        st.error("❌ Fix the duplicate USNs or turn on dedupe mode before allotting seats.")
+        st.stop()
+
+    datastore.save_timetable(edited)
+    progress = st.progress(0.0, text="Allotting seats for every slot...")
+
+    def on_progress(done, total):
+        progress.progress(done / total, text=f"Seated {done} / {total} slots")
+
+    # each plan is written as soon as its worker returns it
+    with timing.span(PAGE, "allocate slots", slots=len(edited)):
+        summary = timetable.allocate_slots(
+            students, rooms, edited, seating_mode,
+            strategy=ALLOCATION_METHODS[allocation_method],
+            time_budget=time_budget,
+            dedupe=dedupe,
+            index=index,
+            on_slot=datastore.save_slot_plan,
+            on_progress=on_progress
+        )
+    # a slot that failed this run keeps its last good plan
+    datastore.clear_slot_plans(keep=list(summary))
+
+    failed = {slot: r["error"] for slot, r in summary.items() if r["error"]}
+    if failed:
+        st.error("❌ Some slots could not be seated:\n\n" + "\n\n".join(f"{s}: {e}" for s, e in failed.items()))
+    if len(summary) > len(failed):
+        st.success(f"✅ {len(summary) - len(failed)} Slot Plans Generated + Saved!")
+
+    st.session_state["slot_summary"] = pd.DataFrame([
+        {
+            "Slot": slot,
+            "Students": r["students"],
+            "Rooms Used": r.get("rooms", 0),
+            "Same-Branch Pairs": r.get("same_branch_neighbours", 0),
+            "Status": r["error"] or "OK",
+        }
+        for slot, r in summary.items()
+    ])
+
+if "slot_summary" in st.session_state:
+    st.dataframe(st.session_state["slot_summary"], hide_index=True, use_container_width=True)
+
+# -----------------------------
+# SLOT PLANS: PREVIEW + DOWNLOAD
+# -----------------------------
+saved_slots = [s for s in edited["Slot"].astype(str).str.strip() if datastore.slot_plan_exists(s)]
+
+if saved_slots:
+    st.markdown("""
+    <h3 style="color:#1E3A8A; font-weight:800; margin-top:30px;">
+    Slot Plans
+    </h3>
+    """, unsafe_allow_html=True)
+
+    slot = st.selectbox("Slot", saved_slots)
+    with timing.span(PAGE, "render"):
+        ui.plan_window(plan_view.PlanView(datastore.load_slot_plan(slot)), key="slot")
+
+    if st.button(" Prepare Download (all slots, CSV)"):
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for name in saved_slots:
+                plan = datastore.load_slot_plan(name)
+                zf.writestr(timetable.slot_filename(name), layout.to_wide(plan).to_csv(index=False))
+        st.download_button(
+            label="⬇ Download Slot Plans (ZIP)",
+            data=buf.getvalue(),
+            file_name="Slot_Seating_Plans.zip",
+            mime="application/zip"
+        )
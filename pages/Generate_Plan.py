@@ -1,44 +1,24 @@
 
 
 import streamlit as st
-import pandas as pd
-import os
 
-# -----------------------------
-# PAGE CONFIG
-# -----------------------------
-st.set_page_config(page_title="Generate Plan", layout="wide")
+from seating.allocator import CapacityError
+from seating import datastore, delta, geometry, plan_cache, timing, ui
 
-# -----------------------------
-# FILE PATHS
-# -----------------------------
-DATA_FOLDER = "data"
-STUDENT_FILE = os.path.join(DATA_FOLDER, "students.csv")
-ROOM_FILE = os.path.join(DATA_FOLDER, "rooms.csv")
-
-# -----------------------------
-# LOAD STUDENTS FROM CSV
-# -----------------------------
-if "students" not in st.session_state:
-    if os.path.exists(STUDENT_FILE) and os.path.getsize(STUDENT_FILE) > 0:
-        st.session_state["students"] = pd.read_csv(STUDENT_FILE).to_dict("records")
-    else:
-        st.session_state["students"] = []
+PAGE = "Generate Plan"
 
 # -----------------------------
-# LOAD ROOMS FROM CSV
+# PAGE CONFIG
 # -----------------------------
-if "rooms" not in st.session_state:
-    if os.path.exists(ROOM_FILE) and os.path.getsize(ROOM_FILE) > 0:
-        st.session_state["rooms"] = pd.read_csv(ROOM_FILE).to_dict("records")
-    else:
-        st.session_state["rooms"] = []
+st.set_page_config(page_title="Generate Plan", layout="wide")
+ui.perf_panel()
 
 # -----------------------------
-# INIT PLAN
+# LOAD STUDENTS + ROOMS (shared cache, see seating/datastore.py)
 # -----------------------------
-if "plan" not in st.session_state:
-    st.session_state["plan"] = []
+with timing.span(PAGE, "load"):
+    students = datastore.load_students()
+    rooms = datastore.load_rooms()
 
 # -----------------------------
 # CSS THEME (Same All Pages)
@@ -102,18 +82,6 @@ div.stButton > button:hover {
 # -----------------------------
 st.markdown("<div class='main-header'>Seat Allotment Generator</div>", unsafe_allow_html=True)
 
-# -----------------------------
-# FETCH DATA
-# -----------------------------
-students = st.session_state["students"]
-rooms = st.session_state["rooms"]
-# ✅ FIX: If rooms is DataFrame convert to dict records
-if isinstance(rooms, pd.DataFrame):
-    rooms = rooms.to_dict("records")
-# ✅ FIX STUDENTS FORMAT (extra safety)
-if isinstance(students, pd.DataFrame):
-    students = students.to_dict("records")    
-
 # -----------------------------
 # VALIDATION CHECK
 # -----------------------------
@@ -152,137 +120,179 @@ st.markdown("""
 </h3>
 """, unsafe_allow_html=True)
 
+# rooms with their own "Seats per Bench" (Add Rooms) keep it
 seating_mode = st.selectbox(
     "How many students per bench?",
-    [1, 2],
+    list(range(1, geometry.MAX_SEATS_PER_BENCH + 1)),
     index=0
 )
 
+own_seats = geometry.seats_per_bench(rooms, 0)
+ui.oversized_benches_warning(rooms)
+if (own_seats > 0).any():
+    st.caption(
+        f"{int((own_seats > 0).sum())} of {len(rooms)} rooms set their own seats per bench; "
+        f"this applies to the other {int((own_seats == 0).sum())}."
+    )
+
+ALLOCATION_METHODS = {
+    "Branch Mixing (Fast)": "interleave",
+    "Minimise Same-Branch Neighbours": "graph",
+}
 
-# -----------------------------
-# GENERATE BUTTON
-# -----------------------------
+allocation_method = st.selectbox(
+    "Allocation method",
+    list(ALLOCATION_METHODS),
+    index=0,
+    help="Neighbour mode also checks the benches in front and behind, "
+         "and keeps improving the plan for up to the time budget."
+)
 
-if st.button(" Run Smart Seat Allotment"):
+time_budget = 2.0
+if ALLOCATION_METHODS[allocation_method] == "graph":
+    time_budget = st.slider("Time budget (seconds)", 1, 30, 2)
 
-    # -----------------------------
-    # STEP 1: MIX STUDENTS BY BRANCH
-    # -----------------------------
-    branches = {}
+# -----------------------------
+# DUPLICATE USN CHECK (persistent index, no roster scan)
+# -----------------------------
+with timing.span(PAGE, "duplicate check"):
+    collisions = datastore.student_usn_index().collisions()
+dedupe = False
+if collisions:
+    listed = ", ".join(f"{usn} (x{count})" for usn, count in list(collisions.items())[:20])
+    more = f" and {len(collisions) - 20} more" if len(collisions) > 20 else ""
+    st.warning(f"⚠ {len(collisions)} USNs are registered more than once: {listed}{more}")
+    dedupe = st.checkbox("Dedupe mode: seat each USN once (keep the first record)")
 
-    for s in students:
-        branch = s.get("Branch", "Other")
-        branches.setdefault(branch, []).append(s)
 
-    mixed_students = []
-    max_len = max(len(lst) for lst in branches.values())
+# -----------------------------
+# GENERATE BUTTON
+# -----------------------------
 
-    for i in range(max_len):
-        for b in branches:
-            if i < len(branches[b]):
-                mixed_students.append(branches[b][i])
+if st.button(" Run Smart Seat Allotment"):
 
-    total_students = len(mixed_students)
+    if collisions and not dedupe:
+        st.error("❌ Fix the duplicate USNs or turn on dedupe mode before allotting seats.")
+        st.stop()
 
     # -----------------------------
-    # STEP 2: CHECK TOTAL CAPACITY
+    # STEP 0-3: REUSE CACHED PLAN (same data + same settings), ELSE MIX,
+    # CHECK CAPACITY, ALLOT (see seating/allocator.py + plan_cache.py)
     # -----------------------------
-    total_benches = sum(int(r["Capacity"]) for r in rooms)
-    # total_capacity = total_benches * 2  # Max 2 students per bench
-    total_capacity = total_benches * seating_mode
-
-
-    if total_capacity < total_students:
+    try:
+        with timing.span(PAGE, "allocate", students=len(students)) as span:
+            final_plan, from_cache = plan_cache.allocate_cached(
+                students, rooms,
+                datastore.fingerprint(datastore.STUDENT_FILE),
+                datastore.fingerprint(datastore.ROOM_FILE),
+                seating_mode,
+                strategy=ALLOCATION_METHODS[allocation_method],
+                time_budget=time_budget,
+                dedupe=dedupe
+            )
+            span["cached"] = from_cache
+    except CapacityError as e:
         st.error(f"""
         ❌ Not enough benches!
 
-        Total Students = {total_students}
-        Total Benches = {total_benches}
-        Max Capacity (2 per bench) = {total_capacity}
+        Total Students = {e.total_students}
+        Total Benches = {e.total_benches}
+        Max Capacity (seats on all benches) = {e.total_capacity}
 
         Please add more rooms.
         """)
         st.stop()
 
-    # -----------------------------
-    # STEP 3: ALLOTMENT (1 OR 2 PER BENCH)
-    # -----------------------------
-    final_plan = []
-    idx = 0
-    serial = 1
-
-    for r in rooms:
-
-        room_name = r["Room Name"]
-        # benches = int(r["Capacity"])
-        benches = int(r.get("Capacity", 0))
-        capacity = benches * seating_mode
-
-        for bench_no in range(1, benches + 1):
-
-            if idx >= total_students:
-                break
-
-            # Student 1 always sits
-            s1 = mixed_students[idx]
-            idx += 1
-
-            # Student 2 sits only if available
-            s2 = None
-            if seating_mode == 2 and idx < total_students:
-                s2 = mixed_students[idx]
-                idx += 1
-
-                # Try to avoid same branch pairing
-                if s1.get("Branch") == s2.get("Branch"):
-                    if idx < total_students:
-                        swap_student = mixed_students[idx]
-                        mixed_students[idx] = s2
-                        s2 = swap_student
-
-            # Save bench seating
-            final_plan.append({
-                "S.No": serial,
-                "Room": room_name,
-                "Bench": bench_no,
-
-                "Student 1 USN": s1.get("USN"),
-                "Student 1 Name": s1.get("Name"),
-                "Student 1 Branch": s1.get("Branch"),
-
-                "Student 2 USN": s2.get("USN") if s2 else "-",
-                "Student 2 Name": s2.get("Name") if s2 else "-",
-                "Student 2 Branch": s2.get("Branch") if s2 else "-",
-            })
-
-            serial += 1
-
-    # -----------------------------
-    # STEP 4: SAVE PLAN
-    # -----------------------------
-    with st.spinner("Generating Seat Allotment Plan... Please wait"):
-     st.session_state["plan"] = final_plan
-
-    # st.success("✅ Seat Plan Generated Successfully!")
-
-
     # -----------------------------
     # STEP 4: SAVE PLAN
     # -----------------------------
-    with st.spinner("Generating Seat Allotment Plan... Please wait"):
-      st.session_state["plan"] = final_plan
-
+    with st.spinner("Generating Seat Allotment Plan... Please wait"), timing.span(PAGE, "save"):
       # ✅ SAVE PLAN TO CSV (IMPORTANT)
-      PLAN_FILE = os.path.join("data", "plan.csv")
-      pd.DataFrame(final_plan).to_csv(PLAN_FILE, index=False)
+      datastore.save_plan(final_plan)
 
-    st.success("✅ Seat Plan Generated + Saved Successfully!")
+    if from_cache:
+        st.success("✅ Seat Plan Loaded from Cache + Saved Successfully!")
+    else:
+        st.success("✅ Seat Plan Generated + Saved Successfully!")
+    st.caption(
+        f"Same-branch neighbour pairs in this plan: "
+        f"{final_plan.attrs.get('same_branch_neighbours', 0)}"
+    )
   
 
+# -----------------------------
+# LATE CHANGES: UPDATE THE SAVED PLAN IN PLACE (see seating/delta.py)
+# -----------------------------
+# New students go into free seats, students of removed rooms are re-homed,
+# everybody else keeps their seat - so printed hall reports stay valid
+# except for the halls listed below.
+if datastore.plan_exists():
+    with timing.span(PAGE, "diff"):
+        diff = datastore.plan_diff()
+
+    if delta.diff_size(diff):
+        st.markdown("""
+        <h3 style="color:#1E3A8A; font-weight:400; margin-top:10px;">
+         Late Changes Since the Plan Was Generated
+        </h3>
+        """, unsafe_allow_html=True)
+
+        removed = f" ({', '.join(map(str, diff['removed_rooms']))})" if diff["removed_rooms"] else ""
+        st.markdown(f"""
+        <div class="custom-alert">
+            <p style="color:#1E3A8A; margin:0;">
+            New students without a seat: <b>{len(diff['new'])}</b><br>
+            Seated students no longer on the roster: <b>{len(diff['withdrawn'])}</b><br>
+            Students to re-home from removed rooms / benches{removed}: <b>{len(diff['displaced'])}</b>
+            </p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        if st.button(" Update Current Plan (keep everyone else's seat)"):
+
+            if collisions and not dedupe:
+                st.error("❌ Fix the duplicate USNs or turn on dedupe mode before allotting seats.")
+                st.stop()
+
+            try:
+                with timing.span(PAGE, "reallocate", changes=delta.diff_size(diff)):
+                    updated_plan, changes = delta.reallocate(
+                        datastore.load_plan(), students, rooms, diff=diff
+                    )
+            except CapacityError as e:
+                st.error(f"""
+                ❌ Not enough free seats for the late changes!
+
+                Students = {e.total_students}
+                Benches = {e.total_benches}
+                Max Capacity = {e.total_capacity}
+
+                Please add more rooms, or regenerate the whole plan.
+                """)
+                st.stop()
+
+            with timing.span(PAGE, "save"):
+                datastore.save_plan(updated_plan)
+
+            halls = delta.affected_rooms(changes, diff["removed_rooms"])
+            st.success(f"✅ Plan Updated! {len(changes)} seats changed in {len(halls)} halls.")
+            st.caption("Only these hall reports need printing again: " + ", ".join(map(str, halls)))
+            st.dataframe(changes, hide_index=True, use_container_width=True)
+            st.download_button(
+                label="⬇ Download Changed Seats (CSV)",
+                data=changes.to_csv(index=False).encode("utf-8"),
+                file_name="Changed_Seats.csv",
+                mime="text/csv"
+            )
+
+
 # -----------------------------
 # PREVIEW OUTPUT
 # -----------------------------
-if "plan" in st.session_state and len(st.session_state["plan"]) > 0:
+with timing.span(PAGE, "load plan"):
+    plan_view = datastore.plan_viewer()
+
+if len(plan_view) > 0:
 
     st.markdown("""
     <h3 style="color:#1E3A8A; font-weight:800; margin-top:30px;">
@@ -291,9 +301,8 @@ if "plan" in st.session_state and len(st.session_state["plan"]) > 0:
     """, unsafe_allow_html=True)
 
 
-    preview_df = pd.DataFrame(st.session_state["plan"])
-
-    st.dataframe(preview_df, hide_index=True, use_container_width=True)
+    with timing.span(PAGE, "render"):
+        ui.plan_window(plan_view, key="preview")
 
     st.info("➡ Now go to **Download Report Page** to export the full report.")
 
@@ -1,17 +1,12 @@
 import streamlit as st
-import pandas as pd
 import os
+import tempfile
+import zipfile
 
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
+from seating import datastore, render_cache, reports, slips, timing, ui
+
+PAGE = "Hall Report PDF"
 
-# -----------------------------
-# FILE PATHS
-# -----------------------------
-DATA_FOLDER = "data"
-PLAN_FILE = os.path.join(DATA_FOLDER, "plan.csv")
 
 st.markdown("""
 <style>
@@ -90,120 +85,152 @@ h1 {
 # PAGE CONFIG
 # -----------------------------
 st.set_page_config(page_title="Hall Report PDF", layout="wide")
+ui.perf_panel()
 
 st.title(" Hall Seating Report")
 
 # -----------------------------
 # CHECK PLAN FILE
 # -----------------------------
-if not os.path.exists(PLAN_FILE) or os.path.getsize(PLAN_FILE) == 0:
+if not datastore.plan_exists():
     st.error(" Seating Plan not found. Please Generate Plan first.")
     st.stop()
 
 # -----------------------------
-# LOAD PLAN FILE
+# ROOM DROPDOWN (indexed lookups, see seating/datastore.py)
 # -----------------------------
-plan_df = pd.read_csv(PLAN_FILE)
-plan_df.columns = plan_df.columns.str.strip()
-
-# -----------------------------
-# ROOM DROPDOWN
-# -----------------------------
-rooms = plan_df["Room"].unique().tolist()
+with timing.span(PAGE, "load"):
+    rooms = datastore.plan_rooms()
 
 selected_room = st.selectbox(" Select Room for PDF Report", rooms)
 
-room_df = plan_df[plan_df["Room"] == selected_room]
+with timing.span(PAGE, "load room"):
+    room_df = datastore.plan_for_room(selected_room)
 
 # -----------------------------
-# PDF FUNCTION (Only USN Report)
+# BUTTON (ONLY PDF DOWNLOAD)
 # -----------------------------
-def generate_pdf(room_name, room_data):
-    filename = f"Hall_Report_{room_name}.pdf"
-
-    doc = SimpleDocTemplate(filename, pagesize=A4)
-    elements = []
-
-    styles = getSampleStyleSheet()
-
-    # -----------------------------
-    # TITLE
-    # -----------------------------
-    elements.append(Paragraph("EXAM HALL SEATING REPORT", styles["Title"]))
-    elements.append(Spacer(1, 15))
-
-    elements.append(Paragraph(f"Room Name: {room_name}", styles["Heading2"]))
-    elements.append(Spacer(1, 20))
-
-    # -----------------------------
-    # TABLE HEADER (Only USN + Branch)
-    # -----------------------------
-    table_data = [["Bench No", "USN", "Branch"]]
-
-    # -----------------------------
-    # ADD STUDENTS ROW-WISE
-    # -----------------------------
-    for _, row in room_data.iterrows():
-
-        bench = row["Bench"]
+if st.button(" Generate Supervisor Hall Report PDF"):
 
-        usn1 = str(row["Student 1 USN"]).strip()
-        branch1 = str(row["Student 1 Branch"]).strip()
+    # rendered in memory (seating/reports.py), cached per hall content
+    with timing.span(PAGE, "hall pdf", rows=len(room_df)):
+        pdf_bytes = reports.cached_hall_report(selected_room, reports.hall_rows(room_df))
 
-        # Add Student 1
-        if usn1 != "-" and usn1 != "":
-            table_data.append([bench, usn1, branch1])
+    st.download_button(
+        label="⬇ Download PDF Report",
+        data=pdf_bytes,
+        file_name=reports.pdf_filename(selected_room),
+        mime="application/pdf"
+    )
 
-        usn2 = str(row["Student 2 USN"]).strip()
-        branch2 = str(row["Student 2 Branch"]).strip()
+    st.success("✅ Hall Report PDF Generated Successfully!")
 
-        # Add Student 2 (as separate row)
-        if usn2 != "-" and usn2 != "":
-            table_data.append([bench, usn2, branch2])
 
-    # -----------------------------
-    # CREATE TABLE
-    # -----------------------------
-    table = Table(table_data, colWidths=[90, 200, 150])
+# -----------------------------
+# ALL HALLS (one ZIP, rendered in parallel)
+# -----------------------------
+st.divider()
+st.subheader(" All Halls")
+st.caption(f"{len(rooms)} rooms, rendered on {os.cpu_count() or 1} CPU cores")
+
+if st.button(" Generate PDFs for All Halls"):
+    view = datastore.plan_viewer()
+    jobs = [
+        (room, reports.hall_rows(view.seats.iloc[view.room_rows(room)]))
+        for room in rooms
+    ]
+
+    progress = st.progress(0.0, text="Rendering hall reports...")
+
+    def on_progress(done, total):
+        progress.progress(done / total, text=f"Rendered {done} / {total} halls")
+
+    # PDFs go into the ZIP as they finish, spooled to a temp file
+    with tempfile.TemporaryFile() as zip_file, timing.span(PAGE, "all halls zip", halls=len(jobs)):
+        failed = reports.render_all_halls(jobs, zip_file, on_progress=on_progress)
+        zip_file.seek(0)
+        zip_bytes = zip_file.read()
+
+    if failed:
+        st.warning(
+            f"⚠ {len(failed)} halls failed and were left out "
+            f"(listed in FAILED_ROOMS.txt): {', '.join(map(str, failed))}"
+        )
+    st.success(f"✅ {len(jobs) - len(failed)} Hall Reports Ready!")
 
-    table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-        ("GRID", (0, 0), (-1, -1), 1, colors.black),
+    st.download_button(
+        label="⬇ Download All Hall Reports (ZIP)",
+        data=zip_bytes,
+        file_name="Hall_Reports.zip",
+        mime="application/zip"
+    )
 
-        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
 
-        ("FONTSIZE", (0, 0), (-1, 0), 12),
-        ("FONTSIZE", (0, 1), (-1, -1), 11),
-    ]))
+# -----------------------------
+# MASTER REPORT (cover index + every room + USN list)
+# -----------------------------
+st.divider()
+st.subheader(" Master Seating Report")
 
-    elements.append(table)
+if st.button(" Generate Master Report"):
+    cache_key = render_cache.render_key("master", datastore.fingerprint(datastore.PLAN_FILE))
+    master_pdf = render_cache.get(cache_key)
 
-    # -----------------------------
-    # SIGNATURE
-    # -----------------------------
-    elements.append(Spacer(1, 40))
-    elements.append(Paragraph("Supervisor Signature: ____________________", styles["Normal"]))
+    if master_pdf is None:
+        progress = st.progress(0.0, text="Laying out master report...")
 
-    doc.build(elements)
+        def on_master_progress(done, total):
+            progress.progress(min(done / max(total, 1), 1.0), text=f"Laid out {done} / {total} rows")
 
-    return filename
+        with tempfile.TemporaryFile() as pdf_file, timing.span(PAGE, "master pdf"):
+            reports.master_report(datastore.load_plan(), pdf_file, on_progress=on_master_progress)
+            pdf_file.seek(0)
+            master_pdf = pdf_file.read()
+        render_cache.put(cache_key, master_pdf)
 
+    st.success("✅ Master Report Ready!")
+    st.download_button(
+        label="⬇ Download Master Report",
+        data=master_pdf,
+        file_name="Master_Seating_Report.pdf",
+        mime="application/pdf"
+    )
 
 
 # -----------------------------
-# BUTTON (ONLY PDF DOWNLOAD)
+# SEAT SLIPS (one per student, one PDF per branch / semester)
 # -----------------------------
-if st.button(" Generate Supervisor Hall Report PDF"):
+st.divider()
+st.subheader(" Student Seat Slips")
 
-    pdf_file = generate_pdf(selected_room, room_df)
+slip_group = st.selectbox("One PDF per", list(slips.GROUPS), key="slip_group")
 
-    with open(pdf_file, "rb") as f:
-        st.download_button(
-            label="⬇ Download PDF Report",
-            data=f,
-            file_name=pdf_file,
-            mime="application/pdf"
+if st.button(" Generate Seat Slips"):
+    progress = st.progress(0.0, text="Printing seat slips...")
+
+    def on_slip_progress(done, total):
+        progress.progress(min(done / max(total, 1), 1.0), text=f"Printed {done} / {total} slips")
+
+    with tempfile.TemporaryDirectory() as out_dir, timing.span(PAGE, "seat slips"):
+        slip_report = slips.generate_slips(
+            datastore.load_plan(), datastore.load_students(), out_dir,
+            group_by=slip_group, on_progress=on_slip_progress
         )
 
-    st.success("✅ Hall Report PDF Generated Successfully!")
+        with tempfile.TemporaryFile() as zip_file:
+            with zipfile.ZipFile(zip_file, "w", compression=zipfile.ZIP_STORED) as zf:
+                for name in slip_report["files"]:
+                    zf.write(os.path.join(out_dir, name), name)
+            zip_file.seek(0)
+            slips_zip = zip_file.read()
+
+    if slip_report["failed"]:
+        st.warning(f"⚠ Failed: {', '.join(slip_report['failed'])}")
+    st.success(f"✅ {slip_report['slips']} Seat Slips in {len(slip_report['files'])} PDFs Ready!")
+
+    st.download_button(
+        label="⬇ Download Seat Slips (ZIP)",
+        data=slips_zip,
+        file_name=f"Seat_Slips_by_{slip_group}.zip",
+        mime="application/zip"
+    )
@@ -1,20 +1,10 @@
 
 
 import streamlit as st
-import pandas as pd
-import os
 
-st.set_page_config(page_title="Upload Students", layout="wide")
-
-# -----------------------------
-# FILE PATH
-# -----------------------------
-DATA_FOLDER = "data"
-STUDENT_FILE = os.path.join(DATA_FOLDER, "students.csv")
+from seating import datastore, ingest
 
-# Create data folder if missing
-if not os.path.exists(DATA_FOLDER):
-    os.makedirs(DATA_FOLDER)
+st.set_page_config(page_title="Upload Students", layout="wide")
 
 # -----------------------------
 # CSS STYLE (Same UI)
@@ -164,19 +154,9 @@ div[role="radiogroup"] * {
 """, unsafe_allow_html=True)
 
 # -----------------------------
-# LOAD STUDENTS FROM CSV (FIXED)
+# LOAD STUDENTS FROM CSV (shared cache, see seating/datastore.py)
 # -----------------------------
-if "students" not in st.session_state:
-    if os.path.exists(STUDENT_FILE) and os.path.getsize(STUDENT_FILE) > 0:
-        st.session_state["students"] = pd.read_csv(STUDENT_FILE)
-    else:
-        st.session_state["students"] = pd.DataFrame(
-            columns=["USN", "Name", "Sem", "Branch", "Type", "Subjects"]
-        )
-
-# ✅ EXTRA FIX: If students becomes list after refresh, convert back
-if isinstance(st.session_state["students"], list):
-    st.session_state["students"] = pd.DataFrame(st.session_state["students"])
+students_df = datastore.load_students()
 
 # -----------------------------
 # TITLE
@@ -203,7 +183,7 @@ with tab1:
     with col3:
         sem = st.selectbox("Semester", [1,2,3,4,5,6,7,8])
     with col4:
-        branch = st.selectbox("Branch", ["CSE", "EEE", "ECE", "MEC", "CVL"])
+        branch = st.selectbox("Branch", ingest.BRANCHES)
 
     col5, col6 = st.columns(2)
     with col5:
@@ -214,6 +194,8 @@ with tab1:
     if st.button("Add Student"):
         if usn.strip() == "" or name.strip() == "":
             st.warning("⚠ Please enter USN and Name")
+        elif usn in datastore.student_usn_index():
+            st.error(f"❌ USN {usn.strip().upper()} is already registered")
         else:
             new_student = {
                 "USN": usn.upper(),
@@ -224,12 +206,8 @@ with tab1:
                 "Subjects": subjects
             }
 
-            st.session_state["students"] = pd.concat(
-                [st.session_state["students"], pd.DataFrame([new_student])],
-                ignore_index=True
-            )
-
-            st.session_state["students"].to_csv(STUDENT_FILE, index=False)
+            # one journal line, no full rewrite of students.csv
+            datastore.add_student(new_student)
 
             st.success(" Student Added Successfully!")
             st.rerun()
@@ -243,18 +221,40 @@ with tab2:
     uploaded_file = st.file_uploader("Upload Student CSV", type=["csv"])
 
     if uploaded_file is not None:
-        df = pd.read_csv(uploaded_file)
+        missing = ingest.missing_columns(uploaded_file)
+
+        if missing:
+            st.error("CSV must contain columns: USN, Name, Sem, Branch, Type, Subjects")
 
-        required_cols = ["USN", "Name", "Sem", "Branch", "Type", "Subjects"]
+        elif st.button("Import Students"):
+            progress = st.progress(0, text="Validating upload...")
 
-        if all(col in df.columns for col in required_cols):
-            st.session_state["students"] = df
-            df.to_csv(STUDENT_FILE, index=False)
+            def show_progress(done, total):
+                progress.progress(done / total, text=f"Processed chunk {done} of {total}")
 
-            st.success(" Students Uploaded Successfully!")
-            st.rerun()
-        else:
-            st.error("CSV must contain columns: USN, Name, Sem, Branch, Type, Subjects")
+            # Streamed in chunks: validated, de-duplicated, written as it goes
+            report = ingest.ingest_students(
+                uploaded_file,
+                lambda chunks: datastore.write_table_chunks(datastore.STUDENT_FILE, chunks),
+                on_progress=show_progress
+            )
+            progress.progress(1.0, text="Done")
+
+            if report["replaced"]:
+                st.success(f" {report['accepted']} Students Uploaded Successfully!")
+            else:
+                st.error("❌ No valid rows in this file, the existing student list was kept.")
+
+            if report["rejected"]:
+                st.warning(f"⚠ {report['rejected']} rows were rejected (invalid or duplicate).")
+                st.download_button(
+                    label="⬇ Download Error Report",
+                    data=report["errors"],
+                    file_name="upload_errors.csv",
+                    mime="text/csv"
+                )
+
+            students_df = datastore.load_students()
 
 # -----------------------------
 # REGISTERED STUDENTS TABLE
@@ -262,7 +262,7 @@ with tab2:
 st.markdown("## Registered Students")
 
 # ✅ SAFE CHECK (No refresh error)
-if isinstance(st.session_state["students"], pd.DataFrame) and not st.session_state["students"].empty:
-    st.dataframe(st.session_state["students"], hide_index=True, use_container_width=True)
+if not students_df.empty:
+    st.dataframe(students_df, hide_index=True, use_container_width=True)
 else:
     st.info("No students registered yet.")
@@ -1,44 +1,22 @@
 
 
 import streamlit as st
-import pandas as pd
-import os
+
+from seating import datastore, ingest, plan_view, timing, ui
+
+PAGE = "View Output"
 
 # -----------------------------
 # 1. PAGE CONFIG
 # -----------------------------
 st.set_page_config(page_title="View Output", layout="wide")
+ui.perf_panel()
 
 # -----------------------------
-# 0. LOAD STUDENTS, ROOMS, AND PLAN FROM CSV
+# 0. LOAD PLAN FROM CSV (shared cache, see seating/datastore.py)
 # -----------------------------
-DATA_FOLDER = "data"
-STUDENT_FILE = os.path.join(DATA_FOLDER, "students.csv")
-ROOM_FILE = os.path.join(DATA_FOLDER, "rooms.csv")
-PLAN_FILE = os.path.join(DATA_FOLDER, "plan.csv")
-
-# Load students
-if "students" not in st.session_state:
-    if os.path.exists(STUDENT_FILE) and os.path.getsize(STUDENT_FILE) > 0:
-        st.session_state["students"] = pd.read_csv(STUDENT_FILE).to_dict("records")
-    else:
-        st.session_state["students"] = []
-
-# Load rooms
-if "rooms" not in st.session_state:
-    if os.path.exists(ROOM_FILE) and os.path.getsize(ROOM_FILE) > 0:
-        st.session_state["rooms"] = pd.read_csv(ROOM_FILE).to_dict("records")
-    else:
-        st.session_state["rooms"] = []
-
-# Load plan
-if "plan" not in st.session_state:
-    if os.path.exists(PLAN_FILE) and os.path.getsize(PLAN_FILE) > 0:
-        st.session_state["plan"] = pd.read_csv(PLAN_FILE).to_dict("records")
-    else:
-        st.session_state["plan"] = []
-
-
+with timing.span(PAGE, "load"):
+    plan_df = datastore.load_plan()
 
 # -----------------------------
 # 2. MATCHING THEME CSS (UNCHANGED)
@@ -85,7 +63,7 @@ st.markdown('<div class="main-header"> Examination Allotment List</div>', unsafe
 # -----------------------------
 # 3. CHECK IF PLAN EXISTS
 # -----------------------------
-if not st.session_state.get("plan"):
+if plan_df.empty:
 
     st.markdown("""
         <div class="custom-alert">
@@ -99,25 +77,6 @@ if not st.session_state.get("plan"):
     """, unsafe_allow_html=True)
 
 else:
-    # -----------------------------
-    # LOAD PLAN DATAFRAME
-    # -----------------------------
-    df = pd.DataFrame(st.session_state["plan"])
-
-    # ✅ Define filtered_df properly
-    filtered_df = df.copy()
-
-    # ✅ Clean column names
-    filtered_df.columns = filtered_df.columns.str.strip()
-
-    # ✅ Force USN columns into safe string format (NO .str ERROR EVER)
-    filtered_df["Student 1 USN"] = filtered_df["Student 1 USN"].apply(
-        lambda x: "" if pd.isna(x) else str(x)
-    )
-    filtered_df["Student 2 USN"] = filtered_df["Student 2 USN"].apply(
-        lambda x: "" if pd.isna(x) else str(x)
-    )
-
     # -----------------------------
     # 4. FILTER SECTION UI (UNCHANGED)
     # -----------------------------
@@ -126,10 +85,10 @@ else:
     col1, col2 = st.columns(2)
 
     with col1:
-        search_usn = st.text_input(" Search USN", placeholder="Enter USN...")
+        search_usn = st.text_input(" Search USN / Name", placeholder="Enter USN or name...")
 
     with col2:
-        room_list = ["All Rooms"] + sorted(filtered_df["Room"].unique().tolist())
+        room_list = ["All Rooms"] + sorted(datastore.plan_viewer().room_names)
         selected_room = st.selectbox("Filter by Room", room_list)
 
     st.markdown("</div>", unsafe_allow_html=True)
@@ -137,23 +96,29 @@ else:
     # -----------------------------
     # 5. FILTER LOGIC (FIXED)
     # -----------------------------
-    if search_usn:
-        search_usn = search_usn.strip()
-
-        filtered_df = filtered_df[
-            (filtered_df["Student 1 USN"].str.contains(search_usn, case=False)) |
-            (filtered_df["Student 2 USN"].str.contains(search_usn, case=False))
-        ]
-
-    if selected_room != "All Rooms":
-        filtered_df = filtered_df[filtered_df["Room"] == selected_room]
+    with timing.span(PAGE, "filter") as span:
+        view = datastore.plan_viewer()
+
+        positions = None
+        if ingest.is_usn(search_usn):
+            # a whole USN: index seek on SQLite, see datastore.plan_for_usn
+            view = plan_view.PlanView(datastore.plan_for_usn(search_usn).reset_index(drop=True))
+        elif search_usn.strip():
+            # prebuilt index over USNs + name words, see seating/search_index.py
+            positions = view.search(search_usn)
+
+        # room filter: row range from the per-room offset index, no scan
+        room = None if selected_room == "All Rooms" else selected_room
+        positions = view.rows(positions, room=room)
+        span["rows"] = len(positions)
 
     # -----------------------------
-    # 6. DISPLAY RESULTS
+    # 6. DISPLAY RESULTS (one page at a time)
     # -----------------------------
     st.markdown(
-        f"<h3 style='color: #1E3A8A;'>Results ({len(filtered_df)} Rows)</h3>",
+        f"<h3 style='color: #1E3A8A;'>Results ({len(positions)} Rows)</h3>",
         unsafe_allow_html=True
     )
 
-    st.dataframe(filtered_df, use_container_width=True, hide_index=True)
+    with timing.span(PAGE, "render"):
+        ui.plan_window(view, positions, key="output", room_jump=False)
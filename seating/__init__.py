@@ -0,0 +1 @@
+# Shared (non-UI) logic used by the Streamlit pages.
@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+
+from seating import geometry
+from seating.layout import SEAT_COLUMNS
+from seating.solver import seat_edges, minimise_conflicts, count_conflicts
+
+# "interleave": round robin by branch (+ bench swap in 2 per bench mode)
+# "graph": interleave, then minimise same-branch neighbours (bench, front/back,
+# and across benches of a row when the room has a bench grid, see geometry.py)
+STRATEGIES = ["interleave", "graph"]
+
+
+class CapacityError(ValueError):
+    def __init__(self, total_students, total_benches, total_capacity):
+        self.total_students = total_students
+        self.total_benches = total_benches
+        self.total_capacity = total_capacity
+        super().__init__(
+            f"Not enough benches: {total_students} students, "
+            f"{total_benches} benches, capacity {total_capacity}"
+        )
+
+
+# -----------------------------
+# STEP 1: MIX STUDENTS BY BRANCH
+# -----------------------------
+def branch_codes(branches):
+    # Integer code per student, numbered in first-seen order
+    codes, labels = pd.factorize(pd.Series(branches).astype(object).fillna("Other"), sort=False)
+    return codes.astype(np.int64), labels
+
+
+def interleave_order(codes):
+    # Round robin over branches: 1st of every branch, then 2nd of every branch, ...
+    codes = np.asarray(codes, dtype=np.int64)
+    n = len(codes)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+
+    by_branch = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes)
+    starts = np.cumsum(counts) - counts
+
+    rank = np.empty(n, dtype=np.int64)
+    rank[by_branch] = np.arange(n) - np.repeat(starts, counts)
+
+    return np.lexsort((codes, rank))
+
+
+def break_pairs(codes, order):
+    # Two per bench: if both students on a bench share a branch, swap the
+    # second one with the next student in line (only when that helps).
+    order = order.copy()
+    seq = codes[order]
+    n = len(order)
+
+    pending = list(np.flatnonzero(seq[0:n - 1:2] == seq[1:n:2]) * 2 + 1)
+    pending.reverse()
+
+    while pending:
+        i = pending.pop()
+        j = i + 1
+        if j >= n or seq[i - 1] != seq[i] or seq[j] == seq[i]:
+            continue
+        order[i], order[j] = order[j], order[i]
+        seq[i], seq[j] = seq[j], seq[i]
+        # the student moved forward now starts the next bench
+        if j + 1 < n and seq[j] == seq[j + 1]:
+            if not pending or pending[-1] != j + 1:
+                pending.append(j + 1)
+
+    return order
+
+
+# -----------------------------
+# STEP 2 + 3: CAPACITY AND BENCHES
+# -----------------------------
+def bench_positions(capacities, n_benches):
+    # Map global bench numbers 0..n_benches-1 onto (room index, bench no)
+    capacities = np.asarray(capacities, dtype=np.int64)
+    room_end = np.cumsum(capacities)
+    room_start = room_end - capacities
+
+    g = np.arange(n_benches, dtype=np.int64)
+    room_idx = np.searchsorted(room_end, g, side="right")
+    bench_no = g - room_start[room_idx] + 1
+
+    return room_idx, bench_no
+
+
+def seat_positions(capacities, per_bench, n_seats):
+    # Map global seats 0..n_seats-1 onto (room index, bench no, seat no),
+    # filling rooms in order, each with its own students per bench
+    capacities = np.asarray(capacities, dtype=np.int64)
+    per_bench = np.asarray(per_bench, dtype=np.int64)
+    room_seats = capacities * per_bench
+    room_end = np.cumsum(room_seats)
+    room_start = room_end - room_seats
+
+    g = np.arange(n_seats, dtype=np.int64)
+    room_idx = np.searchsorted(room_end, g, side="right")
+    local = g - room_start[room_idx]
+    pb = per_bench[room_idx]
+
+    return room_idx, local // pb + 1, local % pb + 1
+
+
+def allocate(students, rooms, seating_mode=1, strategy="interleave", time_budget=2.0,
+             dedupe=False):
+    # `seating_mode`: students per bench in rooms without their own
+    # "Seats per Bench" (see geometry.py)
+    students = pd.DataFrame(students)
+    rooms = pd.DataFrame(rooms)
+
+    if dedupe:
+        # seat each USN once, keeping its first registration
+        keys = students["USN"].astype(str).str.strip().str.upper()
+        students = students[~keys.duplicated()].reset_index(drop=True)
+
+    n = len(students)
+    shapes = geometry.room_shapes(rooms)
+    capacities = np.array([geometry.capacity(s) for s in shapes], dtype=np.int64)
+    per_bench = geometry.seats_per_bench(rooms, seating_mode)
+
+    total_benches = int(capacities.sum())
+    total_capacity = int((capacities * per_bench).sum())
+
+    if total_capacity < n:
+        raise CapacityError(n, total_benches, total_capacity)
+
+    room_idx, bench_no, seat_no = seat_positions(capacities, per_bench, n)
+    uniform = int(per_bench[0]) if len(per_bench) and (per_bench == per_bench[0]).all() else None
+
+    if uniform and not any(s[1] > 1 or s[2] for s in shapes):
+        # every room is one column of benches with the same seats per bench:
+        # plain bench / front-back rule
+        bench_room, _ = bench_positions(capacities, -(-n // uniform))
+        edges_u, edges_v = seat_edges(bench_room, uniform, n)
+    else:
+        # neighbour pairs from the cached per-room arrays
+        edges_u, edges_v = geometry.seat_edges(shapes, per_bench, n)
+
+    codes, _ = branch_codes(students["Branch"])
+    order = interleave_order(codes)
+    if strategy == "graph":
+        order = order[minimise_conflicts(codes[order], edges_u, edges_v, time_budget)]
+    elif uniform == 2:
+        order = break_pairs(codes, order)
+
+    # one row per seat, in seating order
+    plan = pd.DataFrame({
+        "Room": rooms["Room Name"].to_numpy(dtype=object)[room_idx],
+        "Bench": bench_no,
+        "Seat": seat_no,
+        "USN": students["USN"].to_numpy(dtype=object)[order],
+        "Name": students["Name"].to_numpy(dtype=object)[order],
+        "Branch": students["Branch"].to_numpy(dtype=object)[order],
+    }, columns=SEAT_COLUMNS)
+
+    plan.attrs["same_branch_neighbours"] = count_conflicts(codes[order], edges_u, edges_v)
+    return plan
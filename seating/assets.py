@@ -0,0 +1,58 @@
+import base64
+import io
+import os
+import threading
+
+# -----------------------------
+# PAGE IMAGES
+# -----------------------------
+# Images inlined into page HTML are downscaled to the size they are shown
+# at and encoded once per process, instead of base64-ing the full file on
+# every rerun. Falls back to the original file if Pillow is missing.
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+_cache = {}  # (path, height) -> (mtime/size, data URI)
+_lock = threading.Lock()
+
+
+def _downscale(path, height):
+    with Image.open(path) as im:
+        im = im.convert("RGB")
+        if im.height > height:
+            im = im.resize((round(im.width * height / im.height), height), Image.LANCZOS)
+        buf = io.BytesIO()
+        im.save(buf, format="JPEG", quality=85, optimize=True, progressive=True)
+    return "image/jpeg", buf.getvalue()
+
+
+def image_data_uri(path, height=260):
+    # `height` in pixels: about twice the CSS height, so it stays sharp on
+    # high-DPI screens. Returns "" if the file is missing or unreadable.
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ""
+    version = (st.st_mtime_ns, st.st_size)
+
+    key = (path, height)
+    with _lock:
+        hit = _cache.get(key)
+    if hit is not None and hit[0] == version:
+        return hit[1]
+
+    try:
+        if Image is not None:
+            mime, data = _downscale(path, height)
+        else:
+            with open(path, "rb") as f:
+                mime, data = "image/png", f.read()
+    except OSError:
+        return ""
+
+    uri = f"data:{mime};base64,{base64.b64encode(data).decode()}"
+    with _lock:
+        _cache[key] = (version, uri)
+    return uri
@@ -0,0 +1,404 @@
+import argparse
+import json
+import sys
+
+import pandas as pd
+
+from seating import datastore, delta, geometry, layout, plan_cache, timetable
+from seating.allocator import STRATEGIES, CapacityError
+from seating.usn_index import UsnIndex
+
+# -----------------------------
+# HEADLESS COMMAND LINE
+# -----------------------------
+# Same allocation and reports as the Streamlit pages, without importing
+# Streamlit (e.g. for cron on the exam-cell server). Run from the app
+# folder so data/ resolves as it does for the pages:
+#
+#   python -m seating.cli allocate --per-bench 2 --strategy graph
+#   python -m seating.cli update --changes changed.csv --halls Changed_Halls.zip
+#   python -m seating.cli timetable --file timetable.csv --per-bench 2
+#   python -m seating.cli clashes --file timetable.csv --out clashes.csv
+#   python -m seating.cli halls --out Hall_Reports.zip
+#   python -m seating.cli master --out Master_Seating_Report.pdf
+#   python -m seating.cli slips --group-by Semester --out slips/
+#   python -m seating.cli summary --format json
+#
+# Exit codes: 0 ok, 2 not enough benches, 3 duplicate USNs, 4 no plan,
+# 5 some reports failed.
+
+OUTPUT_FORMATS = ["csv", "wide-csv", "json"]
+PER_BENCH = list(range(1, geometry.MAX_SEATS_PER_BENCH + 1))
+
+
+def _read_csv(path):
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.strip()
+    return df
+
+
+def _write_plan(plan, path, fmt):
+    if fmt == "wide-csv":
+        layout.to_wide(plan).to_csv(path, index=False)
+    elif fmt == "json":
+        plan.to_json(path, orient="records", indent=1)
+    else:
+        plan.to_csv(path, index=False)
+
+
+def _warn_oversized(rooms):
+    over = geometry.oversized_benches(rooms)
+    if over:
+        print(
+            f"Seats per Bench is over {geometry.MAX_SEATS_PER_BENCH} for {len(over)} rooms "
+            f"({', '.join(over[:10])}); they are seated {geometry.MAX_SEATS_PER_BENCH} per bench.",
+            file=sys.stderr,
+        )
+
+
+def _load_plan(args):
+    plan = _read_csv(args.plan) if args.plan else datastore.load_plan()
+    if layout.is_wide(plan):
+        plan = layout.from_wide(plan)
+    if plan.empty:
+        print("No seating plan found. Run `allocate` first.", file=sys.stderr)
+        return None
+    return plan
+
+
+# -----------------------------
+# COMMANDS
+# -----------------------------
+def cmd_allocate(args):
+    if args.students:
+        students = _read_csv(args.students)
+        student_digest = plan_cache.file_digest(args.students)
+        collisions = UsnIndex.from_usns(students["USN"]).collisions()
+    else:
+        students = datastore.load_students()
+        student_digest = datastore.fingerprint(datastore.STUDENT_FILE)
+        collisions = datastore.student_usn_index().collisions()
+
+    if args.rooms:
+        rooms = _read_csv(args.rooms)
+        room_digest = plan_cache.file_digest(args.rooms)
+    else:
+        rooms = datastore.load_rooms()
+        room_digest = datastore.fingerprint(datastore.ROOM_FILE)
+    _warn_oversized(rooms)
+
+    if collisions and not args.dedupe:
+        listed = ", ".join(list(collisions)[:20])
+        print(f"{len(collisions)} USNs are registered more than once: {listed}", file=sys.stderr)
+        print("Fix the roster or pass --dedupe to keep the first record of each.", file=sys.stderr)
+        return 3
+
+    try:
+        plan, from_cache = plan_cache.allocate_cached(
+            students, rooms, student_digest, room_digest, args.per_bench,
+            strategy=args.strategy, time_budget=args.time_budget, dedupe=args.dedupe,
+        )
+    except CapacityError as e:
+        print(
+            f"Not enough benches: {e.total_students} students, {e.total_benches} benches, "
+            f"capacity {e.total_capacity} seats",
+            file=sys.stderr,
+        )
+        return 2
+
+    if args.output:
+        _write_plan(plan, args.output, args.format)
+        where = args.output
+    else:
+        datastore.save_plan(plan)
+        where = datastore.PLAN_FILE
+
+    source = "cache" if from_cache else "allocated"
+    print(
+        f"{len(plan)} students seated ({source}), "
+        f"{plan.attrs.get('same_branch_neighbours', 0)} same-branch neighbour pairs -> {where}"
+    )
+    return 0
+
+
+def cmd_update(args):
+    # late roster / room changes into the saved plan, see seating/delta.py
+    if not datastore.plan_exists():
+        print("No seating plan found. Run `allocate` first.", file=sys.stderr)
+        return 4
+
+    collisions = datastore.student_usn_index().collisions()
+    if collisions and not args.dedupe:
+        print(f"{len(collisions)} USNs are registered more than once.", file=sys.stderr)
+        print("Fix the roster or pass --dedupe to keep the first record of each.", file=sys.stderr)
+        return 3
+
+    diff = datastore.plan_diff()
+    if not delta.diff_size(diff):
+        print("Plan is up to date with the roster and rooms.")
+        return 0
+
+    try:
+        plan, changes = delta.reallocate(
+            datastore.load_plan(), datastore.load_students(), datastore.load_rooms(), diff=diff
+        )
+    except CapacityError as e:
+        print(
+            f"Not enough free seats: {e.total_students} students, capacity {e.total_capacity}",
+            file=sys.stderr,
+        )
+        return 2
+
+    datastore.save_plan(plan)
+    halls = delta.affected_rooms(changes, diff["removed_rooms"])
+    counts = changes["Change"].value_counts()
+    print(
+        f"{counts.get('seated', 0)} seated, {counts.get('moved', 0)} moved, "
+        f"{counts.get('vacated', 0)} vacated in {len(halls)} halls -> {datastore.PLAN_FILE}"
+    )
+    for hall in halls:
+        print(f"  {hall}")
+
+    if args.changes:
+        changes.to_csv(args.changes, index=False)
+        print(f"changed seats -> {args.changes}")
+
+    if args.halls and halls:
+        from seating import reports
+
+        view = datastore.plan_viewer()
+        jobs = [(room, reports.hall_rows(view.seats.iloc[view.room_rows(room)])) for room in halls]
+        failed = reports.render_all_halls(jobs, args.halls, on_progress=_progress("halls"))
+        print(f"{len(jobs) - len(failed)} changed hall reports -> {args.halls}")
+        if failed:
+            return 5
+    return 0
+
+
+def cmd_timetable(args):
+    # one plan per exam slot into data/slots/, see seating/timetable.py
+    table = _read_csv(args.file) if args.file else datastore.load_timetable()
+    problems = timetable.validate(table) if len(table) else ["no slots (pass --file or save one in the app)"]
+    if problems:
+        for problem in problems:
+            print(f"Timetable: {problem}", file=sys.stderr)
+        return 4
+
+    collisions = datastore.student_usn_index().collisions()
+    if collisions and not args.dedupe:
+        print(f"{len(collisions)} USNs are registered more than once.", file=sys.stderr)
+        print("Fix the roster or pass --dedupe to keep the first record of each.", file=sys.stderr)
+        return 3
+
+    if args.file:
+        datastore.save_timetable(table)
+
+    rooms = datastore.load_rooms()
+    _warn_oversized(rooms)
+    summary = timetable.allocate_slots(
+        datastore.load_students(), rooms, table, args.per_bench,
+        strategy=args.strategy, time_budget=args.time_budget, dedupe=args.dedupe,
+        index=datastore.subject_index(), workers=args.workers,
+        on_slot=datastore.save_slot_plan, on_progress=_progress("slots"),
+    )
+    # a slot that failed this run keeps its last good plan
+    datastore.clear_slot_plans(keep=list(summary))
+
+    failed = 0
+    for slot, r in summary.items():
+        if r["error"]:
+            failed += 1
+            print(f"  failed: {slot}: {r['error']}", file=sys.stderr)
+        else:
+            print(
+                f"  {slot:<30} {r['seated']:>6} seated in {r['rooms']} rooms, "
+                f"{r['same_branch_neighbours']} same-branch pairs"
+            )
+    print(f"{len(summary) - failed} slot plans -> {datastore.SLOT_FOLDER}")
+    return 2 if failed else 0
+
+
+def cmd_clashes(args):
+    # students with two subjects in one slot of the timetable
+    table = _read_csv(args.file) if args.file else datastore.load_timetable()
+    problems = timetable.validate(table) if len(table) else ["no slots (pass --file or save one in the app)"]
+    if problems:
+        for problem in problems:
+            print(f"Timetable: {problem}", file=sys.stderr)
+        return 4
+
+    clashes = timetable.find_clashes(datastore.load_students(), table, datastore.subject_index())
+    if args.out:
+        clashes.to_csv(args.out, index=False)
+
+    arrear = int((clashes["Type"].astype(str) == "Arrear").sum())
+    print(f"{len(clashes)} subject clashes ({clashes['USN'].nunique()} students, {arrear} arrear)")
+    for slot, count in clashes.groupby("Slot", sort=False).size().items():
+        print(f"  {slot:<30} {count:>6}")
+    if args.out:
+        print(f"clashing students -> {args.out}")
+    return 0
+
+
+def cmd_halls(args):
+    from seating import reports
+
+    plan = _load_plan(args)
+    if plan is None:
+        return 4
+
+    view = datastore.plan_viewer() if not args.plan else None
+    rooms = args.room or (view.room_names if view else list(plan["Room"].unique()))
+    jobs = []
+    for room in rooms:
+        room_rows = view.seats.iloc[view.room_rows(room)] if view else plan[plan["Room"] == room]
+        jobs.append((room, reports.hall_rows(room_rows)))
+
+    failed = reports.render_all_halls(jobs, args.out, workers=args.workers, on_progress=_progress("halls"))
+    print(f"{len(jobs) - len(failed)} hall reports -> {args.out}")
+    for room, error in failed.items():
+        print(f"  failed: {room}: {error}", file=sys.stderr)
+    return 5 if failed else 0
+
+
+def cmd_master(args):
+    from seating import reports
+
+    plan = _load_plan(args)
+    if plan is None:
+        return 4
+    reports.master_report(plan, args.out, on_progress=_progress("rows"))
+    print(f"master report ({len(plan)} seats) -> {args.out}")
+    return 0
+
+
+def cmd_slips(args):
+    from seating import slips
+
+    plan = _load_plan(args)
+    if plan is None:
+        return 4
+    students = _read_csv(args.students) if args.students else datastore.load_students()
+
+    report = slips.generate_slips(
+        plan, students, args.out, group_by=args.group_by, workers=args.workers,
+        on_progress=_progress("slips"),
+    )
+    print(f"{report['slips']} seat slips in {len(report['files'])} PDFs -> {args.out}")
+    for name, error in report["failed"].items():
+        print(f"  failed: {name}: {error}", file=sys.stderr)
+    return 5 if report["failed"] else 0
+
+
+def cmd_summary(args):
+    plan = _load_plan(args)
+    if plan is None:
+        return 4
+
+    rooms = plan.groupby("Room", sort=False, observed=True).size()
+    branches = plan.groupby("Branch", observed=True).size()
+
+    if args.format == "json":
+        print(json.dumps({
+            "students": int(len(plan)),
+            "rooms": {str(k): int(v) for k, v in rooms.items()},
+            "branches": {str(k): int(v) for k, v in branches.items()},
+        }, indent=1))
+        return 0
+
+    print(f"Students: {len(plan)}   Rooms: {len(rooms)}")
+    print("\nRoom wise")
+    for room, count in rooms.items():
+        print(f"  {room:<30} {count:>6}")
+    print("\nDepartment wise")
+    for branch, count in branches.items():
+        print(f"  {branch:<30} {count:>6}")
+    return 0
+
+
+def _progress(unit):
+    # one updating line on a terminal, silent under cron
+    if not sys.stderr.isatty():
+        return None
+
+    def show(done, total):
+        print(f"\r  {done} / {total} {unit}", end="" if done < total else "\n", file=sys.stderr)
+    return show
+
+
+# -----------------------------
+# ARGUMENTS
+# -----------------------------
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m seating.cli",
+        description="Exam seat allotment without the web UI (uses ./data like the app).",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("allocate", help="generate the seating plan")
+    p.add_argument("--students", help="roster CSV (default: data/students.csv + journal)")
+    p.add_argument("--rooms", help="rooms CSV (default: data/rooms.csv + journal)")
+    p.add_argument("--per-bench", type=int, choices=PER_BENCH, default=1,
+                   help="students per bench in rooms without their own Seats per Bench")
+    p.add_argument("--strategy", choices=STRATEGIES, default="interleave")
+    p.add_argument("--time-budget", type=float, default=2.0, help="seconds, graph strategy only")
+    p.add_argument("--dedupe", action="store_true", help="seat each USN once (first record)")
+    p.add_argument("--output", help="write the plan here instead of saving it as data/plan.csv")
+    p.add_argument("--format", choices=OUTPUT_FORMATS, default="csv", help="format for --output")
+    p.set_defaults(func=cmd_allocate)
+
+    p = sub.add_parser("update", help="apply late roster / room changes to the saved plan")
+    p.add_argument("--dedupe", action="store_true", help="seat each USN once (first record)")
+    p.add_argument("--changes", help="write the changed seats to this CSV")
+    p.add_argument("--halls", help="re-render only the changed halls into this ZIP")
+    p.set_defaults(func=cmd_update)
+
+    p = sub.add_parser("timetable", help="seat every exam slot of a timetable, one plan per slot")
+    p.add_argument("--file", help="timetable CSV with Slot, Subjects (default: the saved timetable)")
+    p.add_argument("--per-bench", type=int, choices=PER_BENCH, default=1,
+                   help="students per bench in rooms without their own Seats per Bench")
+    p.add_argument("--strategy", choices=STRATEGIES, default="interleave")
+    p.add_argument("--time-budget", type=float, default=2.0, help="seconds per slot, graph strategy only")
+    p.add_argument("--dedupe", action="store_true", help="seat each USN once per slot (first record)")
+    p.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    p.set_defaults(func=cmd_timetable)
+
+    p = sub.add_parser("clashes", help="students with two subjects in the same timetable slot")
+    p.add_argument("--file", help="timetable CSV with Slot, Subjects (default: the saved timetable)")
+    p.add_argument("--out", help="write the clashing students to this CSV")
+    p.set_defaults(func=cmd_clashes)
+
+    for name, func, help_text in (
+        ("halls", cmd_halls, "hall report PDFs in one ZIP"),
+        ("master", cmd_master, "master seating report PDF"),
+        ("slips", cmd_slips, "per-student seat slip PDFs"),
+        ("summary", cmd_summary, "room / department counts"),
+    ):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--plan", help="plan CSV (default: the saved plan)")
+        p.set_defaults(func=func)
+        if name == "halls":
+            p.add_argument("--out", default="Hall_Reports.zip")
+            p.add_argument("--room", action="append", help="only this room (repeatable)")
+            p.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+        elif name == "master":
+            p.add_argument("--out", default="Master_Seating_Report.pdf")
+        elif name == "slips":
+            p.add_argument("--out", default="seat_slips")
+            p.add_argument("--group-by", choices=["Branch", "Semester"], default="Branch")
+            p.add_argument("--students", help="roster CSV for Sem / Subjects (default: saved roster)")
+            p.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+        elif name == "summary":
+            p.add_argument("--format", choices=["text", "json"], default="text")
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
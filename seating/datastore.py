@@ -0,0 +1,662 @@
+import hashlib
+import os
+import threading
+
+import pandas as pd
+
+from seating import (
+    delta, frames, journal, layout, plan_cache, plan_view, sqlite_store, stats, timetable, usn_index,
+)
+
+# -----------------------------
+# FILE PATHS
+# -----------------------------
+DATA_FOLDER = "data"
+STUDENT_FILE = os.path.join(DATA_FOLDER, "students.csv")
+ROOM_FILE = os.path.join(DATA_FOLDER, "rooms.csv")
+PLAN_FILE = os.path.join(DATA_FOLDER, "plan.csv")
+TIMETABLE_FILE = os.path.join(DATA_FOLDER, "timetable.csv")
+SLOT_FOLDER = os.path.join(DATA_FOLDER, "slots")
+
+STUDENT_COLUMNS = ["USN", "Name", "Sem", "Branch", "Type", "Subjects"]
+ROOM_COLUMNS = ["Room Name", "Capacity", "Rows", "Columns", "Blocked", "Aisles", "Seats per Bench"]
+
+# -----------------------------
+# STORAGE BACKEND
+# -----------------------------
+# "csv" (default): data/*.csv files
+# "sqlite": data/seating.db, run `python -m seating.sqlite_store` once to
+# migrate the existing CSVs
+BACKEND = os.environ.get("SEATING_BACKEND", "csv").lower()
+
+_TABLE_FOR_FILE = {
+    STUDENT_FILE: "students",
+    ROOM_FILE: "rooms",
+    PLAN_FILE: "seats",
+}
+
+# Files that take single-row changes through the journal, and their key
+_KEY_FOR_FILE = {
+    STUDENT_FILE: "USN",
+    ROOM_FILE: "Room Name",
+}
+
+# -----------------------------
+# PROCESS-WIDE CACHE
+# -----------------------------
+# key -> (version, DataFrame). Shared by every session/thread of the
+# Streamlit server; an entry is re-read only when its version changes
+# (file mtime/size for CSV, write counter for SQLite).
+_cache = {}
+_lock = threading.Lock()
+
+# Held while a base CSV and its journal files are read or swapped together,
+# so a reader never sees a compacted base next to the journal it absorbed.
+_files_lock = threading.RLock()
+_compacting = set()
+# path -> number of full rewrites, bumped under _files_lock. Compaction
+# drops its result if the base was replaced while it was working.
+_generations = {}
+
+
+def use_sqlite():
+    return BACKEND == "sqlite"
+
+
+def _in_sqlite(path):
+    # files with a table in the database; anything else (timetable, slot
+    # plans) stays a CSV file on either backend
+    return use_sqlite() and path in _TABLE_FOR_FILE
+
+
+def file_version(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _read(path, columns):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return pd.DataFrame(columns=columns or [])
+
+    df = pd.read_csv(path)
+    df.columns = df.columns.str.strip()
+    if layout.is_wide(df):
+        # plan.csv saved before plans were stored one row per seat
+        df = layout.from_wide(df)
+    return df
+
+
+def _hand_out(df):
+    # Shallow copy: callers may add/rename columns or filter freely without
+    # touching the cached frame, and no data is duplicated. Treat as read-only.
+    return df.copy(deep=False)
+
+
+def _cached(key, version, load):
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None and hit[0] == version:
+            return _hand_out(hit[1])
+
+    df = frames.compact(load())
+
+    with _lock:
+        _cache[key] = (version, df)
+    return _hand_out(df)
+
+
+def read_table(path, columns=None):
+    if _in_sqlite(path):
+        table = _TABLE_FOR_FILE[path]
+        with sqlite_store.connection() as conn:
+            version = sqlite_store.table_version(conn, table)
+            return _cached(table, version, lambda: sqlite_store.read_table(conn, table))
+
+    if path in _KEY_FOR_FILE:
+        return _read_journaled(path, columns)
+
+    return _cached(path, file_version(path), lambda: _read(path, columns))
+
+
+def _journal_versions(path):
+    return (
+        file_version(path),
+        file_version(journal.compacting_path(path)),
+        file_version(journal.journal_path(path)),
+    )
+
+
+def _read_journaled(path, columns):
+    # Base CSV + replayed journal. When only the journal has grown, just the
+    # new lines are applied to the cached frame.
+    key_col = _KEY_FOR_FILE[path]
+
+    with _files_lock:
+        version = _journal_versions(path)
+        with _lock:
+            hit = _cache.get(path)
+        if hit is not None and hit[0] == version:
+            return _hand_out(hit[1])
+
+        if hit is not None and hit[0][:2] == version[:2]:
+            df, offset = hit[1], hit[2]
+        else:
+            df = _read(path, columns)
+            entries, _ = journal.read_entries(journal.compacting_path(path))
+            df = journal.apply(df, entries, key_col)
+            offset = 0
+
+        entries, offset = journal.read_entries(journal.journal_path(path), offset)
+        df = frames.compact(journal.apply(df, entries, key_col))
+
+    with _lock:
+        _cache[path] = (version, df, offset)
+    return _hand_out(df)
+
+
+def write_table(path, df):
+    if _in_sqlite(path):
+        with sqlite_store.connection() as conn:
+            sqlite_store.replace_table(conn, _TABLE_FOR_FILE[path], df)
+        # next read reloads exactly what the table kept
+        invalidate(path)
+        refresh_stats(path)
+        return
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    df.to_csv(tmp, index=False)
+
+    with _files_lock:
+        os.replace(tmp, path)
+        _generations[path] = _generations.get(path, 0) + 1
+        if path in _KEY_FOR_FILE:
+            # a full rewrite supersedes any pending single-row changes
+            journal.clear(path)
+
+    frozen = frames.compact(df.reset_index(drop=True).copy())
+    with _lock:
+        if path in _KEY_FOR_FILE:
+            _cache[path] = (_journal_versions(path), frozen, 0)
+        else:
+            _cache[path] = (file_version(path), frozen)
+
+    if path == STUDENT_FILE:
+        _store_usn_index(usn_index.UsnIndex.from_usns(df["USN"]))
+    refresh_stats(path)
+
+
+def write_table_chunks(path, chunks):
+    # Replace a table from an iterator of DataFrames without holding more
+    # than one chunk in memory
+    if _in_sqlite(path):
+        with sqlite_store.connection() as conn:
+            sqlite_store.replace_table_chunks(conn, _TABLE_FOR_FILE[path], chunks)
+        invalidate(path)
+        refresh_stats(path)
+        return
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    # the USN index is rebuilt as the rows stream past
+    index = usn_index.UsnIndex() if path == STUDENT_FILE else None
+
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        first = True
+        for df in chunks:
+            df.to_csv(f, header=first, index=False)
+            first = False
+            if index is not None:
+                for usn in df["USN"].tolist():
+                    index.add(usn)
+
+    with _files_lock:
+        os.replace(tmp, path)
+        _generations[path] = _generations.get(path, 0) + 1
+        if path in _KEY_FOR_FILE:
+            journal.clear(path)
+    invalidate(path)
+
+    if index is not None:
+        _store_usn_index(index)
+    refresh_stats(path)
+
+
+def invalidate(path=None):
+    with _lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(path, None)
+            _cache.pop(_TABLE_FOR_FILE.get(path), None)
+            if path == STUDENT_FILE:
+                _cache.pop("usn_index", None)
+
+
+# -----------------------------
+# STUDENTS / ROOMS / PLAN
+# -----------------------------
+def load_students():
+    return read_table(STUDENT_FILE, STUDENT_COLUMNS)
+
+
+def load_rooms():
+    return read_table(ROOM_FILE, ROOM_COLUMNS)
+
+
+def load_plan():
+    return read_table(PLAN_FILE)
+
+
+def save_students(df):
+    write_table(STUDENT_FILE, df)
+
+
+def save_rooms(df):
+    write_table(ROOM_FILE, df)
+
+
+def save_plan(df):
+    write_table(PLAN_FILE, df)
+
+
+# -----------------------------
+# USN INDEX (duplicate detection)
+# -----------------------------
+def _store_usn_index(index):
+    if use_sqlite():
+        return
+    version = _journal_versions(STUDENT_FILE)
+    usn_index.save(index, version[0])
+    with _lock:
+        _cache["usn_index"] = (version, index, 0)
+
+
+def student_usn_index():
+    # Index of every USN on the roster, kept current incrementally: the
+    # snapshot of the base CSV is loaded once, journal lines are applied as
+    # they arrive.
+    if use_sqlite():
+        # USN is the primary key, duplicates cannot be stored
+        with sqlite_store.connection() as conn:
+            version = sqlite_store.table_version(conn, "students")
+        with _lock:
+            hit = _cache.get("usn_index")
+        if hit is not None and hit[0] == version:
+            return hit[1]
+        index = usn_index.UsnIndex.from_usns(load_students()["USN"])
+        with _lock:
+            _cache["usn_index"] = (version, index, 0)
+        return index
+
+    with _files_lock:
+        version = _journal_versions(STUDENT_FILE)
+        with _lock:
+            hit = _cache.get("usn_index")
+        if hit is not None and hit[0] == version:
+            return hit[1]
+
+        if hit is not None and hit[0][:2] == version[:2]:
+            index, offset = hit[1], hit[2]
+        else:
+            index = usn_index.load(version[0])
+            if index is None:
+                index = usn_index.UsnIndex.from_usns(_read(STUDENT_FILE, STUDENT_COLUMNS)["USN"])
+                usn_index.save(index, version[0])
+            entries, _ = journal.read_entries(journal.compacting_path(STUDENT_FILE))
+            index.apply(entries)
+            offset = 0
+
+        entries, offset = journal.read_entries(journal.journal_path(STUDENT_FILE), offset)
+        index.apply(entries)
+
+    with _lock:
+        _cache["usn_index"] = (version, index, offset)
+    return index
+
+
+# -----------------------------
+# SINGLE-ROW CHANGES (O(1) on disk)
+# -----------------------------
+def record_change(path, op, row=None, key=None):
+    # op: "add" / "edit" / "delete". CSV backend appends one journal line,
+    # SQLite touches one row. The stats sidecar is moved by the row itself.
+    key_col = _KEY_FOR_FILE[path]
+    if key is not None:
+        key = journal.normalise_key(key_col, key)
+    with _stats_lock:
+        before = data_version(path)
+        old = _rows_for_key(path, key) if op in ("edit", "delete") else None
+
+        if use_sqlite():
+            with sqlite_store.connection() as conn:
+                changed = sqlite_store.apply_change(conn, _TABLE_FOR_FILE[path], key_col, op, row, key)
+        else:
+            journal.append(path, op, row=row, key=key)
+            changed = 1
+
+        if changed:
+            _update_stats(path, before, op, row, old)
+
+    if not use_sqlite() and journal.size(path) > journal.COMPACT_AFTER_BYTES:
+        compact_in_background(path)
+
+
+def _rows_for_key(path, key):
+    # every row an edit / delete is about to change (a duplicated USN is
+    # changed in all its rows)
+    key_col = _KEY_FOR_FILE[path]
+    if use_sqlite():
+        with sqlite_store.connection() as conn:
+            found = sqlite_store.get_row(conn, _TABLE_FOR_FILE[path], key_col, key)
+        return [] if found is None else [found]
+    df = read_table(path)
+    hit = df[journal.key_values(df, key_col) == journal.normalise_key(key_col, key)]
+    return hit.to_dict("records")
+
+
+def add_student(row):
+    record_change(STUDENT_FILE, "add", row=row)
+
+
+def add_room(row):
+    record_change(ROOM_FILE, "add", row=row)
+
+
+def compact(path):
+    # Fold the journal into the base CSV
+    key_col = _KEY_FOR_FILE[path]
+    cpath = journal.compacting_path(path)
+
+    with _files_lock:
+        if not os.path.exists(cpath):
+            if not os.path.exists(journal.journal_path(path)):
+                return
+            os.replace(journal.journal_path(path), cpath)
+        generation = _generations.get(path, 0)
+        base = _read(path, None)
+        entries, _ = journal.read_entries(cpath)
+
+    df = journal.apply(base, entries, key_col)
+    tmp = f"{path}.{os.getpid()}.compact.tmp"
+    df.to_csv(tmp, index=False)
+
+    with _files_lock:
+        if _generations.get(path, 0) != generation:
+            # a full write replaced the base (and cleared the journal files)
+            # while we worked: it wins, the compacted copy is stale
+            os.remove(tmp)
+            return
+        os.replace(tmp, path)
+        try:
+            os.remove(cpath)
+        except FileNotFoundError:
+            pass
+
+    if path == STUDENT_FILE:
+        usn_index.save(usn_index.UsnIndex.from_usns(df["USN"]), file_version(path))
+    # same rows, new file versions
+    refresh_stats(path)
+
+
+def compact_in_background(path):
+    with _lock:
+        if path in _compacting:
+            return
+        _compacting.add(path)
+
+    def run():
+        try:
+            compact(path)
+        finally:
+            with _lock:
+                _compacting.discard(path)
+
+    threading.Thread(target=run, name=f"compact-{os.path.basename(path)}", daemon=True).start()
+
+
+# -----------------------------
+# DASHBOARD STATS (sidecar, see seating/stats.py)
+# -----------------------------
+_STATS_PARTS = {
+    STUDENT_FILE: ("students", stats.student_stats),
+    ROOM_FILE: ("rooms", stats.room_stats),
+    PLAN_FILE: ("plan", stats.plan_stats),
+}
+_stats_lock = threading.RLock()
+
+
+def _load_stats():
+    version = file_version(stats.STATS_FILE)
+    with _lock:
+        hit = _cache.get("stats")
+    if hit is not None and hit[0] == version:
+        return hit[1]
+
+    data = stats.load()
+    with _lock:
+        _cache["stats"] = (version, data)
+    return data
+
+
+def refresh_stats(path):
+    # Recompute the sidecar part for `path`, after it was written
+    if path not in _STATS_PARTS:
+        return
+    part, compute = _STATS_PARTS[path]
+    version = data_version(path)
+    values = compute(read_table(path))
+
+    with _stats_lock:
+        current = dict(_load_stats())
+        stats.set_part(current, part, version, values)
+        stats.save(current)
+        with _lock:
+            _cache["stats"] = (file_version(stats.STATS_FILE), current)
+
+
+def _update_stats(path, before, op, row, old):
+    # One journaled change: +-1 on the counts per row, if the sidecar
+    # part was current before it. Anything else gets a full recompute.
+    part, _ = _STATS_PARTS[path]
+    with _stats_lock:
+        current = dict(_load_stats())
+        values = None
+        if stats.is_current(current, part, before):
+            values = stats.apply_change(current[part], part, op, row, old)
+        if values is None:
+            refresh_stats(path)
+            return
+        stats.set_part(current, part, data_version(path), values)
+        stats.save(current)
+        with _lock:
+            _cache["stats"] = (file_version(stats.STATS_FILE), current)
+
+
+def dashboard_stats():
+    # {"students": {...}, "rooms": {...}, "plan": {...}} from the sidecar:
+    # one small read plus a version check per file. A part is recomputed
+    # only when its file changed some other way (copied in, edited by hand).
+    current = _load_stats()
+    for path, (part, _) in _STATS_PARTS.items():
+        if not stats.is_current(current, part, data_version(path)):
+            refresh_stats(path)
+            current = _load_stats()
+    return current
+
+
+def plan_exists():
+    if use_sqlite():
+        with sqlite_store.connection() as conn:
+            return conn.execute("SELECT 1 FROM seats LIMIT 1").fetchone() is not None
+
+    version = file_version(PLAN_FILE)
+    return version is not None and version[1] > 0
+
+
+def _frame_digest(df):
+    hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return hashlib.sha256(hashes.tobytes()).hexdigest()
+
+
+def data_version(path):
+    # Changes whenever the data set behind `path` changes, on either backend
+    if _in_sqlite(path):
+        with sqlite_store.connection() as conn:
+            return sqlite_store.table_version(conn, _TABLE_FOR_FILE[path])
+    if path in _KEY_FOR_FILE:
+        return _journal_versions(path)
+    return file_version(path)
+
+
+def fingerprint(path):
+    # Content hash of a data set, memoised on its version (see plan_cache)
+    version = data_version(path)
+
+    key = ("digest", path)
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None and hit[0] == version:
+            return hit[1]
+
+    if _in_sqlite(path) or path in _KEY_FOR_FILE:
+        # journaled CSVs: hash the replayed content, not the files
+        digest = _frame_digest(read_table(path))
+    else:
+        digest = plan_cache.file_digest(path)
+
+    with _lock:
+        _cache[key] = (version, digest)
+    return digest
+
+
+# -----------------------------
+# PLAN SEARCH + PAGED VIEW
+# -----------------------------
+def plan_viewer():
+    # Paged-table helper for the current plan (room offsets, sort orders,
+    # search index), built once per plan version and shared by all sessions
+    version = data_version(PLAN_FILE)
+    with _lock:
+        hit = _cache.get("view")
+        if hit is not None and hit[0] == version:
+            return hit[1]
+
+    view = plan_view.PlanView(load_plan())
+
+    with _lock:
+        _cache["view"] = (version, view)
+    return view
+
+
+def plan_diff():
+    # Roster / room changes since the saved plan was made (seating/delta.py),
+    # worked out once per combination of data versions
+    version = (data_version(PLAN_FILE), data_version(STUDENT_FILE), data_version(ROOM_FILE))
+    with _lock:
+        hit = _cache.get("plan_diff")
+        if hit is not None and hit[0] == version:
+            return hit[1]
+
+    diff = delta.diff_plan(load_plan(), load_students(), load_rooms())
+
+    with _lock:
+        _cache["plan_diff"] = (version, diff)
+    return diff
+
+
+# -----------------------------
+# PLAN LOOKUPS
+# -----------------------------
+# SQLite answers these from indexes; the CSV backend filters the cached plan.
+def plan_rooms():
+    if use_sqlite():
+        with sqlite_store.connection() as conn:
+            return sqlite_store.plan_rooms(conn)
+
+    plan = load_plan()
+    return plan["Room"].unique().tolist() if "Room" in plan else []
+
+
+def plan_for_room(room):
+    if use_sqlite():
+        with sqlite_store.connection() as conn:
+            return sqlite_store.plan_for_room(conn, room)
+
+    plan = load_plan()
+    return plan[plan["Room"] == room]
+
+
+def plan_for_usn(usn_prefix):
+    # Seats whose USN starts with `usn_prefix` (any case)
+    if use_sqlite():
+        with sqlite_store.connection() as conn:
+            return sqlite_store.plan_for_usn(conn, usn_prefix)
+
+    # CSV: narrow down with the plan search index instead of a scan
+    view = plan_viewer()
+    if "USN" not in view.seats:
+        return view.seats
+    prefix = usn_prefix.strip().upper()
+    hits = view.seats.iloc[view.search(prefix)]
+    return hits[hits["USN"].astype(str).str.upper().str.startswith(prefix)]
+
+
+# -----------------------------
+# EXAM TIMETABLE (one plan per slot, see seating/timetable.py)
+# -----------------------------
+def load_timetable():
+    return read_table(TIMETABLE_FILE, timetable.TIMETABLE_COLUMNS)
+
+
+def save_timetable(df):
+    write_table(TIMETABLE_FILE, df)
+
+
+def subject_index():
+    # subject -> roster positions, rebuilt when the roster changes
+    version = data_version(STUDENT_FILE)
+    with _lock:
+        hit = _cache.get("subject_index")
+        if hit is not None and hit[0] == version:
+            return hit[1]
+
+    index = timetable.SubjectIndex(load_students())
+
+    with _lock:
+        _cache["subject_index"] = (version, index)
+    return index
+
+
+def slot_plan_path(slot):
+    return os.path.join(SLOT_FOLDER, timetable.slot_filename(slot))
+
+
+def save_slot_plan(slot, df):
+    write_table(slot_plan_path(slot), df)
+
+
+def load_slot_plan(slot):
+    return read_table(slot_plan_path(slot))
+
+
+def slot_plan_exists(slot):
+    version = file_version(slot_plan_path(slot))
+    return version is not None and version[1] > 0
+
+
+def clear_slot_plans(keep=()):
+    # drop plans of slots no longer on the timetable
+    keep = {timetable.slot_filename(slot) for slot in keep}
+    if not os.path.isdir(SLOT_FOLDER):
+        return
+    for name in os.listdir(SLOT_FOLDER):
+        if name.endswith(".csv") and name not in keep:
+            path = os.path.join(SLOT_FOLDER, name)
+            os.remove(path)
+            invalidate(path)
@@ -0,0 +1,283 @@
+import numpy as np
+import pandas as pd
+
+from seating import geometry
+from seating.allocator import CapacityError, branch_codes, interleave_order
+from seating.layout import SEAT_COLUMNS
+
+# -----------------------------
+# DELTA RE-ALLOCATION
+# -----------------------------
+# Late changes without reshuffling the whole plan: students who joined the
+# roster go into free seats, students of withdrawn (or shrunk) rooms are
+# re-homed, withdrawn students just leave their seat empty. Everyone else
+# keeps their seat, so only the halls listed in the change report need new
+# PDFs.
+#
+# Seats are chosen greedily: the first free seat (rooms in rooms.csv
+# order) with no same-branch neighbour - the room's cached neighbour
+# array from geometry.py, as in allocator.py - else the best seat among
+# the first SCAN_LIMIT free seats looked at. Only rooms that are scanned
+# get their seat map built, so the work follows the size of the change.
+SCAN_LIMIT = 5000
+
+CHANGE_COLUMNS = ["Change", "Room", "Bench", "Seat", "USN", "Name", "Branch",
+                  "From Room", "From Bench", "From Seat"]
+
+
+def _keys(usns):
+    # normalised USNs as a plain object array (hash lookups stay in C)
+    keys = pd.Series(usns, dtype=object).astype(str).str.strip().str.upper()
+    return keys.to_numpy(dtype=object)
+
+
+def plan_mode(plan, default=1):
+    # students per bench the plan was made with
+    if len(plan) == 0 or "Seat" not in plan:
+        return default
+    return max(int(pd.to_numeric(plan["Seat"], errors="coerce").max()), 1)
+
+
+def room_modes(plan, rooms, seating_mode=None):
+    # Students per bench of every room: its own "Seats per Bench", else
+    # `seating_mode`, else what the plan used in rooms without their own
+    own = geometry.seats_per_bench(rooms, 0)
+    if not seating_mode:
+        shared = rooms["Room Name"].astype(str)[own == 0]
+        seating_mode = plan_mode(plan[plan["Room"].astype(str).isin(shared)])
+    return np.where(own > 0, own, seating_mode)
+
+
+# -----------------------------
+# WHAT CHANGED
+# -----------------------------
+def diff_plan(plan, students, rooms):
+    # Compares the saved plan with the current roster and rooms.
+    # Returns a dict:
+    #   new        roster rows with no seat yet (first record per USN)
+    #   withdrawn  plan positions whose student left the roster
+    #   displaced  plan positions in removed rooms / benches or seats that no
+    #              longer exist
+    #   removed_rooms
+    plan_usn = pd.Index(_keys(plan["USN"]), dtype=object)
+    roster_usn = pd.Index(_keys(students["USN"]), dtype=object)
+
+    first = ~roster_usn.duplicated()
+    new = students[first & ~roster_usn.isin(plan_usn)]
+
+    withdrawn = np.flatnonzero(~plan_usn.isin(roster_usn))
+
+    names = rooms["Room Name"].astype(str)
+    capacity = dict(zip(names, geometry.capacities(rooms).tolist()))
+    modes = dict(zip(names, room_modes(plan, rooms).tolist()))
+
+    plan_room = plan["Room"].astype(str)
+    room_cap = plan_room.map(capacity)
+    bench = pd.to_numeric(plan["Bench"], errors="coerce")
+    seat = pd.to_numeric(plan["Seat"], errors="coerce")
+    gone = (room_cap.isna() | (bench > room_cap) | (seat > plan_room.map(modes))).to_numpy()
+
+    displaced = np.setdiff1d(np.flatnonzero(gone), withdrawn)
+    removed_rooms = sorted(set(plan_room.unique()) - set(capacity))
+
+    return {
+        "new": new,
+        "withdrawn": withdrawn,
+        "displaced": displaced,
+        "removed_rooms": removed_rooms,
+    }
+
+
+def diff_size(diff):
+    return len(diff["new"]) + len(diff["withdrawn"]) + len(diff["displaced"])
+
+
+# -----------------------------
+# FREE SEATS
+# -----------------------------
+class _SeatMap:
+    # Free seats and occupants of the rooms, built room by room on demand.
+    # Occupants are kept as branch codes per room seat number, so the
+    # neighbour check for all free seats of a room is one gather through
+    # the room's neighbour array.
+
+    def __init__(self, plan, keep, rooms, per_bench):
+        # per_bench: students per bench of every room (room_modes)
+        self.per_bench = [int(pb) for pb in per_bench]
+        self.names = rooms["Room Name"].astype(str).tolist()
+        self.shapes = geometry.room_shapes(rooms)
+        self.capacity = [geometry.capacity(shape) for shape in self.shapes]
+
+        kept = plan[keep]
+        self.kept_room = kept["Room"].astype(str).to_numpy(dtype=object)
+        self.kept_bench = kept["Bench"].to_numpy(dtype=np.int64)
+        self.kept_seat = kept["Seat"].to_numpy(dtype=np.int64)
+        self.kept_branch = kept["Branch"].astype(str).to_numpy(dtype=object)
+
+        # free seat count per room without touching individual rows
+        used = pd.Series(self.kept_room).value_counts()
+        self.free_count = [
+            max(cap * pb - int(used.get(name, 0)), 0)
+            for name, cap, pb in zip(self.names, self.capacity, self.per_bench)
+        ]
+        self.codes = {}
+        self._rows = None
+        self._rooms = {}
+
+    def total_free(self):
+        return sum(self.free_count)
+
+    def _code(self, branch):
+        return self.codes.setdefault(branch, len(self.codes))
+
+    def _room(self, i):
+        room = self._rooms.get(i)
+        if room is None:
+            if self._rows is None:
+                # row positions per room, grouped once
+                self._rows = pd.Series(np.arange(len(self.kept_room))).groupby(
+                    self.kept_room, sort=False
+                ).indices
+            per_bench = self.per_bench[i]
+            n_seats = self.capacity[i] * per_bench
+            # branch code per seat, -1 = free; the extra last slot stays -1
+            # and is what a missing neighbour (-1) reads
+            occupant = np.full(n_seats + 1, -1, dtype=np.int64)
+            rows = self._rows.get(self.names[i], [])
+            seat = (self.kept_bench[rows] - 1) * per_bench + self.kept_seat[rows] - 1
+            occupant[seat] = [self._code(b) for b in self.kept_branch[rows]]
+            room = self._rooms[i] = (occupant, geometry.neighbours(self.shapes[i], per_bench))
+        return room
+
+    def place(self, branch):
+        # Best free seat for a student of `branch` -> (room, bench, seat)
+        code = self._code(branch)
+        best, looked = None, 0
+        for i, count in enumerate(self.free_count):
+            if count == 0:
+                continue
+            occupant, nbrs = self._room(i)
+            free = np.flatnonzero(occupant[:-1] < 0)[:SCAN_LIMIT - looked]
+            clashes = (occupant[nbrs[free]] == code).sum(axis=1)
+            j = int(np.argmin(clashes))
+            if best is None or clashes[j] < best[0]:
+                best = (int(clashes[j]), i, int(free[j]))
+            looked += len(free)
+            if best[0] == 0 or looked >= SCAN_LIMIT:
+                break
+
+        _, i, seat = best
+        occupant, _ = self._rooms[i]
+        occupant[seat] = code
+        self.free_count[i] -= 1
+        bench, pos = divmod(seat, self.per_bench[i])
+        return self.names[i], bench + 1, pos + 1
+
+
+# -----------------------------
+# APPLY
+# -----------------------------
+def reallocate(plan, students, rooms, seating_mode=None, diff=None):
+    # Returns (new plan, change report). The change report has one row per
+    # affected seat: "seated" (new student), "moved" (re-homed, with the
+    # seat it came from) or "vacated" (student withdrawn).
+    plan = plan.reset_index(drop=True)
+    rooms = rooms.reset_index(drop=True)
+    per_bench = room_modes(plan, rooms, seating_mode)
+    diff = diff if diff is not None else diff_plan(plan, students, rooms)
+
+    leaving = np.zeros(len(plan), dtype=bool)
+    leaving[diff["withdrawn"]] = True
+    leaving[diff["displaced"]] = True
+
+    seats = _SeatMap(plan, ~leaving, rooms, per_bench)
+
+    # people to seat: re-homed students first (they had a seat), then new ones
+    moved = plan.iloc[diff["displaced"]]
+    incoming = pd.concat([
+        pd.DataFrame({
+            "USN": moved["USN"].astype(str).to_numpy(), "Name": moved["Name"].astype(str).to_numpy(),
+            "Branch": moved["Branch"].astype(str).to_numpy(), "From": np.arange(len(moved)),
+        }),
+        pd.DataFrame({
+            "USN": diff["new"]["USN"].astype(str).to_numpy(), "Name": diff["new"]["Name"].astype(str).to_numpy(),
+            "Branch": diff["new"]["Branch"].astype(object).fillna("Other").astype(str).to_numpy(),
+            "From": -1,
+        }),
+    ], ignore_index=True)
+
+    if len(incoming) > seats.total_free():
+        benches = int(sum(seats.capacity))
+        raise CapacityError(int((~leaving).sum()) + len(incoming), benches,
+                            int(np.dot(seats.capacity, seats.per_bench)))
+
+    # alternate branches so consecutive placements mix naturally
+    codes, _ = branch_codes(incoming["Branch"])
+    incoming = incoming.iloc[interleave_order(codes)]
+
+    placed = [seats.place(branch) for branch in incoming["Branch"].tolist()]
+    new_rows = pd.DataFrame({
+        "Room": [p[0] for p in placed],
+        "Bench": [p[1] for p in placed],
+        "Seat": [p[2] for p in placed],
+        "USN": incoming["USN"].to_numpy(),
+        "Name": incoming["Name"].to_numpy(),
+        "Branch": incoming["Branch"].to_numpy(),
+    }, columns=SEAT_COLUMNS)
+
+    kept = plan[~leaving][SEAT_COLUMNS]
+    for col in ("Room", "USN", "Name", "Branch"):
+        kept = kept.assign(**{col: kept[col].astype(str)})
+
+    # back into seat order: rooms as in rooms.csv, then bench, seat
+    merged = pd.concat([kept, new_rows], ignore_index=True)
+    room_rank = merged["Room"].map({name: i for i, name in enumerate(seats.names)})
+    order = np.lexsort((merged["Seat"].to_numpy(), merged["Bench"].to_numpy(), room_rank.to_numpy()))
+    new_plan = merged.iloc[order].reset_index(drop=True)
+
+    changes = _change_report(plan, diff, incoming, new_rows)
+    return new_plan, changes
+
+
+def _change_report(plan, diff, incoming, new_rows):
+    frm = incoming["From"].to_numpy()
+    moved = frm >= 0
+    src = plan.iloc[diff["displaced"][frm[moved]]]
+
+    def origin(values, blank, dtype):
+        # value of the seat a moved student came from, blank for new students
+        out = pd.Series(blank, index=new_rows.index, dtype=dtype)
+        out[moved] = values
+        return out
+
+    placed = new_rows.assign(
+        Change=np.where(moved, "moved", "seated"),
+        **{
+            "From Room": origin(src["Room"].astype(str).to_numpy(), "", object),
+            "From Bench": origin(src["Bench"].to_numpy(), pd.NA, "Int64"),
+            "From Seat": origin(src["Seat"].to_numpy(), pd.NA, "Int64"),
+        }
+    )
+
+    gone = plan.iloc[diff["withdrawn"]]
+    vacated = pd.DataFrame({
+        "Change": "vacated",
+        "Room": gone["Room"].astype(str).to_numpy(),
+        "Bench": gone["Bench"].to_numpy(),
+        "Seat": gone["Seat"].to_numpy(),
+        "USN": gone["USN"].astype(str).to_numpy(),
+        "Name": gone["Name"].astype(str).to_numpy(),
+        "Branch": gone["Branch"].astype(str).to_numpy(),
+        "From Room": "",
+        "From Bench": pd.array([pd.NA] * len(gone), dtype="Int64"),
+        "From Seat": pd.array([pd.NA] * len(gone), dtype="Int64"),
+    })
+
+    return pd.concat([placed, vacated], ignore_index=True)[CHANGE_COLUMNS]
+
+
+def affected_rooms(changes, removed_rooms=()):
+    # Halls whose report changed (seat gained, lost or moved), in first-seen order
+    rooms = pd.concat([changes["Room"], changes["From Room"]]).astype(str)
+    rooms = rooms[(rooms != "") & ~rooms.isin(list(removed_rooms))]
+    return rooms.drop_duplicates().tolist()
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# COMPACT FRAMES
+# -----------------------------
+# One shared copy of the roster / rooms / plan is cached per process (see
+# datastore.py), stored with the smallest dtypes that hold the data:
+#   - repeated labels (Branch, Type, Room, the "-" seat filler) -> category,
+#     i.e. one int8 code per row + one copy of each distinct label
+#   - Sem / Bench / S.No / Capacity -> small integers
+#   - USN / Name / Subjects -> one Arrow string buffer per column instead of
+#     a Python str object per cell (when pyarrow is installed)
+# Pages read these frames directly; nothing is turned back into dicts.
+
+try:
+    import pyarrow  # noqa: F401
+    TEXT_DTYPE = "str" if int(pd.__version__.split(".")[0]) >= 3 else "string[pyarrow]"
+except ImportError:
+    TEXT_DTYPE = None
+
+INT_COLUMNS = {
+    "Sem": "int8",
+    "Bench": "int16",
+    "Seat": "int8",
+    "S.No": "int32",
+    "Capacity": "int32",
+}
+
+
+def _is_label(col):
+    return col in ("Branch", "Type", "Room") or col.endswith(" Branch")
+
+
+def _is_text(col):
+    return col in ("USN", "Name", "Subjects") or col.endswith(" USN") or col.endswith(" Name")
+
+
+def _small_int(series, dtype):
+    if series.dtype == dtype:
+        return series
+    values = pd.to_numeric(series, errors="coerce")
+    # leave the column alone if anything would be lost (blanks, 2.5, ...)
+    limits = np.iinfo(dtype)
+    if values.isna().any() or (values % 1 != 0).any():
+        return series
+    if len(values) and (values.min() < limits.min or values.max() > limits.max):
+        return series
+    return values.astype(dtype)
+
+
+def compact(df):
+    # Idempotent: columns that are already compact are left as they are
+    out = {}
+    for col in df.columns:
+        series = df[col]
+        if col in INT_COLUMNS:
+            series = _small_int(series, INT_COLUMNS[col])
+        elif _is_label(col):
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.astype("category")
+        elif _is_text(col):
+            if TEXT_DTYPE is not None and series.dtype == object:
+                series = series.astype(TEXT_DTYPE)
+        out[col] = series
+    return pd.DataFrame(out, index=df.index)
@@ -0,0 +1,231 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# ROOM GEOMETRY
+# -----------------------------
+# rooms.csv may describe a hall as a grid of benches:
+#
+#   Room Name,Capacity,Rows,Columns,Blocked,Aisles
+#   SEMINAR HALL,34,6,6,"R1C1, R1C6",3
+#
+# Rows x Columns bench positions, front row first, left to right.
+#   Blocked  positions with no usable bench (pillar, broken bench, desk)
+#   Aisles   column numbers with an aisle on their right (3: between 3 and 4)
+# Usable benches are numbered 1..n row by row, skipping blocked positions,
+# so plans keep reading Room / Bench / Seat. A room without Rows / Columns
+# is one column of Capacity benches - the layout every plan had so far.
+#
+# Neighbours of a seat: the seats beside it on its bench, the end seat of
+# the bench beside it in the same row (not across an aisle or a blocked
+# position), and the same seat on the bench in front / behind. They are
+# worked out once per room shape and students per bench, and kept as an
+# (n_seats, 4) array of seat numbers (-1 = nobody there), so checking a
+# seat is four array reads.
+#
+# "Seats per Bench" sets how many students one bench of the room takes
+# (lab stools 1, drawing tables 3 or 4); blank = the number chosen when
+# generating the plan.
+GEOMETRY_COLUMNS = ["Rows", "Columns", "Blocked", "Aisles", "Seats per Bench"]
+
+MAX_SEATS_PER_BENCH = 6
+
+CELL = re.compile(r"R\s*(\d+)\s*C\s*(\d+)", re.IGNORECASE)
+
+# left, right, front, back
+DIRECTIONS = 4
+
+
+def _count(value):
+    value = pd.to_numeric(value, errors="coerce")
+    if pd.isna(value) or value < 1 or value % 1:
+        return 0
+    return int(value)
+
+
+def parse_cells(text):
+    # "R1C1, r2 c5" -> {(1, 1), (2, 5)}
+    if not isinstance(text, str):
+        return frozenset()
+    return frozenset((int(r), int(c)) for r, c in CELL.findall(text))
+
+
+def parse_aisles(text):
+    # "3, 6" -> {3, 6}
+    if isinstance(text, (int, float, np.integer, np.floating)):
+        return frozenset() if pd.isna(text) else frozenset([int(text)])
+    if not isinstance(text, str):
+        return frozenset()
+    return frozenset(int(c) for c in re.findall(r"\d+", text))
+
+
+def format_cells(cells):
+    return ", ".join(f"R{r}C{c}" for r, c in sorted(cells))
+
+
+# -----------------------------
+# SHAPES
+# -----------------------------
+# A shape is a hashable (rows, columns, blocked, aisles) tuple, so rooms
+# built the same way share one set of cached arrays.
+def shape(rows=None, columns=None, blocked=None, aisles=None, capacity=0):
+    rows, columns = _count(rows), _count(columns)
+    if not rows or not columns:
+        return (_count(capacity), 1, frozenset(), frozenset())
+
+    blocked = frozenset(
+        (r, c) for r, c in parse_cells(blocked) if r <= rows and c <= columns
+    )
+    aisles = frozenset(c for c in parse_aisles(aisles) if 1 <= c < columns)
+    return (rows, columns, blocked, aisles)
+
+
+def room_shapes(rooms):
+    # one shape per row of the rooms table, in table order
+    n = len(rooms)
+
+    def col(name):
+        return rooms[name].tolist() if name in rooms else [None] * n
+
+    return [
+        shape(r, c, b, a, cap)
+        for r, c, b, a, cap in zip(col("Rows"), col("Columns"), col("Blocked"), col("Aisles"), col("Capacity"))
+    ]
+
+
+def capacity(room_shape):
+    # usable benches
+    rows, columns, blocked, _ = room_shape
+    return rows * columns - len(blocked)
+
+
+def capacities(rooms):
+    return np.array([capacity(s) for s in room_shapes(rooms)], dtype=np.int64)
+
+
+def seats_per_bench(rooms, default=1):
+    # students per bench of every room, `default` where the room has none.
+    # Values over MAX_SEATS_PER_BENCH are seated at the maximum; pages and
+    # the CLI warn about them (oversized_benches).
+    if "Seats per Bench" not in rooms:
+        return np.full(len(rooms), default, dtype=np.int64)
+    own = pd.to_numeric(rooms["Seats per Bench"], errors="coerce")
+    own = own.where((own >= 1) & (own % 1 == 0))
+    return own.fillna(default).astype(np.int64).clip(upper=MAX_SEATS_PER_BENCH).to_numpy()
+
+
+def oversized_benches(rooms):
+    # names of rooms whose "Seats per Bench" is over the maximum
+    if "Seats per Bench" not in rooms:
+        return []
+    own = pd.to_numeric(rooms["Seats per Bench"], errors="coerce")
+    return rooms.loc[own > MAX_SEATS_PER_BENCH, "Room Name"].astype(str).tolist()
+
+
+@lru_cache(maxsize=1024)
+def bench_cells(room_shape):
+    # (row, column) of benches 1..n, as an (n, 2) array
+    rows, columns, blocked, _ = room_shape
+    r, c = np.divmod(np.arange(rows * columns, dtype=np.int64), columns)
+    cells = np.stack([r + 1, c + 1], axis=1)
+    if blocked:
+        free = np.array([(a, b) not in blocked for a, b in cells.tolist()], dtype=bool)
+        cells = cells[free]
+    cells.setflags(write=False)
+    return cells
+
+
+@lru_cache(maxsize=1024)
+def neighbours(room_shape, per_bench):
+    # (n_seats, 4) neighbour seat numbers: left, right, front, back.
+    # Seat number = (bench - 1) * per_bench + (seat - 1).
+    rows, columns, _, aisles = room_shape
+    cells = bench_cells(room_shape)
+    n_benches = len(cells)
+
+    # bench number at every grid position, -1 outside / blocked
+    at = np.full((rows + 2, columns + 2), -1, dtype=np.int64)
+    at[cells[:, 0], cells[:, 1]] = np.arange(n_benches)
+
+    # aisle to the right of column c cuts c <-> c + 1
+    cut = np.zeros(columns + 2, dtype=bool)
+    cut[list(aisles)] = True
+
+    r, c = cells[:, 0], cells[:, 1]
+    left_bench = np.where(cut[c - 1], -1, at[r, c - 1])
+    right_bench = np.where(cut[c], -1, at[r, c + 1])
+    front_bench = at[r - 1, c]
+    back_bench = at[r + 1, c]
+
+    bench = np.repeat(np.arange(n_benches), per_bench)
+    pos = np.tile(np.arange(per_bench), n_benches)
+    seat = bench * per_bench + pos
+
+    def seat_on(other, p):
+        return np.where(other >= 0, other * per_bench + p, -1)
+
+    nbrs = np.empty((len(seat), DIRECTIONS), dtype=np.int64)
+    nbrs[:, 0] = np.where(pos > 0, seat - 1, seat_on(left_bench[bench], per_bench - 1))
+    nbrs[:, 1] = np.where(pos < per_bench - 1, seat + 1, seat_on(right_bench[bench], 0))
+    nbrs[:, 2] = seat_on(front_bench[bench], pos)
+    nbrs[:, 3] = seat_on(back_bench[bench], pos)
+    nbrs.setflags(write=False)
+    return nbrs
+
+
+@lru_cache(maxsize=1024)
+def edges(room_shape, per_bench):
+    # each neighbouring seat pair once (u < v), from the neighbour array
+    nbrs = neighbours(room_shape, per_bench)
+    u = np.repeat(np.arange(len(nbrs), dtype=np.int64), DIRECTIONS)
+    v = nbrs.ravel()
+    keep = v > u
+    u, v = u[keep], v[keep]
+    u.setflags(write=False)
+    v.setflags(write=False)
+    return u, v
+
+
+def seat_edges(shapes, per_bench, n_seats):
+    # Neighbour pairs over the first n_seats seats of the rooms in order
+    # (seats numbered through the rooms as the allocator fills them).
+    # `per_bench`: one number for all rooms, or one per room.
+    if np.ndim(per_bench) == 0:
+        per_bench = [per_bench] * len(shapes)
+
+    parts_u, parts_v = [], []
+    offset = 0
+    for room_shape, pb in zip(shapes, per_bench):
+        if offset >= n_seats:
+            break
+        u, v = edges(room_shape, int(pb))
+        keep = v < n_seats - offset
+        parts_u.append(u[keep] + offset)
+        parts_v.append(v[keep] + offset)
+        offset += capacity(room_shape) * int(pb)
+
+    if not parts_u:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(parts_u), np.concatenate(parts_v)
+
+
+# -----------------------------
+# DISPLAY
+# -----------------------------
+def grid_labels(room_shape):
+    # Rows x Columns table of bench numbers for the rooms page:
+    # "✕" for a blocked position, "┃" columns for aisles
+    rows, columns, blocked, aisles = room_shape
+    cells = bench_cells(room_shape)
+    labels = np.full((rows, columns), "✕", dtype=object)
+    labels[cells[:, 0] - 1, cells[:, 1] - 1] = [str(b) for b in range(1, len(cells) + 1)]
+
+    table = {}
+    for c in range(1, columns + 1):
+        table[f"C{c}"] = labels[:, c - 1]
+        if c in aisles:
+            table[" " * c] = ["┃"] * rows
+    return pd.DataFrame(table, index=[f"R{r}" for r in range(1, rows + 1)])
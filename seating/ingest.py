@@ -0,0 +1,186 @@
+import io
+import itertools
+import re
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# ROSTER RULES
+# -----------------------------
+REQUIRED_COLUMNS = ["USN", "Name", "Sem", "Branch", "Type", "Subjects"]
+
+# Branches offered on the manual entry form, plus the short codes already
+# used in existing rosters (CS, EC, ...)
+BRANCHES = ["CSE", "EEE", "ECE", "MEC", "CVL"]
+BRANCH_VOCABULARY = set(BRANCHES) | {"CS", "EE", "EC", "ME", "CV"}
+
+STUDENT_TYPES = ["Regular", "Arrear"]
+SEMESTERS = range(1, 9)
+
+# e.g. 1RV21CS001, 3NA22CS001
+USN_PATTERN = r"[0-9][A-Z]{2}[0-9]{2}[A-Z]{2,3}[0-9]{3}"
+
+
+def is_usn(text):
+    return re.fullmatch(USN_PATTERN, str(text).strip().upper()) is not None
+
+# Read everything as compact strings/categories; Sem is parsed after
+# validation so one bad cell cannot fail the whole chunk.
+READ_DTYPES = {
+    "USN": "string",
+    "Name": "string",
+    "Sem": "string",
+    "Branch": "category",
+    "Type": "category",
+    "Subjects": "string",
+}
+
+CHUNK_ROWS = 50_000
+
+
+# -----------------------------
+# HEADER + SIZE
+# -----------------------------
+def _rewind(source):
+    if hasattr(source, "seek"):
+        source.seek(0)
+
+
+def read_header(source):
+    _rewind(source)
+    header = pd.read_csv(source, nrows=0).columns.str.strip().tolist()
+    _rewind(source)
+    return header
+
+
+def missing_columns(source):
+    header = read_header(source)
+    return [c for c in REQUIRED_COLUMNS if c not in header]
+
+
+def count_rows(source):
+    # Newline count in 1 MB blocks, used to size the progress bar
+    _rewind(source)
+    lines = 0
+    last = b"\n"
+    while True:
+        block = source.read(1024 * 1024)
+        if not block:
+            break
+        if isinstance(block, str):
+            block = block.encode()
+        lines += block.count(b"\n")
+        last = block[-1:]
+    _rewind(source)
+    if last != b"\n":
+        lines += 1
+    return max(lines - 1, 0)
+
+
+# -----------------------------
+# VALIDATION
+# -----------------------------
+def validate_chunk(chunk, seen):
+    # Returns (valid rows, rejected rows with an "Error" column).
+    # `seen` is the set of USNs accepted so far and is updated in place.
+    usn = chunk["USN"].fillna("").str.strip().str.upper()
+    name = chunk["Name"].fillna("").str.strip()
+    sem = pd.to_numeric(chunk["Sem"], errors="coerce")
+    branch = chunk["Branch"].astype("string").str.strip().str.upper()
+    stype = chunk["Type"].astype("string").str.strip().str.title()
+
+    errors = pd.Series("", index=chunk.index, dtype=object)
+
+    def flag(mask, message):
+        mask = pd.Series(mask, index=chunk.index).fillna(True).to_numpy(dtype=bool)
+        errors[mask] = errors[mask] + message + "; "
+
+    flag(~usn.str.fullmatch(USN_PATTERN), "invalid USN")
+    flag(name == "", "missing Name")
+    flag(~sem.isin(SEMESTERS), "Sem must be 1-8")
+    flag(~branch.isin(BRANCH_VOCABULARY), "unknown Branch")
+    flag(~stype.isin(STUDENT_TYPES), "Type must be Regular or Arrear")
+
+    # duplicates: against earlier chunks (hash set) and inside this chunk
+    clean = (errors == "").to_numpy()
+    usn_list = usn.tolist()
+    repeated = np.fromiter((u in seen for u in usn_list), dtype=bool, count=len(usn_list))
+    repeated |= usn.where(clean).duplicated().to_numpy()
+    flag(repeated & clean, "duplicate USN")
+
+    ok = (errors == "").to_numpy()
+
+    valid = pd.DataFrame({
+        "USN": usn[ok],
+        "Name": name[ok],
+        "Sem": sem[ok].astype("int8"),
+        "Branch": branch[ok],
+        "Type": stype[ok],
+        "Subjects": chunk["Subjects"][ok].fillna(""),
+    })
+    seen.update(valid["USN"].tolist())
+
+    rejected = chunk[~ok].copy()
+    rejected["Error"] = errors[~ok].str.rstrip("; ")
+    return valid, rejected
+
+
+# -----------------------------
+# STREAMING PIPELINE
+# -----------------------------
+def read_chunks(source, chunksize=CHUNK_ROWS):
+    header = read_header(source)
+    dtypes = {name: READ_DTYPES.get(name, "string") for name in header}
+    return pd.read_csv(
+        source,
+        header=0,
+        names=header,
+        dtype=dtypes,
+        chunksize=chunksize,
+        keep_default_na=False,
+        na_values=[""],
+    )
+
+
+def ingest_students(source, write_chunks, chunksize=CHUNK_ROWS, on_progress=None):
+    # Validate `source` chunk by chunk and hand the valid rows to
+    # write_chunks(iterator of DataFrames). Only one chunk is held in memory
+    # at a time. Rejected rows are kept per upload as CSV bytes in
+    # report["errors"], so two clerks uploading at once each get their own
+    # report. If no row is valid, write_chunks is never called and the
+    # roster is left as it was (report["replaced"] is False).
+    total_rows = count_rows(source)
+    total_chunks = max(-(-total_rows // chunksize), 1)
+
+    seen = set()
+    report = {"rows": 0, "accepted": 0, "rejected": 0, "chunks": total_chunks,
+              "replaced": False, "errors": b""}
+    errors = io.StringIO()
+
+    def valid_chunks():
+        for i, chunk in enumerate(read_chunks(source, chunksize), start=1):
+            valid, rejected = validate_chunk(chunk, seen)
+
+            report["rows"] += len(chunk)
+            report["accepted"] += len(valid)
+            report["rejected"] += len(rejected)
+
+            if len(rejected):
+                rejected.to_csv(errors, header=errors.tell() == 0, index=False)
+
+            if on_progress is not None:
+                on_progress(i, total_chunks)
+
+            if len(valid):
+                yield valid
+
+    # hold back the write until there is at least one valid row
+    chunks = valid_chunks()
+    first = next(chunks, None)
+    if first is not None:
+        write_chunks(itertools.chain([first], chunks))
+        report["replaced"] = True
+
+    report["errors"] = errors.getvalue().encode()
+    return report
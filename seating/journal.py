@@ -0,0 +1,120 @@
+import json
+import os
+
+import pandas as pd
+
+# -----------------------------
+# CHANGE JOURNAL
+# -----------------------------
+# Manual edits are appended to "<name>.journal" next to the base CSV, one
+# JSON line per change, instead of rewriting the whole CSV:
+#   {"op": "add", "row": {...}}
+#   {"op": "edit", "key": "1RV21CS001", "row": {...}}
+#   {"op": "delete", "key": "1RV21CS001"}
+# Readers replay the journal on top of the base file. Compaction (see
+# datastore.compact) folds it back into the base: the journal is first
+# renamed to "<name>.compacting" so new changes keep going to a fresh
+# journal while the base is rewritten.
+
+COMPACT_AFTER_BYTES = 256 * 1024
+
+OPS = ("add", "edit", "delete")
+
+
+def journal_path(base_path):
+    return os.path.splitext(base_path)[0] + ".journal"
+
+
+def compacting_path(base_path):
+    return os.path.splitext(base_path)[0] + ".compacting"
+
+
+def normalise_key(key_col, key):
+    # Same rule as the USN index and upload validation: USNs are compared
+    # trimmed and upper-cased, other keys (room names) trimmed
+    key = str(key).strip()
+    return key.upper() if key_col == "USN" else key
+
+
+def key_values(df, key_col):
+    keys = df[key_col].astype(str).str.strip()
+    return keys.str.upper() if key_col == "USN" else keys
+
+
+def append(base_path, op, row=None, key=None):
+    if op not in OPS:
+        raise ValueError(f"Unknown journal op: {op}")
+
+    entry = {"op": op}
+    if key is not None:
+        entry["key"] = str(key)
+    if row is not None:
+        entry["row"] = row
+
+    line = json.dumps(entry, default=str) + "\n"
+    # single O_APPEND write: O(1) on disk whatever the size of the base file
+    with open(journal_path(base_path), "a", encoding="utf-8") as f:
+        f.write(line)
+
+
+def size(base_path):
+    try:
+        return os.path.getsize(journal_path(base_path))
+    except FileNotFoundError:
+        return 0
+
+
+def read_entries(path, offset=0):
+    # Returns (entries, offset after the last complete line)
+    if not os.path.exists(path):
+        return [], 0
+
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+
+    end = data.rfind(b"\n") + 1
+    entries = [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+    return entries, offset + end
+
+
+def apply(df, entries, key_col):
+    # Replay entries in order; runs of adds are concatenated in one go
+    pending = []
+
+    def flush(frame):
+        if not pending:
+            return frame
+        added = pd.DataFrame(pending)
+        pending.clear()
+        if frame.empty:
+            return added
+        return pd.concat([frame, added], ignore_index=True)
+
+    for entry in entries:
+        op = entry.get("op")
+        if op == "add":
+            pending.append(entry["row"])
+            continue
+
+        df = flush(df)
+        hit = key_values(df, key_col) == normalise_key(key_col, entry["key"])
+        if op == "delete":
+            df = df[~hit].reset_index(drop=True)
+        elif op == "edit" and hit.any():
+            df = df.copy()
+            for col, value in entry["row"].items():
+                if col not in df.columns:
+                    df[col] = None
+                df[col] = df[col].astype(object)
+                df.loc[hit, col] = value
+
+    return flush(df)
+
+
+def clear(base_path):
+    for path in (journal_path(base_path), compacting_path(base_path)):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# SEAT TABLE (how plans are stored)
+# -----------------------------
+# One row per occupied seat, in allocation order:
+#   Room, Bench (numbered per room from 1), Seat (position on the bench
+#   from 1), USN, Name, Branch
+# Empty seats are simply not there, so a bench can hold any number of
+# students and nobody has to skip "-" placeholders.
+SEAT_COLUMNS = ["Room", "Bench", "Seat", "USN", "Name", "Branch"]
+
+# -----------------------------
+# WIDE VIEW (CSV export only)
+# -----------------------------
+# The old plan.csv layout: one row per bench with "Student k USN/Name/Branch"
+# columns per seat and "-" for an empty seat.
+EMPTY_SEAT = "-"
+SEAT_FIELDS = ["USN", "Name", "Branch"]
+# per-seat columns only some plans have (slot plans say which paper each
+# student writes, see seating/timetable.py); exported when present
+OPTIONAL_SEAT_FIELDS = ["Subject"]
+
+
+def is_wide(df):
+    return "Student 1 USN" in df.columns
+
+
+def seat_fields(seats):
+    return SEAT_FIELDS + [f for f in OPTIONAL_SEAT_FIELDS if f in seats.columns]
+
+
+def wide_columns(per_bench, fields=SEAT_FIELDS):
+    cols = ["S.No", "Room", "Bench"]
+    for k in range(1, per_bench + 1):
+        cols += [f"Student {k} {field}" for field in fields]
+    return cols
+
+
+def to_wide(seats, per_bench=None):
+    # Seat table -> one row per bench. Defaults to at least two seat
+    # columns so exports keep the familiar Student 1 / Student 2 shape.
+    if per_bench is None:
+        per_bench = max(2, int(seats["Seat"].max())) if len(seats) else 2
+    fields = seat_fields(seats)
+
+    if len(seats) == 0:
+        return pd.DataFrame(columns=wide_columns(per_bench, fields))
+
+    bench_id = seats.groupby(["Room", "Bench"], sort=False, observed=True).ngroup().to_numpy()
+    n_benches = int(bench_id.max()) + 1
+    _, first = np.unique(bench_id, return_index=True)
+
+    wide = {
+        "S.No": np.arange(1, n_benches + 1),
+        "Room": seats["Room"].to_numpy(dtype=object)[first],
+        "Bench": seats["Bench"].to_numpy()[first],
+    }
+
+    seat = seats["Seat"].to_numpy()
+    for k in range(1, per_bench + 1):
+        on_seat = seat == k
+        for field in fields:
+            col = np.full(n_benches, EMPTY_SEAT, dtype=object)
+            col[bench_id[on_seat]] = seats[field].to_numpy(dtype=object)[on_seat]
+            wide[f"Student {k} {field}"] = col
+
+    return pd.DataFrame(wide, columns=wide_columns(per_bench, fields))
+
+
+def from_wide(plan):
+    # Old wide plan.csv -> seat table (keeps reading plans saved before the
+    # switch to seat rows)
+    plan = plan.reset_index(drop=True)
+    parts = []
+    k = 1
+    while f"Student {k} USN" in plan.columns:
+        usn = plan[f"Student {k} USN"]
+        taken = usn.notna() & ~usn.astype(str).str.strip().isin(["", EMPTY_SEAT])
+        part = pd.DataFrame({
+            "Room": plan["Room"],
+            "Bench": plan["Bench"],
+            "Seat": k,
+            "USN": usn,
+            "Name": plan.get(f"Student {k} Name"),
+            "Branch": plan.get(f"Student {k} Branch"),
+        }, columns=SEAT_COLUMNS)
+        for field in OPTIONAL_SEAT_FIELDS:
+            if f"Student {k} {field}" in plan.columns:
+                part[field] = plan[f"Student {k} {field}"]
+        parts.append(part[taken])
+        k += 1
+
+    if not parts:
+        return pd.DataFrame(columns=SEAT_COLUMNS)
+
+    # bench order first, then seat position
+    seats = pd.concat(parts).sort_index(kind="stable")
+    return seats.reset_index(drop=True)
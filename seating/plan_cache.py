@@ -0,0 +1,125 @@
+import hashlib
+import os
+
+import pandas as pd
+
+from seating.allocator import allocate
+
+# -----------------------------
+# CACHE LOCATION + LIMITS
+# -----------------------------
+DATA_FOLDER = "data"
+CACHE_DIR = os.path.join(DATA_FOLDER, "plan_cache")
+
+MAX_ENTRIES = 16
+MAX_BYTES = 256 * 1024 * 1024
+
+# Part of every key: bump when the layout of a generated plan changes so
+# entries written by older code are never handed out.
+PLAN_FORMAT = "seats-1"
+
+
+# -----------------------------
+# KEYS
+# -----------------------------
+def file_digest(path):
+    if not os.path.exists(path):
+        return "missing"
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def plan_key(student_digest, room_digest, seating_mode, **options):
+    # Same inputs + same settings -> same plan
+    h = hashlib.sha256()
+    h.update(student_digest.encode())
+    h.update(room_digest.encode())
+    h.update(f"format={PLAN_FORMAT}".encode())
+    h.update(f"mode={seating_mode}".encode())
+    for name in sorted(options):
+        h.update(f"{name}={options[name]}".encode())
+    return h.hexdigest()[:32]
+
+
+def _entry_path(key, cache_dir):
+    return os.path.join(cache_dir, f"{key}.pkl")
+
+
+# -----------------------------
+# LOOKUP / STORE
+# -----------------------------
+def get_plan(key, cache_dir=CACHE_DIR):
+    path = _entry_path(key, cache_dir)
+    try:
+        plan = pd.read_pickle(path)
+    except (FileNotFoundError, EOFError, ValueError, OSError):
+        return None
+
+    # mtime is the "last used" stamp for LRU eviction
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return plan
+
+
+def put_plan(key, plan, cache_dir=CACHE_DIR, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+    os.makedirs(cache_dir, exist_ok=True)
+
+    path = _entry_path(key, cache_dir)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    plan.to_pickle(tmp)
+    os.replace(tmp, path)
+
+    evict(cache_dir, max_entries, max_bytes)
+
+
+def allocate_cached(students, rooms, student_digest, room_digest, seating_mode=1,
+                    strategy="interleave", time_budget=2.0, dedupe=False, cache_dir=CACHE_DIR):
+    # allocate() behind the cache; returns (plan, from_cache). Shared by the
+    # Generate Plan page and the CLI. CapacityError propagates.
+    key = plan_key(
+        student_digest, room_digest, seating_mode,
+        strategy=strategy,
+        time_budget=time_budget if strategy == "graph" else None,
+        dedupe=dedupe
+    )
+    plan = get_plan(key, cache_dir)
+    if plan is not None:
+        return plan, True
+
+    plan = allocate(students, rooms, seating_mode, strategy=strategy,
+                    time_budget=time_budget, dedupe=dedupe)
+    put_plan(key, plan, cache_dir)
+    return plan, False
+
+
+def evict(cache_dir=CACHE_DIR, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+    # Drop least recently used entries until both limits are met
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".pkl"):
+            st = entry.stat()
+            entries.append((st.st_mtime, st.st_size, entry.path))
+
+    entries.sort(reverse=True)
+    total = 0
+    for i, (_, size, path) in enumerate(entries):
+        total += size
+        if i >= max_entries or total > max_bytes:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def clear(cache_dir=CACHE_DIR):
+    if not os.path.isdir(cache_dir):
+        return
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".pkl"):
+            os.remove(entry.path)
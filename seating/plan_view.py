@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+from seating.search_index import PlanSearchIndex
+
+# -----------------------------
+# WINDOWED PLAN VIEW
+# -----------------------------
+# Pages never hand the whole plan to st.dataframe: they pick row positions
+# (search hits, one room, a sort order) here and ship one page of them.
+# Built once per plan version (see datastore.plan_viewer), so
+#   - jumping to a room is a lookup in the room -> row range index
+#   - sorting by a column reuses a rank array computed on first use
+#   - the USN / name search index is built on first search
+
+PAGE_SIZES = [50, 100, 250, 500]
+
+
+def room_offsets(seats):
+    # room -> (start, stop) row range. Plans are written room by room so
+    # each room is one contiguous block; any other layout falls back to an
+    # array of row positions per room.
+    if "Room" not in seats or len(seats) == 0:
+        return {}
+
+    codes, names = pd.factorize(seats["Room"], sort=False)
+    change = np.flatnonzero(np.diff(codes)) + 1
+    starts = np.r_[0, change]
+    stops = np.r_[change, len(codes)]
+
+    if len(starts) == len(names):
+        return {names[codes[s]]: (int(s), int(e)) for s, e in zip(starts, stops)}
+    return {name: np.flatnonzero(codes == i) for i, name in enumerate(names)}
+
+
+class PlanView:
+    def __init__(self, seats):
+        self.seats = seats
+        self.rooms = room_offsets(seats)
+        self._ranks = {}
+        self._search = None
+
+    def __len__(self):
+        return len(self.seats)
+
+    @property
+    def search_index(self):
+        if self._search is None:
+            self._search = PlanSearchIndex(self.seats)
+        return self._search
+
+    def search(self, query):
+        return self.search_index.search(query)
+
+    @property
+    def room_names(self):
+        return list(self.rooms)
+
+    def room_rows(self, room):
+        hit = self.rooms.get(room)
+        if hit is None:
+            return np.empty(0, dtype=np.int64)
+        if isinstance(hit, tuple):
+            return np.arange(*hit)
+        return hit
+
+    def _rank(self, column):
+        # rank[i] = position of row i when sorted by `column` (stable)
+        if column not in self._ranks:
+            order = self.seats[column].reset_index(drop=True).sort_values(kind="stable").index.to_numpy()
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            self._ranks[column] = rank
+        return self._ranks[column]
+
+    def rows(self, positions=None, room=None, sort_by=None, descending=False):
+        # Row positions to show, in display order. `positions` (e.g. search
+        # hits) must be in ascending plan order.
+        if room is not None:
+            hit = self.rooms.get(room)
+            if hit is None:
+                positions = np.empty(0, dtype=np.int64)
+            elif positions is None:
+                positions = self.room_rows(room)
+            elif isinstance(hit, tuple):
+                lo, hi = np.searchsorted(positions, hit)
+                positions = positions[lo:hi]
+            else:
+                positions = np.intersect1d(positions, hit)
+        elif positions is None:
+            positions = np.arange(len(self.seats))
+
+        if sort_by is not None and len(positions):
+            keys = self._rank(sort_by)[positions]
+            if descending:
+                keys = -keys
+            positions = positions[np.argsort(keys, kind="stable")]
+        return positions
+
+    def window(self, positions, page, page_size):
+        # `page` counts from 1
+        start = (page - 1) * page_size
+        return self.seats.iloc[positions[start:start + page_size]]
+
+
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
@@ -0,0 +1,89 @@
+import hashlib
+import os
+import threading
+
+# -----------------------------
+# CACHE LOCATION + LIMITS
+# -----------------------------
+# Rendered PDFs, content-addressed: the key is a hash of everything that
+# goes into the document, so an unchanged hall is never rendered twice,
+# whatever else in the plan changed.
+DATA_FOLDER = "data"
+CACHE_DIR = os.path.join(DATA_FOLDER, "render_cache")
+
+MAX_ENTRIES = 2000
+MAX_BYTES = 512 * 1024 * 1024
+
+# bump when a report layout changes so old renders are not served
+RENDER_FORMAT = "1"
+
+
+# -----------------------------
+# KEYS
+# -----------------------------
+def render_key(kind, *parts):
+    h = hashlib.sha256()
+    h.update(f"format={RENDER_FORMAT};kind={kind}".encode())
+    for part in parts:
+        h.update(b"\0")
+        h.update(repr(part).encode())
+    return h.hexdigest()[:32]
+
+
+def _entry_path(key, cache_dir):
+    return os.path.join(cache_dir, f"{key}.pdf")
+
+
+# -----------------------------
+# LOOKUP / STORE
+# -----------------------------
+def get(key, cache_dir=CACHE_DIR):
+    path = _entry_path(key, cache_dir)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    # mtime is the "last used" stamp for LRU eviction
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return data
+
+
+def put(key, data, cache_dir=CACHE_DIR, trim=True):
+    # trim=False lets batch jobs store many entries and evict() once
+    os.makedirs(cache_dir, exist_ok=True)
+
+    path = _entry_path(key, cache_dir)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+    if trim:
+        evict(cache_dir)
+
+
+def evict(cache_dir=CACHE_DIR, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+    # Drop least recently used entries until both limits are met
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.name.endswith(".pdf"):
+            st = entry.stat()
+            entries.append((st.st_mtime, st.st_size, entry.path))
+
+    if len(entries) <= max_entries and sum(e[1] for e in entries) <= max_bytes:
+        return
+
+    entries.sort(reverse=True)
+    total = 0
+    for i, (_, size, path) in enumerate(entries):
+        total += size
+        if i >= max_entries or total > max_bytes:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
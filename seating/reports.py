@@ -0,0 +1,307 @@
+import io
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+import numpy as np
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.platypus import (
+    BaseDocTemplate, Flowable, Frame, LongTable, NextPageTemplate, PageBreak, PageTemplate,
+    SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer,
+)
+
+from seating import render_cache
+from seating.plan_view import room_offsets
+
+# -----------------------------
+# HALL REPORT (one room)
+# -----------------------------
+def hall_rows(room_data):
+    # (bench, usn, branch) per seat, plain tuples so they pickle cheaply
+    cols = room_data[["Bench", "USN", "Branch"]]
+    return [
+        (bench, str(usn).strip(), str(branch).strip())
+        for bench, usn, branch in cols.itertuples(index=False)
+    ]
+
+
+def hall_report(room_name, rows, out):
+    # `out` is a filename or a binary file object
+    doc = SimpleDocTemplate(out, pagesize=A4)
+    elements = []
+
+    styles = getSampleStyleSheet()
+
+    elements.append(Paragraph("EXAM HALL SEATING REPORT", styles["Title"]))
+    elements.append(Spacer(1, 15))
+
+    elements.append(Paragraph(f"Room Name: {room_name}", styles["Heading2"]))
+    elements.append(Spacer(1, 20))
+
+    # Only USN + Branch, one line per seat
+    table_data = [["Bench No", "USN", "Branch"]]
+    table_data.extend(list(row) for row in rows)
+
+    table = Table(table_data, colWidths=[90, 200, 150])
+
+    table.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("GRID", (0, 0), (-1, -1), 1, colors.black),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+        ("FONTSIZE", (0, 0), (-1, 0), 12),
+        ("FONTSIZE", (0, 1), (-1, -1), 11),
+    ]))
+
+    elements.append(table)
+
+    elements.append(Spacer(1, 40))
+    elements.append(Paragraph("Supervisor Signature: ____________________", styles["Normal"]))
+
+    doc.build(elements)
+
+
+def hall_report_bytes(room_name, rows):
+    buf = io.BytesIO()
+    hall_report(room_name, rows, buf)
+    return buf.getvalue()
+
+
+def hall_key(room_name, rows):
+    return render_cache.render_key("hall", room_name, rows)
+
+
+def cached_hall_report(room_name, rows):
+    # Rendered in memory; unchanged halls come straight from the cache
+    key = hall_key(room_name, rows)
+    data = render_cache.get(key)
+    if data is None:
+        data = hall_report_bytes(room_name, rows)
+        render_cache.put(key, data)
+    return data
+
+
+def pdf_filename(room_name):
+    safe = re.sub(r"[^\w\- ]", "_", str(room_name)).strip() or "room"
+    return f"Hall_Report_{safe}.pdf"
+
+
+# -----------------------------
+# ALL HALLS (process pool -> one ZIP)
+# -----------------------------
+def _render_hall(job):
+    # Runs in a worker process. Errors are returned, not raised, so one bad
+    # room does not take the batch down.
+    room_name, rows = job
+    try:
+        return room_name, hall_report_bytes(room_name, rows), None
+    except Exception as e:
+        return room_name, None, f"{type(e).__name__}: {e}"
+
+
+def render_all_halls(jobs, out, workers=None, on_progress=None, use_cache=True):
+    # jobs: list of (room_name, rows). PDFs are written into the ZIP `out`
+    # (filename or binary file) as they become available: cached halls
+    # first, the rest as workers finish them. Returns {room_name: error}
+    # for the rooms that failed.
+    jobs = list(jobs)
+    workers = workers or os.cpu_count() or 1
+    failed = {}
+    done = 0
+
+    def step():
+        nonlocal done
+        done += 1
+        if on_progress is not None:
+            on_progress(done, len(jobs))
+
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_STORED) as zf:
+        todo = []
+        for room_name, rows in jobs:
+            data = render_cache.get(hall_key(room_name, rows)) if use_cache else None
+            if data is None:
+                todo.append((room_name, rows))
+            else:
+                zf.writestr(pdf_filename(room_name), data)
+                step()
+
+        if todo:
+            rows_for = dict(todo)
+            # spawn: forking the multi-threaded Streamlit server is not safe
+            ctx = get_context("spawn")
+            with ProcessPoolExecutor(max_workers=min(workers, len(todo)), mp_context=ctx) as pool:
+                futures = {pool.submit(_render_hall, job): job[0] for job in todo}
+
+                for future in as_completed(futures):
+                    room_name = futures[future]
+                    try:
+                        _, data, error = future.result()
+                    except Exception as e:
+                        # worker died (e.g. killed / out of memory)
+                        data, error = None, f"{type(e).__name__}: {e}"
+
+                    if error is None:
+                        zf.writestr(pdf_filename(room_name), data)
+                        if use_cache:
+                            render_cache.put(hall_key(room_name, rows_for[room_name]), data, trim=False)
+                    else:
+                        failed[room_name] = error
+                    step()
+
+            if use_cache:
+                render_cache.evict()
+
+        if failed:
+            lines = [f"{room}: {error}" for room, error in failed.items()]
+            zf.writestr("FAILED_ROOMS.txt", "\n".join(lines) + "\n")
+
+    return failed
+
+
+# -----------------------------
+# MASTER REPORT (whole plan, one document)
+# -----------------------------
+# Cover index, one section per room, then every seat sorted by USN. Rows
+# are pulled from the plan a chunk at a time and laid out as repeat-header
+# LongTables, and the flowables themselves are generated lazily while
+# ReportLab builds, so memory stays flat and time grows linearly with the
+# number of seats.
+MASTER_CHUNK_ROWS = 200
+
+MASTER_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+    ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), 9),
+    ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+    ("TOPPADDING", (0, 0), (-1, -1), 1),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), 1),
+])
+
+
+class _Bookmark(Flowable):
+    # zero-size marker: PDF outline entry for a section
+    def __init__(self, title, key, level=0):
+        super().__init__()
+        self.title, self.key, self.level = title, key, level
+
+    def wrap(self, avail_width, avail_height):
+        return 0, 0
+
+    def draw(self):
+        self.canv.bookmarkPage(self.key)
+        self.canv.addOutlineEntry(self.title, self.key, level=self.level)
+
+
+class _FlowableStream(list):
+    # List that ReportLab's build loop drains from the front; refilled from
+    # a generator so only a few flowables exist at any time.
+    def __init__(self, flowables, lookahead=4):
+        super().__init__()
+        self._source = iter(flowables)
+        self._lookahead = lookahead
+
+    def __len__(self):
+        while list.__len__(self) < self._lookahead and self._source is not None:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+        return list.__len__(self)
+
+
+def _chunked_tables(header, columns, positions, col_widths, chunk_rows):
+    # One LongTable per chunk of rows, header repeated on every page
+    for start in range(0, len(positions), chunk_rows):
+        part = positions[start:start + chunk_rows]
+        body = zip(*(col[part].tolist() for col in columns))
+        table = LongTable([header] + [list(row) for row in body], colWidths=col_widths, repeatRows=1)
+        table.setStyle(MASTER_TABLE_STYLE)
+        yield table, len(part)
+
+
+def _master_flowables(seats, chunk_rows, on_progress):
+    styles = getSampleStyleSheet()
+    rooms = room_offsets(seats)
+    total = len(seats)
+    done = 0
+
+    room = seats["Room"].astype(str).to_numpy(dtype=object)
+    bench = seats["Bench"].to_numpy()
+    seat = seats["Seat"].to_numpy()
+    usn = seats["USN"].astype(str).to_numpy(dtype=object)
+    name = seats["Name"].astype(str).to_numpy(dtype=object)
+    branch = seats["Branch"].astype(str).to_numpy(dtype=object)
+
+    # cover: index of rooms
+    yield Paragraph("EXAM SEATING - MASTER REPORT", styles["Title"])
+    yield Spacer(1, 10)
+    yield Paragraph(f"{len(rooms)} rooms, {total} students", styles["Heading3"])
+    yield Spacer(1, 10)
+
+    index = [["#", "Room", "Students"]]
+    for i, (room_name, hit) in enumerate(rooms.items(), start=1):
+        count = hit[1] - hit[0] if isinstance(hit, tuple) else len(hit)
+        index.append([i, str(room_name), count])
+    cover = LongTable(index, colWidths=[40, 250, 90], repeatRows=1)
+    cover.setStyle(MASTER_TABLE_STYLE)
+    yield cover
+
+    yield NextPageTemplate("body")
+
+    # one section per room
+    for i, (room_name, hit) in enumerate(rooms.items()):
+        positions = np.arange(*hit) if isinstance(hit, tuple) else hit
+        yield PageBreak()
+        yield _Bookmark(str(room_name), f"room{i}")
+        yield Paragraph(f"Room: {room_name}", styles["Heading2"])
+        for table, count in _chunked_tables(
+            ["Bench", "Seat", "USN", "Name", "Branch"],
+            [bench, seat, usn, name, branch],
+            positions, [50, 40, 110, 200, 80], chunk_rows,
+        ):
+            yield table
+            done += count
+            if on_progress is not None:
+                on_progress(done, 2 * total)
+
+    # master list sorted by USN
+    yield PageBreak()
+    yield _Bookmark("Master list (by USN)", "master")
+    yield Paragraph("Master List (sorted by USN)", styles["Heading2"])
+    by_usn = np.argsort(usn.astype(str), kind="stable")
+    for table, count in _chunked_tables(
+        ["USN", "Name", "Branch", "Room", "Bench", "Seat"],
+        [usn, name, branch, room, bench, seat],
+        by_usn, [95, 160, 60, 110, 45, 40], chunk_rows,
+    ):
+        yield table
+        done += count
+        if on_progress is not None:
+            on_progress(done, 2 * total)
+
+
+def _page_header(title):
+    def draw(canv, doc):
+        canv.saveState()
+        canv.setFont("Helvetica", 8)
+        canv.drawString(15 * mm, A4[1] - 10 * mm, title)
+        canv.drawRightString(A4[0] - 15 * mm, 10 * mm, f"Page {doc.page}")
+        canv.restoreState()
+    return draw
+
+
+def master_report(seats, out, chunk_rows=MASTER_CHUNK_ROWS, on_progress=None):
+    # `seats`: plan in seat-table layout; `out`: filename or binary file
+    doc = BaseDocTemplate(out, pagesize=A4, title="Exam Seating - Master Report")
+    frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id="main")
+    doc.addPageTemplates([
+        PageTemplate(id="cover", frames=[frame]),
+        PageTemplate(id="body", frames=[frame], onPage=_page_header("Exam Seating - Master Report")),
+    ])
+    doc.build(_FlowableStream(_master_flowables(seats, chunk_rows, on_progress)))
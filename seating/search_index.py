@@ -0,0 +1,102 @@
+import numpy as np
+
+# -----------------------------
+# PLAN SEARCH INDEX
+# -----------------------------
+# Built once per plan version (see plan_view.PlanView.search_index) so each
+# keystroke in the View Output search box is a couple of binary searches
+# instead of a scan over every seat:
+#   - USNs: sorted array of every suffix of every upper-cased USN. A
+#     substring is a prefix of some suffix, so exact, prefix and partial
+#     matches are all one range lookup.
+#   - Names: sorted array of upper-cased name tokens; each query word
+#     matches tokens starting with it ("abh" -> ABHISHEK).
+# Results are row positions into the plan the index was built from.
+
+
+def _sorted_keys(keys, rows):
+    # USNs are plain ASCII: stored as bytes they take a quarter of the space
+    try:
+        keys = np.array(keys, dtype="S")
+    except UnicodeEncodeError:
+        keys = np.array(keys, dtype=str)
+    rows = np.asarray(rows, dtype=np.int64)
+    order = np.argsort(keys, kind="stable")
+    return keys[order], rows[order]
+
+
+def _prefix_rows(keys, rows, prefix):
+    if keys.dtype.kind == "S":
+        try:
+            prefix, top = prefix.encode("ascii"), b"\xff"
+        except UnicodeEncodeError:
+            return rows[:0]
+    else:
+        top = "\U0010ffff"
+
+    # keep the probes within the array's width, otherwise numpy copies
+    # the whole array to a wider dtype on every lookup
+    width = keys.dtype.itemsize // (1 if keys.dtype.kind == "S" else 4)
+    if len(prefix) > width:
+        return rows[:0]
+    lo = np.searchsorted(keys, prefix, side="left")
+    if len(prefix) == width:
+        hi = np.searchsorted(keys, prefix, side="right")
+    else:
+        hi = np.searchsorted(keys, prefix + top, side="left")
+    return rows[lo:hi]
+
+
+class PlanSearchIndex:
+    def __init__(self, seats):
+        self.seats = seats
+        n = len(seats)
+
+        usns = seats["USN"].astype(str).str.strip().str.upper().tolist() if n else []
+        suffixes, suffix_rows = [], []
+        for row, usn in enumerate(usns):
+            for i in range(len(usn)):
+                suffixes.append(usn[i:])
+                suffix_rows.append(row)
+        self.usn_keys, self.usn_rows = _sorted_keys(suffixes, suffix_rows)
+
+        names = seats["Name"].astype(str).str.upper().tolist() if n else []
+        tokens, token_rows = [], []
+        for row, name in enumerate(names):
+            for token in name.split():
+                tokens.append(token)
+                token_rows.append(row)
+        self.name_keys, self.name_rows = _sorted_keys(tokens, token_rows)
+
+    def __len__(self):
+        return len(self.seats)
+
+    # hits are kept as boolean masks over the plan rows: setting flags is
+    # cheaper than sorting/deduplicating thousands of row numbers
+    def _mask(self, rows):
+        mask = np.zeros(len(self.seats), dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def usn_mask(self, query):
+        # exact, prefix or partial match anywhere in the USN
+        query = query.strip().upper()
+        return self._mask(_prefix_rows(self.usn_keys, self.usn_rows, query))
+
+    def name_mask(self, query):
+        # every word must start one of the name's tokens
+        words = query.upper().split()
+        mask = self._mask(_prefix_rows(self.name_keys, self.name_rows, words[0])) if words \
+            else np.zeros(len(self.seats), dtype=bool)
+        for word in words[1:]:
+            mask &= self._mask(_prefix_rows(self.name_keys, self.name_rows, word))
+        return mask
+
+    def search(self, query):
+        # Row positions (in plan order) matching a USN fragment or a name
+        if not query or not query.strip():
+            return np.arange(len(self.seats))
+        return np.flatnonzero(self.usn_mask(query) | self.name_mask(query))
+
+    def lookup(self, query):
+        return self.seats.iloc[self.search(query)]
@@ -0,0 +1,181 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import get_context
+
+import pandas as pd
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfgen import canvas
+
+# -----------------------------
+# SEAT SLIPS
+# -----------------------------
+# One small slip per student (USN, name, room, bench, seat, subjects),
+# ten to an A4 page, one PDF per branch or semester. Large groups are cut
+# into parts of SLIPS_PER_FILE so every job - and every worker's memory -
+# stays small; parts are drawn straight onto a canvas in worker processes
+# and written to disk as soon as they are done.
+SLIPS_PER_FILE = 2000
+COLUMNS, ROWS = 2, 5
+
+GROUPS = {"Branch": "Branch", "Semester": "Sem"}
+
+SLIP_FIELDS = ["USN", "Name", "Room", "Bench", "Seat", "Subjects"]
+
+
+def slip_table(seats, students):
+    # Seat rows + Sem / Subjects from the roster (first record per USN)
+    roster = students[["USN", "Sem", "Subjects"]].copy()
+    roster["key"] = roster["USN"].astype(str).str.strip().str.upper()
+    roster = roster.drop_duplicates("key").drop(columns="USN")
+
+    slips = seats[["Room", "Bench", "Seat", "USN", "Name", "Branch"]].copy()
+    slips["key"] = slips["USN"].astype(str).str.strip().str.upper()
+    slips = slips.merge(roster, on="key", how="left", sort=False).drop(columns="key")
+    slips["Subjects"] = slips["Subjects"].astype(object).where(slips["Subjects"].notna(), "")
+    sem = pd.to_numeric(slips["Sem"], errors="coerce").astype("Int64").astype(str)
+    slips["Sem"] = sem.where(slips["Sem"].notna() & (sem != "<NA>"), "Unknown")
+    return slips
+
+
+def _safe(name):
+    return re.sub(r"[^\w\-]", "_", str(name)).strip("_") or "unknown"
+
+
+def slip_jobs(slips, group_by="Branch", per_file=SLIPS_PER_FILE):
+    # (filename, title, records) per output file, generated lazily
+    column = GROUPS.get(group_by, group_by)
+    label = "Sem" if column == "Sem" else column
+
+    for value, rows in slips.groupby(slips[column].astype(str), sort=True, observed=True):
+        rows = rows.sort_values("USN", kind="stable")
+        parts = max(1, -(-len(rows) // per_file))
+        for part in range(parts):
+            chunk = rows.iloc[part * per_file:(part + 1) * per_file]
+            suffix = f"_part{part + 1}" if parts > 1 else ""
+            filename = f"Seat_Slips_{label}_{_safe(value)}{suffix}.pdf"
+            title = f"{label} {value}"
+            records = list(chunk[SLIP_FIELDS].astype(str).itertuples(index=False, name=None))
+            yield filename, title, records
+
+
+# -----------------------------
+# DRAWING
+# -----------------------------
+def _fit(canv, text, font, size, width):
+    text = str(text)
+    while text and canv.stringWidth(text, font, size) > width:
+        text = text[:-2] + "…" if len(text) > 1 else ""
+    return text
+
+
+def render_slips(records, out, title=""):
+    # records: (USN, Name, Room, Bench, Seat, Subjects) tuples
+    canv = canvas.Canvas(out, pagesize=A4, pageCompression=1)
+    page_w, page_h = A4
+    margin = 10 * mm
+    slip_w = (page_w - 2 * margin) / COLUMNS
+    slip_h = (page_h - 2 * margin) / ROWS
+    per_page = COLUMNS * ROWS
+
+    for i, (usn, name, room, bench, seat, subjects) in enumerate(records):
+        slot = i % per_page
+        if slot == 0 and i:
+            canv.showPage()
+
+        x = margin + (slot % COLUMNS) * slip_w
+        y = page_h - margin - (slot // COLUMNS + 1) * slip_h
+        inner = slip_w - 12 * mm
+
+        canv.setDash(3, 3)
+        canv.rect(x + 2 * mm, y + 2 * mm, slip_w - 4 * mm, slip_h - 4 * mm)
+        canv.setDash()
+
+        top = y + slip_h - 10 * mm
+        canv.setFont("Helvetica-Bold", 11)
+        canv.drawString(x + 6 * mm, top, "EXAM SEAT SLIP")
+        canv.setFont("Helvetica", 7)
+        canv.drawRightString(x + slip_w - 6 * mm, top, _fit(canv, title, "Helvetica", 7, inner / 2))
+
+        canv.setFont("Helvetica-Bold", 16)
+        canv.drawString(x + 6 * mm, top - 10 * mm, usn)
+
+        lines = [
+            ("Name", name),
+            ("Room", room),
+            ("Bench / Seat", f"{bench} / {seat}"),
+            ("Subjects", subjects),
+        ]
+        canv.setFont("Helvetica", 9)
+        for n, (label, value) in enumerate(lines):
+            line_y = top - 17 * mm - n * 5.5 * mm
+            canv.drawString(x + 6 * mm, line_y, f"{label}:")
+            canv.drawString(x + 30 * mm, line_y, _fit(canv, value, "Helvetica", 9, inner - 24 * mm))
+
+    canv.save()
+
+
+# -----------------------------
+# PARALLEL RUN
+# -----------------------------
+def _render_job(job):
+    # Runs in a worker process; errors are returned so one file failing
+    # does not stop the run.
+    path, title, records = job
+    try:
+        render_slips(records, path, title)
+        return os.path.basename(path), len(records), None
+    except Exception as e:
+        return os.path.basename(path), 0, f"{type(e).__name__}: {e}"
+
+
+def generate_slips(seats, students, out_dir, group_by="Branch", workers=None,
+                   per_file=SLIPS_PER_FILE, on_progress=None):
+    # Writes the slip PDFs into out_dir. Only a couple of jobs per worker
+    # are queued at a time, so memory does not grow with the plan size.
+    # Returns {"files": [...], "slips": n, "failed": {filename: error}}.
+    os.makedirs(out_dir, exist_ok=True)
+    slips = slip_table(seats, students)
+    total = len(slips)
+    workers = workers or os.cpu_count() or 1
+
+    report = {"files": [], "slips": 0, "failed": {}}
+    jobs = (
+        (os.path.join(out_dir, filename), title, records)
+        for filename, title, records in slip_jobs(slips, group_by, per_file)
+    )
+
+    ctx = get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        pending = {}
+        for job in jobs:
+            pending[pool.submit(_render_job, job)] = os.path.basename(job[0])
+            if len(pending) >= 2 * workers:
+                _collect(pending, report, total, on_progress)
+        while pending:
+            _collect(pending, report, total, on_progress)
+
+    report["files"].sort()
+    return report
+
+
+def _collect(pending, report, total, on_progress):
+    # wait for at least one job and record what finished
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        filename = pending.pop(future)
+        try:
+            _, count, error = future.result()
+        except Exception as e:
+            # worker died (e.g. killed / out of memory)
+            count, error = 0, f"{type(e).__name__}: {e}"
+
+        if error is None:
+            report["files"].append(filename)
+            report["slips"] += count
+        else:
+            report["failed"][filename] = error
+
+        if on_progress is not None:
+            on_progress(report["slips"], total)
@@ -0,0 +1,138 @@
+import time
+
+import numpy as np
+
+# -----------------------------
+# SEAT GRAPH
+# -----------------------------
+# Seats are numbered in plan order: seat s sits on bench s // per_bench,
+# position s % per_bench. Two seats are neighbours when they share a bench
+# (side by side) or sit in the same position on consecutive benches of the
+# same room (front / back).
+
+
+def seat_edges(bench_room, per_bench, n_seats):
+    bench_room = np.asarray(bench_room)
+    seats = np.arange(n_seats, dtype=np.int64)
+    bench = seats // per_bench
+
+    # side neighbours on the same bench
+    side = seats[(seats % per_bench < per_bench - 1) & (seats + 1 < n_seats)]
+    side_u, side_v = side, side + 1
+
+    # front / back neighbours in the same room
+    fb = seats[seats + per_bench < n_seats]
+    fb = fb[bench_room[bench[fb]] == bench_room[bench[fb] + 1]]
+    fb_u, fb_v = fb, fb + per_bench
+
+    return np.concatenate([side_u, fb_u]), np.concatenate([side_v, fb_v])
+
+
+def neighbour_lists(n_seats, edges_u, edges_v):
+    u = np.concatenate([edges_u, edges_v])
+    v = np.concatenate([edges_v, edges_u])
+    order = np.argsort(u, kind="stable")
+    indptr = np.concatenate([[0], np.cumsum(np.bincount(u, minlength=n_seats))])
+    indices = v[order].tolist()
+    indptr = indptr.tolist()
+    return [indices[indptr[s]:indptr[s + 1]] for s in range(n_seats)]
+
+
+def count_conflicts(codes, edges_u, edges_v):
+    codes = np.asarray(codes)
+    return int(np.count_nonzero(codes[edges_u] == codes[edges_v]))
+
+
+# -----------------------------
+# LOCAL SEARCH
+# -----------------------------
+def minimise_conflicts(codes, edges_u, edges_v, time_budget=2.0, seed=0):
+    # Swap students between seats until no two neighbours share a branch,
+    # the time budget runs out, or no improving swap can be found.
+    # Returns the new seat order (a permutation of seat indices).
+    n = len(codes)
+    order = np.arange(n, dtype=np.int64)
+    if n < 2 or len(edges_u) == 0:
+        return order
+
+    nbrs = neighbour_lists(n, edges_u, edges_v)
+    seat_code = np.asarray(codes).tolist()
+    who = order.tolist()
+
+    # per seat: number of neighbours with the same branch
+    same = [0] * n
+    for a, b in zip(np.asarray(edges_u).tolist(), np.asarray(edges_v).tolist()):
+        if seat_code[a] == seat_code[b]:
+            same[a] += 1
+            same[b] += 1
+
+    # seats with at least one conflict, kept as list + position map for O(1) pick/remove
+    hot = [s for s in range(n) if same[s]]
+    hot_pos = {s: i for i, s in enumerate(hot)}
+
+    def mark(s):
+        if same[s] and s not in hot_pos:
+            hot_pos[s] = len(hot)
+            hot.append(s)
+        elif not same[s] and s in hot_pos:
+            i = hot_pos.pop(s)
+            last = hot.pop()
+            if i < len(hot):
+                hot[i] = last
+                hot_pos[last] = i
+
+    def gain(seat, new_code, skip):
+        return sum(1 for t in nbrs[seat] if t != skip and seat_code[t] == new_code)
+
+    rng = np.random.default_rng(seed)
+    picks = rng.random(4096).tolist()
+    pick_i = 0
+    deadline = time.perf_counter() + time_budget
+    misses = 0
+    max_misses = 50 * n + 1000
+    step = 0
+
+    while hot and misses < max_misses:
+        step += 1
+        if step % 256 == 0 and time.perf_counter() > deadline:
+            break
+
+        if pick_i + 2 >= len(picks):
+            picks = rng.random(4096).tolist()
+            pick_i = 0
+        a = hot[int(picks[pick_i] * len(hot))]
+        b = int(picks[pick_i + 1] * n)
+        pick_i += 2
+
+        ca, cb = seat_code[a], seat_code[b]
+        if ca == cb:
+            misses += 1
+            continue
+
+        before = same[a] + same[b]
+        after = gain(a, cb, b) + gain(b, ca, a)
+        if after > before:
+            misses += 1
+            continue
+        # sideways moves are allowed to walk across plateaus, but only
+        # a real improvement resets the stagnation counter
+        misses = misses + 1 if after == before else 0
+
+        # apply swap and update counters of the touched seats only
+        for t in nbrs[a]:
+            if t != b:
+                same[t] += (seat_code[t] == cb) - (seat_code[t] == ca)
+                mark(t)
+        for t in nbrs[b]:
+            if t != a:
+                same[t] += (seat_code[t] == ca) - (seat_code[t] == cb)
+                mark(t)
+
+        seat_code[a], seat_code[b] = cb, ca
+        who[a], who[b] = who[b], who[a]
+        same[a] = gain(a, cb, -1)
+        same[b] = gain(b, ca, -1)
+        mark(a)
+        mark(b)
+
+    return np.asarray(who, dtype=np.int64)
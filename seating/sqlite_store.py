@@ -0,0 +1,266 @@
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+
+from seating.layout import from_wide, is_wide
+
+# -----------------------------
+# DATABASE FILE
+# -----------------------------
+DATA_FOLDER = "data"
+DB_FILE = os.path.join(DATA_FOLDER, "seating.db")
+
+# -----------------------------
+# SCHEMA
+# -----------------------------
+# Column names are kept identical to the CSV headers so DataFrames move
+# in and out of the tables without renaming.
+TABLES = {
+    "students": [
+        ('"USN"', "TEXT PRIMARY KEY COLLATE NOCASE"),
+        ('"Name"', "TEXT"),
+        ('"Sem"', "INTEGER"),
+        ('"Branch"', "TEXT"),
+        ('"Type"', "TEXT"),
+        ('"Subjects"', "TEXT"),
+    ],
+    "rooms": [
+        ('"Room Name"', "TEXT PRIMARY KEY"),
+        ('"Capacity"', "INTEGER"),
+        # optional bench grid, see seating/geometry.py
+        ('"Rows"', "INTEGER"),
+        ('"Columns"', "INTEGER"),
+        ('"Blocked"', "TEXT"),
+        ('"Aisles"', "TEXT"),
+        ('"Seats per Bench"', "INTEGER"),
+    ],
+    # one row per occupied seat (see seating/layout.py)
+    "seats": [
+        ('"Room"', "TEXT"),
+        ('"Bench"', "INTEGER"),
+        ('"Seat"', "INTEGER"),
+        ('"USN"', "TEXT COLLATE NOCASE"),
+        ('"Name"', "TEXT"),
+        ('"Branch"', "TEXT"),
+    ],
+}
+
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_students_branch ON students ("Branch")',
+    'CREATE INDEX IF NOT EXISTS idx_students_sem ON students ("Sem")',
+    'CREATE UNIQUE INDEX IF NOT EXISTS idx_seats_position ON seats ("Room", "Bench", "Seat")',
+    'CREATE INDEX IF NOT EXISTS idx_seats_usn ON seats ("USN")',
+]
+
+
+def columns(table):
+    return [name.strip('"') for name, _ in TABLES[table]]
+
+
+_ready = set()
+_ready_lock = threading.Lock()
+
+
+def connect(db_path=DB_FILE):
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA synchronous=NORMAL")
+
+    # schema + WAL mode only need setting up once per process
+    with _ready_lock:
+        if db_path not in _ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            init_schema(conn)
+            _ready.add(db_path)
+    return conn
+
+
+@contextmanager
+def connection(db_path=DB_FILE):
+    conn = connect(db_path)
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def init_schema(conn):
+    with conn:
+        for table, cols in TABLES.items():
+            body = ", ".join(f"{name} {decl}" for name, decl in cols)
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({body})")
+        for table, cols in TABLES.items():
+            # databases made before a column was added to TABLES
+            have = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for name, decl in cols:
+                if name.strip('"') not in have:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+        for sql in INDEXES:
+            conn.execute(sql)
+        # bumped on every write so readers can cache whole tables
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS versions (name TEXT PRIMARY KEY, version INTEGER)"
+        )
+
+
+# -----------------------------
+# READ / WRITE WHOLE TABLES
+# -----------------------------
+def table_version(conn, table):
+    row = conn.execute("SELECT version FROM versions WHERE name = ?", (table,)).fetchone()
+    return row[0] if row else 0
+
+
+def _bump(conn, table):
+    conn.execute(
+        "INSERT INTO versions (name, version) VALUES (?, 1) "
+        "ON CONFLICT(name) DO UPDATE SET version = version + 1",
+        (table,),
+    )
+
+
+def read_table(conn, table):
+    cols = ", ".join(name for name, _ in TABLES[table])
+    return pd.read_sql_query(f"SELECT {cols} FROM {table}", conn)
+
+
+def _rows(df, cols):
+    df = df.reindex(columns=cols).astype(object)
+    df = df.where(df.notna(), None)
+    return df.itertuples(index=False, name=None)
+
+
+def replace_table(conn, table, df):
+    cols = columns(table)
+    names = ", ".join(f'"{c}"' for c in cols)
+    marks = ", ".join("?" for _ in cols)
+    with conn:
+        conn.execute(f"DELETE FROM {table}")
+        cur = conn.executemany(
+            f"INSERT OR IGNORE INTO {table} ({names}) VALUES ({marks})",
+            _rows(df, cols),
+        )
+        _bump(conn, table)
+    return max(cur.rowcount, 0)
+
+
+def get_row(conn, table, key_col, key):
+    # One row by primary key as a dict, None if missing
+    cols = columns(table)
+    names = ", ".join(f'"{c}"' for c in cols)
+    found = conn.execute(f'SELECT {names} FROM {table} WHERE "{key_col}" = ?', (key,)).fetchone()
+    return None if found is None else dict(zip(cols, found))
+
+
+def apply_change(conn, table, key_col, op, row=None, key=None):
+    # Single-row add / edit / delete (same ops as seating.journal).
+    # Returns the number of rows changed.
+    cols = [c for c in columns(table) if row and c in row]
+    names = [f'"{c}"' for c in cols]
+    values = [row[c] for c in cols]
+
+    with conn:
+        if op == "add":
+            marks = ", ".join("?" for _ in cols)
+            cur = conn.execute(
+                f"INSERT OR IGNORE INTO {table} ({', '.join(names)}) VALUES ({marks})",
+                values,
+            )
+        elif op == "edit":
+            sets = ", ".join(f"{name} = ?" for name in names)
+            cur = conn.execute(
+                f'UPDATE {table} SET {sets} WHERE "{key_col}" = ?',
+                values + [key],
+            )
+        elif op == "delete":
+            cur = conn.execute(f'DELETE FROM {table} WHERE "{key_col}" = ?', (key,))
+        else:
+            raise ValueError(f"Unknown change op: {op}")
+        _bump(conn, table)
+    return max(cur.rowcount, 0)
+
+
+def replace_table_chunks(conn, table, chunks):
+    # Like replace_table, but streams an iterator of DataFrames inside one
+    # transaction. Returns the number of rows inserted.
+    cols = columns(table)
+    names = ", ".join(f'"{c}"' for c in cols)
+    marks = ", ".join("?" for _ in cols)
+    inserted = 0
+    with conn:
+        conn.execute(f"DELETE FROM {table}")
+        for df in chunks:
+            cur = conn.executemany(
+                f"INSERT OR IGNORE INTO {table} ({names}) VALUES ({marks})",
+                _rows(df, cols),
+            )
+            inserted += max(cur.rowcount, 0)
+        _bump(conn, table)
+    return inserted
+
+
+# -----------------------------
+# INDEXED LOOKUPS
+# -----------------------------
+def plan_rooms(conn):
+    # rooms in seating order (rowid follows allocation order)
+    rows = conn.execute(
+        'SELECT "Room" FROM seats GROUP BY "Room" ORDER BY MIN(rowid)'
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+def plan_for_room(conn, room):
+    cols = ", ".join(name for name, _ in TABLES["seats"])
+    return pd.read_sql_query(
+        f'SELECT {cols} FROM seats WHERE "Room" = ? ORDER BY "Bench", "Seat"', conn, params=(room,)
+    )
+
+
+def plan_for_usn(conn, usn_prefix):
+    # Case-insensitive prefix match as a range scan on the NOCASE index
+    cols = ", ".join(name for name, _ in TABLES["seats"])
+    lo = usn_prefix.strip().upper()
+    hi = lo + "\U0010ffff"
+    return pd.read_sql_query(
+        f'SELECT {cols} FROM seats WHERE "USN" >= ? AND "USN" < ? ORDER BY rowid',
+        conn,
+        params=(lo, hi),
+    )
+
+
+# -----------------------------
+# ONE-SHOT MIGRATION FROM CSV
+# -----------------------------
+def migrate_from_csv(db_path=DB_FILE, data_folder=DATA_FOLDER):
+    conn = connect(db_path)
+    report = {}
+    try:
+        for table, filename in (("students", "students.csv"),
+                                ("rooms", "rooms.csv"),
+                                ("seats", "plan.csv")):
+            path = os.path.join(data_folder, filename)
+            if not os.path.exists(path) or os.path.getsize(path) == 0:
+                report[table] = (0, 0)
+                continue
+            df = pd.read_csv(path)
+            df.columns = df.columns.str.strip()
+            if table == "seats" and is_wide(df):
+                df = from_wide(df)
+            inserted = replace_table(conn, table, df)
+            report[table] = (len(df), inserted)
+    finally:
+        conn.close()
+    return report
+
+
+if __name__ == "__main__":
+    db = sys.argv[1] if len(sys.argv) > 1 else DB_FILE
+    for table, (read, inserted) in migrate_from_csv(db).items():
+        skipped = read - inserted
+        note = f" ({skipped} duplicate rows skipped)" if skipped else ""
+        print(f"{table}: {inserted} rows{note}")
@@ -0,0 +1,117 @@
+import json
+import os
+import threading
+
+import pandas as pd
+
+from seating import geometry
+
+# -----------------------------
+# STATS SIDECAR
+# -----------------------------
+# The handful of numbers the Dashboard shows (student / room counts, total
+# capacity, plan status, students per branch), kept in a small JSON file
+# next to the data. Each part remembers the data version it was computed
+# from; datastore recomputes a part when its file is rewritten or
+# compacted, and moves it by one row (count, branch, capacity) for a
+# single journaled change, so the Dashboard only has to read this file
+# and compare versions.
+STATS_FILE = os.path.join("data", "stats.json")
+
+PARTS = ("students", "rooms", "plan")
+
+
+def _plain(version):
+    # versions are tuples; JSON gives them back as lists
+    return json.loads(json.dumps(version))
+
+
+def student_stats(df):
+    branches = df["Branch"].astype(str).str.strip() if "Branch" in df else pd.Series(dtype=str)
+    counts = branches.value_counts()
+    return {
+        "count": int(len(df)),
+        "branches": {str(k): int(v) for k, v in counts.sort_index().items()},
+    }
+
+
+def room_stats(df):
+    # usable benches, from the bench grid where a room has one
+    return {
+        "count": int(len(df)),
+        "capacity": int(geometry.capacities(df).sum()) if len(df) else 0,
+    }
+
+
+def _change_students(values, sign, row):
+    branch = str(row.get("Branch")).strip()
+    branches = dict(values.get("branches", {}))
+    branches[branch] = branches.get(branch, 0) + sign
+    if branches[branch] <= 0:
+        del branches[branch]
+    return {
+        "count": values.get("count", 0) + sign,
+        "branches": dict(sorted(branches.items())),
+    }
+
+
+def _change_rooms(values, sign, row):
+    return {
+        "count": values.get("count", 0) + sign,
+        "capacity": values.get("capacity", 0) + sign * int(geometry.capacities(pd.DataFrame([row])).sum()),
+    }
+
+
+_CHANGES = {"students": _change_students, "rooms": _change_rooms}
+
+
+def apply_change(values, part, op, row=None, old=None):
+    # Update a part from one journaled change instead of recomputing it:
+    # `old` is the list of rows an edit / delete touches (every row with
+    # that key, duplicates included), `row` the added / edited fields.
+    # Returns None when the part can't be updated this way.
+    change = _CHANGES.get(part)
+    if change is None:
+        return None
+    values = {k: v for k, v in values.items() if k != "version"}
+    if op == "add":
+        return change(values, 1, row)
+    for before in old or []:
+        values = change(values, -1, before)
+        if op == "edit":
+            values = change(values, 1, dict(before, **row))
+    return values
+
+
+def plan_stats(df):
+    return {
+        "seats": int(len(df)),
+        "rooms": int(df["Room"].nunique()) if "Room" in df else 0,
+    }
+
+
+def load(path=STATS_FILE):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError, OSError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save(stats, path=STATS_FILE):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(stats, f, indent=1)
+    os.replace(tmp, path)
+
+
+def is_current(stats, part, version):
+    entry = stats.get(part)
+    return entry is not None and entry.get("version") == _plain(version)
+
+
+def set_part(stats, part, version, values):
+    stats[part] = dict(values, version=_plain(version))
+    return stats
@@ -0,0 +1,246 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+from seating.allocator import CapacityError, allocate
+
+# -----------------------------
+# EXAM TIMETABLE
+# -----------------------------
+# A timetable maps each exam slot to the subjects written in it:
+#
+#   Slot,Subjects
+#   Mon 10 AM,"CS301, EC301"
+#   Mon 2 PM,"CS302, ME302"
+#
+# The students of a slot are everyone whose Subjects field lists one of
+# those subjects, found through an inverted subject -> students index.
+# Every slot is then seated on its own (all rooms available in every
+# slot), in parallel worker processes, one plan per slot.
+TIMETABLE_COLUMNS = ["Slot", "Subjects"]
+
+SUBJECT_SPLIT = r"\s*[,;/|]\s*"
+
+
+def parse_subjects(text):
+    # "DSA, os ; DBMS" -> ["DSA", "OS", "DBMS"]
+    if text is None or (isinstance(text, float) and np.isnan(text)):
+        return []
+    return [s for s in re.split(SUBJECT_SPLIT, str(text).strip().upper()) if s]
+
+
+def slot_filename(slot):
+    safe = re.sub(r"[^\w\-]", "_", str(slot)).strip("_") or "slot"
+    return f"{safe}.csv"
+
+
+def validate(timetable):
+    # list of problems; empty when the timetable can be used
+    problems = []
+    missing = [c for c in TIMETABLE_COLUMNS if c not in timetable]
+    if missing:
+        return [f"missing column(s): {', '.join(missing)}"]
+
+    slots = timetable["Slot"].astype(str).str.strip()
+    if (slots == "").any():
+        problems.append("every row needs a Slot name")
+    repeated = slots[slots.duplicated()].unique().tolist()
+    if repeated:
+        problems.append(f"slot listed twice: {', '.join(repeated)}")
+    files = slots.map(slot_filename)
+    if files.duplicated().any() and not repeated:
+        problems.append("two slot names differ only in punctuation")
+    empty = slots[timetable["Subjects"].map(parse_subjects).map(len) == 0].tolist()
+    if empty:
+        problems.append(f"no subjects for: {', '.join(empty)}")
+    return problems
+
+
+# -----------------------------
+# SUBJECT -> STUDENTS INDEX
+# -----------------------------
+class SubjectIndex:
+    # Roster positions per subject, built in one pass over the Subjects column.
+    # Also keeps every student's subject set as a bitset (one bit per subject
+    # of the catalogue, 64 per uint64 word) for the clash check below.
+
+    def __init__(self, students):
+        subjects = students["Subjects"].astype(object).fillna("").astype(str).reset_index(drop=True)
+        tokens = subjects.str.upper().str.split(SUBJECT_SPLIT, regex=True).explode().str.strip()
+        tokens = tokens[tokens.notna() & (tokens != "")]
+
+        rows = tokens.index.to_numpy(dtype=np.int64)
+        groups = pd.Series(rows).groupby(tokens.to_numpy(dtype=object)).indices
+        self.positions = {s: np.unique(rows[offsets]) for s, offsets in groups.items()}
+        self.size = len(students)
+
+        # subject dictionary: bit number per subject, in sorted order
+        self.catalogue = sorted(groups)
+        self.bit = {s: i for i, s in enumerate(self.catalogue)}
+        codes = np.empty(len(rows), dtype=np.int64)
+        for s, offsets in groups.items():
+            codes[offsets] = self.bit[s]
+
+        self.bits = np.zeros((self.size, max((len(self.catalogue) + 63) // 64, 1)), dtype=np.uint64)
+        np.bitwise_or.at(self.bits, (rows, codes // 64), np.left_shift(np.uint64(1), (codes % 64).astype(np.uint64)))
+
+    def __contains__(self, subject):
+        return subject in self.positions
+
+    def subjects(self):
+        return sorted(self.positions)
+
+    def counts(self):
+        return {s: len(rows) for s, rows in self.positions.items()}
+
+    def students_for(self, subjects):
+        # (roster positions, subject label per position) for a set of
+        # subjects; students taking two of them get both in their label
+        hits = [(s, self.positions[s]) for s in subjects if s in self.positions]
+        if not hits:
+            return np.empty(0, dtype=np.int64), []
+
+        rows = np.concatenate([r for _, r in hits])
+        labels = np.concatenate([np.full(len(r), s, dtype=object) for s, r in hits])
+        by_row = pd.Series(labels).groupby(rows, sort=True).agg(", ".join)
+        return by_row.index.to_numpy(dtype=np.int64), by_row.tolist()
+
+    def mask(self, subjects):
+        # bitset of `subjects`; ones not on the roster are left out
+        out = np.zeros(self.bits.shape[1], dtype=np.uint64)
+        for s in subjects:
+            i = self.bit.get(s)
+            if i is not None:
+                out[i // 64] |= np.uint64(1) << np.uint64(i % 64)
+        return out
+
+    def names(self, words):
+        # subjects whose bits are set in one bitset row
+        flags = np.unpackbits(words.astype("<u8").view(np.uint8), bitorder="little")
+        return [self.catalogue[i] for i in np.flatnonzero(flags[:len(self.catalogue)])]
+
+
+def slot_roster(students, index, subjects):
+    # Students writing any of `subjects`, with the subject(s) they write
+    rows, labels = index.students_for(subjects)
+    roster = students.iloc[rows].reset_index(drop=True)
+    return roster.assign(Subject=labels)
+
+
+# -----------------------------
+# SUBJECT CLASHES
+# -----------------------------
+# A clash is a student registered for two (or more) subjects written in the
+# same slot - typically arrear students carrying papers from several
+# semesters. Per slot: AND every student's bitset with the slot's bitset
+# and keep rows with at least two bits left. Within a word, x & (x - 1) is
+# non-zero iff x has two or more bits set; across words it is enough that
+# two words are non-zero. No per-student Python work except for the
+# (few) clashing rows, whose subject names are decoded for the report.
+CLASH_COLUMNS = ["Slot", "USN", "Name", "Branch", "Type", "Clashing Subjects"]
+
+
+def clashing_rows(index, subjects):
+    # roster positions with 2+ of `subjects`, and their AND-ed bitsets
+    hit = index.bits & index.mask(subjects)
+    nonzero = hit != 0
+    clash = ((hit & (hit - np.uint64(1))) != 0).any(axis=1)
+    if hit.shape[1] > 1:
+        clash |= nonzero.sum(axis=1) >= 2
+    rows = np.flatnonzero(clash)
+    return rows, hit[rows]
+
+
+def find_clashes(students, timetable, index=None):
+    # One row per (slot, student) clash, in timetable order
+    index = index or SubjectIndex(students)
+    students = students.reset_index(drop=True)
+
+    parts = []
+    for slot, subjects in zip(timetable["Slot"].astype(str).str.strip(), timetable["Subjects"]):
+        rows, hits = clashing_rows(index, parse_subjects(subjects))
+        if len(rows) == 0:
+            continue
+        found = students.iloc[rows].reindex(columns=CLASH_COLUMNS[1:-1])
+        parts.append(found.assign(
+            Slot=slot,
+            **{"Clashing Subjects": [", ".join(index.names(h)) for h in hits]}
+        ))
+
+    if not parts:
+        return pd.DataFrame(columns=CLASH_COLUMNS)
+    return pd.concat(parts, ignore_index=True)[CLASH_COLUMNS]
+
+
+# -----------------------------
+# PARALLEL ALLOCATION
+# -----------------------------
+def _allocate_slot(job):
+    # Runs in a worker process. Errors are returned so one slot that does
+    # not fit does not stop the others.
+    slot, roster, rooms, seating_mode, strategy, time_budget, dedupe = job
+    try:
+        plan = allocate(roster, rooms, seating_mode, strategy=strategy,
+                        time_budget=time_budget, dedupe=dedupe)
+    except CapacityError as e:
+        return slot, None, str(e)
+    except Exception as e:
+        return slot, None, f"{type(e).__name__}: {e}"
+
+    # which paper each seated student writes, by USN (first record wins,
+    # as with dedupe)
+    first = roster.drop_duplicates("USN")
+    subject = dict(zip(first["USN"].astype(str), first["Subject"]))
+    plan["Subject"] = plan["USN"].astype(str).map(subject)
+    return slot, plan, None
+
+
+def allocate_slots(students, rooms, timetable, seating_mode=1, strategy="interleave",
+                   time_budget=2.0, dedupe=False, index=None, workers=None,
+                   on_slot=None, on_progress=None):
+    # Seats every slot of the timetable. `on_slot(slot, plan)` is called in
+    # the parent as each plan comes back (e.g. to save it), so finished
+    # plans need not be held. Returns {slot: {"students": n, "error": ...}}.
+    index = index or SubjectIndex(students)
+    students = students.reset_index(drop=True)
+
+    jobs = []
+    for slot, subjects in zip(timetable["Slot"].astype(str).str.strip(), timetable["Subjects"]):
+        roster = slot_roster(students, index, parse_subjects(subjects))
+        jobs.append((slot, roster, rooms, seating_mode, strategy, time_budget, dedupe))
+
+    summary = {job[0]: {"students": len(job[1]), "error": None} for job in jobs}
+    workers = min(workers or os.cpu_count() or 1, max(len(jobs), 1))
+    done = 0
+
+    # spawn: forking the multi-threaded Streamlit server is not safe
+    ctx = get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        futures = {pool.submit(_allocate_slot, job): job[0] for job in jobs}
+
+        for future in as_completed(futures):
+            slot = futures[future]
+            try:
+                _, plan, error = future.result()
+            except Exception as e:
+                # worker died (e.g. killed / out of memory)
+                plan, error = None, f"{type(e).__name__}: {e}"
+
+            if error is None:
+                summary[slot]["seated"] = len(plan)
+                summary[slot]["rooms"] = int(plan["Room"].nunique())
+                summary[slot]["same_branch_neighbours"] = plan.attrs.get("same_branch_neighbours", 0)
+                if on_slot is not None:
+                    on_slot(slot, plan)
+            else:
+                summary[slot]["error"] = error
+
+            done += 1
+            if on_progress is not None:
+                on_progress(done, len(jobs))
+
+    return summary
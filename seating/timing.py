@@ -0,0 +1,96 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+# -----------------------------
+# STAGE TIMINGS
+# -----------------------------
+# Cheap wall-clock spans around the slow parts of each page (load,
+# allocate, save, filter, render ...):
+#
+#   with timing.span("View Output", "filter"):
+#       ...
+#
+# Kept per process like the datastore cache, so the numbers cover every
+# session on the server. The last WINDOW durations of each page/stage feed
+# the rolling percentiles; the last RECENT spans can be exported as JSON
+# lines. Set SEATING_TIMING_LOG=<file> to also append every span to a file.
+WINDOW = 500
+RECENT = 5000
+
+LOG_FILE = os.environ.get("SEATING_TIMING_LOG")
+
+_durations = {}  # (page, stage) -> deque of seconds
+_recent = deque(maxlen=RECENT)
+_lock = threading.Lock()
+
+
+@contextmanager
+def span(page, stage, **extra):
+    # `extra` (e.g. rows=...) is kept with the span in the JSONL export
+    start = time.perf_counter()
+    try:
+        yield extra
+    finally:
+        record(page, stage, time.perf_counter() - start, **extra)
+
+
+def record(page, stage, seconds, **extra):
+    entry = {"ts": round(time.time(), 3), "page": page, "stage": stage, "ms": round(seconds * 1000, 3)}
+    entry.update(extra)
+
+    with _lock:
+        samples = _durations.get((page, stage))
+        if samples is None:
+            samples = _durations[(page, stage)] = deque(maxlen=WINDOW)
+        samples.append(seconds)
+        _recent.append(entry)
+
+        if LOG_FILE:
+            try:
+                with open(LOG_FILE, "a") as f:
+                    f.write(json.dumps(entry, default=str) + "\n")
+            except OSError:
+                pass
+
+
+# -----------------------------
+# REPORTING
+# -----------------------------
+def summary():
+    # one row per page/stage: sample count and p50/p90/p99/max in ms
+    with _lock:
+        items = [(key, np.fromiter(samples, dtype=float)) for key, samples in _durations.items()]
+
+    rows = []
+    for (page, stage), samples in sorted(items):
+        p50, p90, p99 = np.percentile(samples, [50, 90, 99]) * 1000
+        rows.append({
+            "Page": page,
+            "Stage": stage,
+            "Count": len(samples),
+            "p50 ms": round(p50, 1),
+            "p90 ms": round(p90, 1),
+            "p99 ms": round(p99, 1),
+            "Max ms": round(samples.max() * 1000, 1),
+            "Last ms": round(samples[-1] * 1000, 1),
+        })
+    return pd.DataFrame(rows, columns=["Page", "Stage", "Count", "p50 ms", "p90 ms", "p99 ms", "Max ms", "Last ms"])
+
+
+def to_jsonl():
+    with _lock:
+        entries = list(_recent)
+    return "".join(json.dumps(e, default=str) + "\n" for e in entries).encode("utf-8")
+
+
+def reset():
+    with _lock:
+        _durations.clear()
+        _recent.clear()
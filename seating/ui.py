@@ -0,0 +1,91 @@
+import os
+
+import streamlit as st
+
+from seating import geometry, timing
+from seating.plan_view import PAGE_SIZES, page_count
+
+# -----------------------------
+# SHARED STREAMLIT WIDGETS
+# -----------------------------
+# Kept apart from the rest of the package so the non-UI modules can be used
+# without Streamlit installed.
+
+
+def plan_window(view, positions=None, key="plan", room_jump=True):
+    # Paged table over a plan_view.PlanView: sorting, room filtering and
+    # slicing happen here, only the visible page goes to the browser.
+    # Returns the row positions being paged through.
+    cols = st.columns([3, 3, 2, 2])
+
+    room = None
+    if room_jump:
+        choice = cols[0].selectbox(
+            "Jump to room", ["All Rooms"] + view.room_names, key=f"{key}_room"
+        )
+        room = None if choice == "All Rooms" else choice
+
+    sort_by = cols[1].selectbox(
+        "Sort by", ["Seat order"] + list(view.seats.columns), key=f"{key}_sort"
+    )
+    descending = cols[2].checkbox("Descending", key=f"{key}_desc")
+    page_size = cols[3].selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_size")
+
+    rows = view.rows(
+        positions,
+        room=room,
+        sort_by=None if sort_by == "Seat order" else sort_by,
+        descending=descending,
+    )
+
+    pages = page_count(len(rows), page_size)
+    page = st.number_input(
+        f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page"
+    )
+    page = min(int(page), pages)
+
+    st.dataframe(view.window(rows, page, page_size), hide_index=True, use_container_width=True)
+
+    first = (page - 1) * page_size
+    st.caption(f"Rows {min(first + 1, len(rows))}-{min(first + page_size, len(rows))} of {len(rows)}")
+    return rows
+
+
+def oversized_benches_warning(rooms):
+    # rooms.csv edited by hand can ask for more seats per bench than the
+    # plan supports; say so instead of quietly seating fewer
+    over = geometry.oversized_benches(rooms)
+    if over:
+        st.warning(
+            f"⚠ Seats per Bench is over {geometry.MAX_SEATS_PER_BENCH} for {len(over)} rooms "
+            f"({', '.join(over[:10])}). They are seated {geometry.MAX_SEATS_PER_BENCH} per bench, "
+            "so they hold fewer students than rooms.csv says."
+        )
+
+
+def admin_mode():
+    # SEATING_ADMIN=1 on the server, or open any page once with ?admin=1
+    if os.environ.get("SEATING_ADMIN") == "1" or st.query_params.get("admin") == "1":
+        st.session_state["admin"] = True
+    return st.session_state.get("admin", False)
+
+
+def perf_panel():
+    # Admin-only sidebar panel: rolling stage timings from seating/timing.py
+    if not admin_mode():
+        return
+
+    with st.sidebar.expander("⏱ Performance"):
+        stats = timing.summary()
+        if stats.empty:
+            st.caption("No timings recorded yet.")
+            return
+
+        st.dataframe(stats, hide_index=True, use_container_width=True)
+        st.caption(f"Last {timing.WINDOW} runs of each stage, all sessions on this server.")
+        st.download_button(
+            "Download timings (JSONL)", timing.to_jsonl(),
+            file_name="timings.jsonl", mime="application/x-ndjson", key="perf_export"
+        )
+        if st.button("Reset timings", key="perf_reset"):
+            timing.reset()
@@ -0,0 +1,91 @@
+import os
+import pickle
+
+import pandas as pd
+
+# -----------------------------
+# USN INDEX
+# -----------------------------
+# Hash index of every USN on the roster with its number of occurrences.
+# Lookups, adds and removals are O(1); collisions (USNs registered more
+# than once) are tracked as they happen so nothing needs to sort the
+# roster to find them.
+INDEX_FILE = os.path.join("data", "students.usnidx")
+
+
+def normalise(usn):
+    return str(usn).strip().upper()
+
+
+class UsnIndex:
+    def __init__(self, counts=None):
+        self.counts = dict(counts or {})
+        self.duplicates = {u for u, c in self.counts.items() if c > 1}
+
+    @classmethod
+    def from_usns(cls, usns):
+        keys = pd.Series(usns, dtype=object).astype(str).str.strip().str.upper()
+        return cls(keys.value_counts().to_dict())
+
+    def __contains__(self, usn):
+        return normalise(usn) in self.counts
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, usn):
+        # Returns False when the USN was already present
+        key = normalise(usn)
+        count = self.counts.get(key, 0) + 1
+        self.counts[key] = count
+        if count > 1:
+            self.duplicates.add(key)
+        return count == 1
+
+    def discard(self, usn):
+        key = normalise(usn)
+        self.counts.pop(key, None)
+        self.duplicates.discard(key)
+
+    def apply(self, entries):
+        # Mirror seating.journal entries (add / edit / delete keyed by USN)
+        for entry in entries:
+            op = entry.get("op")
+            if op == "add":
+                self.add(entry["row"].get("USN", ""))
+            elif op == "delete":
+                self.discard(entry["key"])
+            elif op == "edit":
+                new = entry.get("row", {}).get("USN")
+                if new is not None and normalise(new) != normalise(entry["key"]):
+                    count = self.counts.get(normalise(entry["key"]), 0)
+                    self.discard(entry["key"])
+                    for _ in range(count):
+                        self.add(new)
+
+    def collisions(self):
+        return {u: self.counts[u] for u in sorted(self.duplicates)}
+
+
+# -----------------------------
+# SNAPSHOT ON DISK
+# -----------------------------
+# Stored together with the version of the base file it was built from, so
+# a restart can skip rebuilding when the roster has not been rewritten.
+def save(index, version, path=INDEX_FILE):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump({"version": version, "counts": index.counts}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+
+
+def load(version, path=INDEX_FILE):
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError, OSError):
+        return None
+    if data.get("version") != version:
+        return None
+    return UsnIndex(data["counts"])
@@ -0,0 +1,33 @@
+import pandas as pd
+
+from seating import datastore, journal
+
+
+def _student(usn):
+    return {"USN": usn, "Name": "A", "Sem": 5, "Branch": "CSE", "Type": "Regular", "Subjects": ""}
+
+
+def test_full_write_during_compaction_wins(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    datastore.invalidate()
+
+    datastore.write_table(datastore.STUDENT_FILE, pd.DataFrame([_student("1RV21CS001")]))
+    datastore.add_student(_student("1RV21CS002"))
+
+    upload = pd.DataFrame([_student("1RV21EC100"), _student("1RV21EC101")])
+    replay = journal.apply
+
+    # a bulk upload lands between compaction's snapshot and its swap
+    def apply_then_upload(df, entries, key_col):
+        out = replay(df, entries, key_col)
+        monkeypatch.setattr(journal, "apply", replay)
+        datastore.write_table(datastore.STUDENT_FILE, upload)
+        return out
+
+    monkeypatch.setattr(journal, "apply", apply_then_upload)
+    datastore.compact(datastore.STUDENT_FILE)
+
+    datastore.invalidate()
+    assert datastore.load_students()["USN"].tolist() == ["1RV21EC100", "1RV21EC101"]
+    assert not (tmp_path / journal.compacting_path(datastore.STUDENT_FILE)).exists()
+    assert not list(tmp_path.glob("data/*.tmp"))
@@ -0,0 +1,15 @@
+import pandas as pd
+
+from seating import journal, usn_index
+
+
+def test_keys_match_like_the_usn_index():
+    df = pd.DataFrame({"USN": ["1RV21CS001 ", "1RV21CS002"], "Name": ["A", "B"]})
+    key = " 1rv21cs001"
+    assert key in usn_index.UsnIndex.from_usns(df["USN"])
+
+    edited = journal.apply(df, [{"op": "edit", "key": key, "row": {"Name": "C"}}], "USN")
+    assert edited["Name"].tolist() == ["C", "B"]
+
+    deleted = journal.apply(df, [{"op": "delete", "key": key}], "USN")
+    assert deleted["USN"].tolist() == ["1RV21CS002"]